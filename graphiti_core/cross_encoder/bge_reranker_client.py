@@ -29,12 +29,14 @@ else:
         ) from None
 
 from graphiti_core.cross_encoder.client import CrossEncoderClient
+from graphiti_core.utils.concurrency import ConcurrencyPool, governed
 
 
 class BGERerankerClient(CrossEncoderClient):
     def __init__(self):
         self.model = CrossEncoder('BAAI/bge-reranker-v2-m3')
 
+    @governed(ConcurrencyPool.reranker)
     async def rank(self, query: str, passages: list[str]) -> list[tuple[str, float]]:
         if not passages:
             return []
@@ -16,6 +16,8 @@ limitations under the License.
 
 from abc import ABC, abstractmethod
 
+from graphiti_core.utils.concurrency import ConcurrencyGovernor
+
 
 class CrossEncoderClient(ABC):
     """
@@ -24,6 +26,8 @@ class CrossEncoderClient(ABC):
     It allows for different implementations of cross-encoder models to be used interchangeably.
     """
 
+    governor: ConcurrencyGovernor | None = None
+
     @abstractmethod
     async def rank(self, query: str, passages: list[str]) -> list[tuple[str, float]]:
         """
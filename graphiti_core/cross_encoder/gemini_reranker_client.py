@@ -20,6 +20,7 @@ from typing import TYPE_CHECKING
 
 from ..helpers import semaphore_gather
 from ..llm_client import LLMConfig, RateLimitError
+from ..utils.concurrency import ConcurrencyPool, governed
 from .client import CrossEncoderClient
 
 if TYPE_CHECKING:
@@ -70,6 +71,7 @@ class GeminiRerankerClient(CrossEncoderClient):
         else:
             self.client = client
 
+    @governed(ConcurrencyPool.reranker)
     async def rank(self, query: str, passages: list[str]) -> list[tuple[str, float]]:
         """
         Rank passages based on their relevance to the query using direct scoring.
@@ -24,6 +24,7 @@ from openai import AsyncAzureOpenAI, AsyncOpenAI
 from ..helpers import semaphore_gather
 from ..llm_client import LLMConfig, OpenAIClient, RateLimitError
 from ..prompts import Message
+from ..utils.concurrency import ConcurrencyPool, governed
 from .client import CrossEncoderClient
 
 logger = logging.getLogger(__name__)
@@ -58,6 +59,7 @@ class OpenAIRerankerClient(CrossEncoderClient):
         else:
             self.client = client
 
+    @governed(ConcurrencyPool.reranker)
     async def rank(self, query: str, passages: list[str]) -> list[tuple[str, float]]:
         openai_messages_list: Any = [
             [
@@ -21,6 +21,8 @@ from collections.abc import Coroutine
 from enum import Enum
 from typing import Any
 
+from graphiti_core.utils.concurrency import ConcurrencyGovernor
+
 logger = logging.getLogger(__name__)
 
 
@@ -57,6 +59,7 @@ class GraphDriver(ABC):
         ''  # Neo4j (default) syntax does not require a prefix for fulltext queries
     )
     _database: str
+    governor: ConcurrencyGovernor | None = None
 
     @abstractmethod
     def execute_query(self, cypher_query_: str, **kwargs: Any) -> Coroutine:
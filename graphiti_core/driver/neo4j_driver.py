@@ -22,6 +22,7 @@ from neo4j import AsyncGraphDatabase, EagerResult
 from typing_extensions import LiteralString
 
 from graphiti_core.driver.driver import GraphDriver, GraphDriverSession, GraphProvider
+from graphiti_core.utils.concurrency import ConcurrencyPool, governed
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +38,7 @@ class Neo4jDriver(GraphDriver):
         )
         self._database = database
 
+    @governed(ConcurrencyPool.db)
     async def execute_query(self, cypher_query_: LiteralString, **kwargs: Any) -> EagerResult:
         # Check if database_ is provided in kwargs.
         # If not populated, set the value to retain backwards compatibility
@@ -27,7 +27,7 @@ from typing_extensions import LiteralString
 from graphiti_core.driver.driver import GraphDriver
 from graphiti_core.embedder import EmbedderClient
 from graphiti_core.errors import EdgeNotFoundError, GroupsEdgesNotFoundError
-from graphiti_core.helpers import parse_db_date
+from graphiti_core.helpers import DEFAULT_DELETE_BATCH_SIZE, delete_in_batches, parse_db_date
 from graphiti_core.models.edges.edge_db_queries import (
     COMMUNITY_EDGE_RETURN,
     ENTITY_EDGE_RETURN,
@@ -64,6 +64,21 @@ class Edge(BaseModel, ABC):
 
         return result
 
+    @classmethod
+    async def delete_by_uuids(
+        cls, driver: GraphDriver, uuids: list[str], batch_size: int = DEFAULT_DELETE_BATCH_SIZE
+    ):
+        await delete_in_batches(
+            driver,
+            'MATCH (n)-[e:MENTIONS|RELATES_TO|HAS_MEMBER]->(m) WHERE e.uuid IN $uuids',
+            'e',
+            'DELETE e',
+            batch_size,
+            uuids=uuids,
+        )
+
+        logger.debug(f'Deleted Edges: {uuids}')
+
     def __hash__(self):
         return hash(self.uuid)
 
@@ -19,6 +19,8 @@ from typing import Any
 
 from openai import AsyncAzureOpenAI
 
+from ..utils.concurrency import ConcurrencyPool
+from ..utils.hedging import hedged
 from .client import EmbedderClient
 
 logger = logging.getLogger(__name__)
@@ -31,6 +33,7 @@ class AzureOpenAIEmbedderClient(EmbedderClient):
         self.azure_client = azure_client
         self.model = model
 
+    @hedged(ConcurrencyPool.embedder)
     async def create(self, input_data: str | list[str] | Any) -> list[float]:
         """Create embeddings using Azure OpenAI client."""
         try:
@@ -51,6 +54,7 @@ class AzureOpenAIEmbedderClient(EmbedderClient):
             logger.error(f'Error in Azure OpenAI embedding: {e}')
             raise
 
+    @hedged(ConcurrencyPool.embedder)
     async def create_batch(self, input_data_list: list[str]) -> list[list[float]]:
         """Create batch embeddings using Azure OpenAI client."""
         try:
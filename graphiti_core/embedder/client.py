@@ -19,6 +19,9 @@ from collections.abc import Iterable
 
 from pydantic import BaseModel, Field
 
+from graphiti_core.utils.concurrency import ConcurrencyGovernor
+from graphiti_core.utils.hedging import HedgingPolicy
+
 EMBEDDING_DIM = 1024
 
 
@@ -27,6 +30,9 @@ class EmbedderConfig(BaseModel):
 
 
 class EmbedderClient(ABC):
+    governor: ConcurrencyGovernor | None = None
+    hedging_policy: HedgingPolicy | None = None
+
     @abstractmethod
     async def create(
         self, input_data: str | list[str] | Iterable[int] | Iterable[Iterable[int]]
@@ -33,6 +33,8 @@ else:
 
 from pydantic import Field
 
+from ..utils.concurrency import ConcurrencyPool
+from ..utils.hedging import hedged
 from .client import EmbedderClient, EmbedderConfig
 
 logger = logging.getLogger(__name__)
@@ -85,6 +87,7 @@ class GeminiEmbedder(EmbedderClient):
         else:
             self.batch_size = batch_size
 
+    @hedged(ConcurrencyPool.embedder)
     async def create(
         self, input_data: str | list[str] | Iterable[int] | Iterable[Iterable[int]]
     ) -> list[float]:
@@ -110,6 +113,7 @@ class GeminiEmbedder(EmbedderClient):
 
         return result.embeddings[0].values
 
+    @hedged(ConcurrencyPool.embedder)
     async def create_batch(self, input_data_list: list[str]) -> list[list[float]]:
         """
         Create embeddings for a batch of input data using Google's Gemini embedding model.
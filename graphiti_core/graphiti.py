@@ -14,13 +14,14 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import asyncio
 import logging
+import sys
 from datetime import datetime
 from time import time
 
 from dotenv import load_dotenv
 from pydantic import BaseModel
-from typing_extensions import LiteralString
 
 from graphiti_core.cross_encoder.client import CrossEncoderClient
 from graphiti_core.cross_encoder.openai_reranker_client import OpenAIRerankerClient
@@ -36,7 +37,14 @@ from graphiti_core.helpers import (
     validate_group_id,
 )
 from graphiti_core.llm_client import LLMClient, OpenAIClient
-from graphiti_core.nodes import CommunityNode, EntityNode, EpisodeType, EpisodicNode
+from graphiti_core.llm_client.batch_client import BatchCollectingLLMClient, BatchLLMClient
+from graphiti_core.nodes import (
+    CommunityNode,
+    EntityNode,
+    EpisodeType,
+    EpisodicNode,
+    get_deterministic_episode_uuid,
+)
 from graphiti_core.search.search import SearchConfig, search
 from graphiti_core.search.search_config import DEFAULT_SEARCH_LIMIT, SearchResults
 from graphiti_core.search.search_config_recipes import (
@@ -61,7 +69,11 @@ from graphiti_core.utils.bulk_utils import (
     resolve_edge_pointers,
     retrieve_previous_episodes_bulk,
 )
+from graphiti_core.utils.concurrency import ConcurrencyGovernor
 from graphiti_core.utils.datetime_utils import utc_now
+from graphiti_core.utils.episode_cache import RecentEpisodeCache
+from graphiti_core.utils.hedging import HedgingPolicy
+from graphiti_core.utils.json_extraction import JsonEpisodeExtractor
 from graphiti_core.utils.maintenance.community_operations import (
     build_communities,
     remove_communities,
@@ -70,6 +82,7 @@ from graphiti_core.utils.maintenance.community_operations import (
 from graphiti_core.utils.maintenance.edge_operations import (
     build_duplicate_of_edges,
     build_episodic_edges,
+    extract_and_resolve_edges_streaming,
     extract_edges,
     resolve_extracted_edge,
     resolve_extracted_edges,
@@ -82,9 +95,14 @@ from graphiti_core.utils.maintenance.graph_data_operations import (
 from graphiti_core.utils.maintenance.node_operations import (
     extract_attributes_from_nodes,
     extract_nodes,
+    extract_nodes_and_edges,
+    extract_nodes_and_edges_from_chunks,
+    extract_nodes_and_edges_from_json,
     resolve_extracted_nodes,
 )
 from graphiti_core.utils.ontology_utils.entity_types_utils import validate_entity_types
+from graphiti_core.utils.text_utils import chunk_text
+from graphiti_core.utils.write_coalescer import BulkWriteCoalescer
 
 logger = logging.getLogger(__name__)
 
@@ -112,6 +130,10 @@ class Graphiti:
         store_raw_episode_content: bool = True,
         graph_driver: GraphDriver | None = None,
         max_coroutines: int | None = None,
+        write_coalescer: BulkWriteCoalescer | None = None,
+        episode_cache: RecentEpisodeCache | None = None,
+        concurrency_governor: ConcurrencyGovernor | None = None,
+        hedging_policy: HedgingPolicy | None = None,
     ):
         """
         Initialize a Graphiti instance.
@@ -144,6 +166,20 @@ class Graphiti:
         max_coroutines : int | None, optional
             The maximum number of concurrent operations allowed. Overrides SEMAPHORE_LIMIT set in the environment.
             If not set, the Graphiti default is used.
+        write_coalescer : BulkWriteCoalescer | None, optional
+            If provided, add_episode writes are buffered and merged with concurrent writes into
+            larger transactions. It is flushed when the Graphiti instance is closed.
+        episode_cache : RecentEpisodeCache | None, optional
+            If provided, recent episodes per group are kept in memory as they are written, so
+            previous episodes are usually retrieved without querying the graph.
+        concurrency_governor : ConcurrencyGovernor | None, optional
+            Bounds the in-flight LLM, embedder, reranker and database operations of this instance.
+            Pass the same governor to several Graphiti instances to share the limits between them.
+            If not provided, a governor configured from the environment is created.
+        hedging_policy : HedgingPolicy | None, optional
+            If provided, LLM and embedding requests that take longer than a percentile of the
+            recent latencies of their type are duplicated, and the first response is used. The
+            policy's hedge budget bounds the number of duplicates.
 
         Returns
         -------
@@ -173,6 +209,8 @@ class Graphiti:
 
         self.store_raw_episode_content = store_raw_episode_content
         self.max_coroutines = max_coroutines
+        self.write_coalescer = write_coalescer
+        self.episode_cache = episode_cache
         if llm_client:
             self.llm_client = llm_client
         else:
@@ -186,11 +224,19 @@ class Graphiti:
         else:
             self.cross_encoder = OpenAIRerankerClient()
 
+        self.governor = concurrency_governor or ConcurrencyGovernor()
+        for client in [self.driver, self.llm_client, self.embedder, self.cross_encoder]:
+            client.governor = self.governor
+        if hedging_policy is not None:
+            self.llm_client.hedging_policy = hedging_policy
+            self.embedder.hedging_policy = hedging_policy
+
         self.clients = GraphitiClients(
             driver=self.driver,
             llm_client=self.llm_client,
             embedder=self.embedder,
             cross_encoder=self.cross_encoder,
+            governor=self.governor,
         )
 
         # Capture telemetry event
@@ -278,6 +324,8 @@ class Graphiti:
             finally:
                 graphiti.close()
         """
+        if self.write_coalescer is not None:
+            await self.write_coalescer.close()
         await self.driver.close()
 
     async def build_indices_and_constraints(self, delete_existing: bool = False):
@@ -345,8 +393,13 @@ class Graphiti:
         Notes
         -----
         The actual retrieval is performed by the `retrieve_episodes` function
-        from the `graphiti_core.utils` module.
+        from the `graphiti_core.utils` module, or served from the episode cache if one is set.
         """
+        if self.episode_cache is not None:
+            return await self.episode_cache.retrieve_episodes(
+                self.driver, reference_time, last_n, group_ids, source
+            )
+
         return await retrieve_episodes(self.driver, reference_time, last_n, group_ids, source)
 
     async def add_episode(
@@ -364,6 +417,10 @@ class Graphiti:
         previous_episode_uuids: list[str] | None = None,
         edge_types: dict[str, BaseModel] | None = None,
         edge_type_map: dict[tuple[str, str], list[str]] | None = None,
+        idempotent: bool = False,
+        combined_extraction: bool = False,
+        json_extractor: JsonEpisodeExtractor | None = None,
+        stream_edges: bool = False,
     ) -> AddEpisodeResults:
         """
         Process an episode and update the graph.
@@ -398,6 +455,24 @@ class Graphiti:
         previous_episode_uuids : list[str] | None
             Optional.  list of episode uuids to use as the previous episodes. If this is not provided,
             the most recent episodes by created_at date will be used.
+        idempotent : bool
+            Optional. If True and uuid is not provided, the episode uuid is derived from group_id,
+            source, reference_time and a hash of episode_body. An episode that was already ingested
+            is not processed again, and its stored nodes and edges are returned instead.
+        combined_extraction : bool
+            Optional. If True, entities and facts are extracted with a single LLM call instead of
+            extracting nodes and then edges, removing one LLM round trip from the episode's
+            critical path. Reflexion iterations are not run in this mode.
+        json_extractor : JsonEpisodeExtractor | None
+            Optional. Extractor mapping JSON episodes to nodes and edges without LLM calls, e.g. a
+            SchemaMappedJsonExtractor for a known event schema. Fields it leaves unmapped are
+            extracted by the LLM.
+        stream_edges : bool
+            Optional. If True, the edge extraction response is streamed and facts are resolved in
+            batches while the remaining facts are still being generated, instead of after the whole
+            response has arrived. Only applies to the default two-step extraction, and falls back to
+            a regular call for LLM clients that do not support streaming or when reflexion is
+            enabled.
 
         Returns
         -------
@@ -409,6 +484,9 @@ class Graphiti:
         deduplication, and database updates. It also handles embedding generation
         and edge invalidation.
 
+        Text episodes longer than CHUNK_TOKEN_SIZE tokens are split into overlapping chunks that
+        are extracted concurrently, with either extraction mode, before nodes are resolved.
+
         It is recommended to run this method as a background process, such as in a queue.
         It's important that each episode is added sequentially and awaited before adding
         the next one. For web applications, consider using FastAPI's background tasks
@@ -431,6 +509,21 @@ class Graphiti:
             validate_excluded_entity_types(excluded_entity_types, entity_types)
             validate_group_id(group_id)
 
+            deterministic_uuid: str | None = None
+            if idempotent and uuid is None:
+                deterministic_uuid = get_deterministic_episode_uuid(
+                    group_id, source, reference_time, episode_body
+                )
+                if self.write_coalescer is not None:
+                    # An earlier delivery of the episode may still be buffered
+                    await self.write_coalescer.flush()
+                existing_episodes = await EpisodicNode.get_by_uuids(
+                    self.driver, [deterministic_uuid]
+                )
+                if len(existing_episodes) > 0:
+                    logger.info(f'Episode {deterministic_uuid} was already ingested, skipping')
+                    return await self._get_ingested_episode_results(existing_episodes[0])
+
             previous_episodes = (
                 await self.retrieve_episodes(
                     reference_time,
@@ -456,6 +549,8 @@ class Graphiti:
                     valid_at=reference_time,
                 )
             )
+            if deterministic_uuid is not None:
+                episode.uuid = deterministic_uuid
 
             # Create default edge type map
             edge_type_map_default = (
@@ -464,49 +559,147 @@ class Graphiti:
                 else {('Entity', 'Entity'): []}
             )
 
-            # Extract entities as nodes
+            # Long documents are extracted chunk by chunk, concurrently
+            chunks = chunk_text(episode.content) if episode.source == EpisodeType.text else []
 
-            extracted_nodes = await extract_nodes(
-                self.clients, episode, previous_episodes, entity_types, excluded_entity_types
-            )
+            json_extractor = json_extractor if episode.source == EpisodeType.json else None
+
+            streamed_edges: tuple[list[EntityEdge], list[EntityEdge]] | None = None
+
+            if json_extractor is not None or len(chunks) > 1 or combined_extraction:
+                if json_extractor is not None:
+                    extracted_nodes, extracted_edges = await extract_nodes_and_edges_from_json(
+                        self.clients,
+                        episode,
+                        json_extractor,
+                        previous_episodes,
+                        edge_type_map or edge_type_map_default,
+                        entity_types,
+                        excluded_entity_types,
+                        edge_types,
+                        combined_extraction,
+                    )
+                elif len(chunks) > 1:
+                    extracted_nodes, extracted_edges = await extract_nodes_and_edges_from_chunks(
+                        self.clients,
+                        episode,
+                        chunks,
+                        previous_episodes,
+                        edge_type_map or edge_type_map_default,
+                        entity_types,
+                        excluded_entity_types,
+                        edge_types,
+                        combined_extraction,
+                        self.max_coroutines,
+                    )
+                else:
+                    # Extract entities and edges together
+                    extracted_nodes, extracted_edges = await extract_nodes_and_edges(
+                        self.clients,
+                        episode,
+                        previous_episodes,
+                        edge_type_map or edge_type_map_default,
+                        entity_types,
+                        excluded_entity_types,
+                        edge_types,
+                    )
 
-            # Extract edges and resolve nodes
-            (nodes, uuid_map, node_duplicates), extracted_edges = await semaphore_gather(
-                resolve_extracted_nodes(
+                (nodes, uuid_map, node_duplicates) = await resolve_extracted_nodes(
                     self.clients,
                     extracted_nodes,
                     episode,
                     previous_episodes,
                     entity_types,
-                ),
-                extract_edges(
-                    self.clients,
-                    episode,
-                    extracted_nodes,
-                    previous_episodes,
-                    edge_type_map or edge_type_map_default,
-                    group_id,
-                    edge_types,
-                ),
-                max_coroutines=self.max_coroutines,
-            )
+                )
+            elif stream_edges:
+                extracted_nodes = await extract_nodes(
+                    self.clients, episode, previous_episodes, entity_types, excluded_entity_types
+                )
+
+                # Streamed edges are resolved as soon as the nodes they point at are resolved
+                node_resolution = asyncio.ensure_future(
+                    resolve_extracted_nodes(
+                        self.clients,
+                        extracted_nodes,
+                        episode,
+                        previous_episodes,
+                        entity_types,
+                    )
+                )
 
-            edges = resolve_edge_pointers(extracted_edges, uuid_map)
+                async def extract_resolved_node_attributes() -> list[EntityNode]:
+                    resolved_nodes, _, _ = await node_resolution
+                    return await extract_attributes_from_nodes(
+                        self.clients, resolved_nodes, episode, previous_episodes, entity_types
+                    )
 
-            (resolved_edges, invalidated_edges), hydrated_nodes = await semaphore_gather(
-                resolve_extracted_edges(
-                    self.clients,
-                    edges,
-                    episode,
-                    nodes,
-                    edge_types or {},
-                    edge_type_map or edge_type_map_default,
-                ),
-                extract_attributes_from_nodes(
-                    self.clients, nodes, episode, previous_episodes, entity_types
-                ),
-                max_coroutines=self.max_coroutines,
-            )
+                try:
+                    streamed_edges, hydrated_nodes = await semaphore_gather(
+                        extract_and_resolve_edges_streaming(
+                            self.clients,
+                            episode,
+                            extracted_nodes,
+                            previous_episodes,
+                            node_resolution,
+                            edge_type_map or edge_type_map_default,
+                            group_id,
+                            edge_types,
+                        ),
+                        extract_resolved_node_attributes(),
+                        max_coroutines=self.max_coroutines,
+                    )
+                except BaseException:
+                    node_resolution.cancel()
+                    raise
+
+                nodes, uuid_map, node_duplicates = node_resolution.result()
+            else:
+                # Extract entities as nodes
+
+                extracted_nodes = await extract_nodes(
+                    self.clients, episode, previous_episodes, entity_types, excluded_entity_types
+                )
+
+                # Extract edges and resolve nodes
+                (nodes, uuid_map, node_duplicates), extracted_edges = await semaphore_gather(
+                    resolve_extracted_nodes(
+                        self.clients,
+                        extracted_nodes,
+                        episode,
+                        previous_episodes,
+                        entity_types,
+                    ),
+                    extract_edges(
+                        self.clients,
+                        episode,
+                        extracted_nodes,
+                        previous_episodes,
+                        edge_type_map or edge_type_map_default,
+                        group_id,
+                        edge_types,
+                    ),
+                    max_coroutines=self.max_coroutines,
+                )
+
+            if streamed_edges is not None:
+                resolved_edges, invalidated_edges = streamed_edges
+            else:
+                edges = resolve_edge_pointers(extracted_edges, uuid_map)
+
+                (resolved_edges, invalidated_edges), hydrated_nodes = await semaphore_gather(
+                    resolve_extracted_edges(
+                        self.clients,
+                        edges,
+                        episode,
+                        nodes,
+                        edge_types or {},
+                        edge_type_map or edge_type_map_default,
+                    ),
+                    extract_attributes_from_nodes(
+                        self.clients, nodes, episode, previous_episodes, entity_types
+                    ),
+                    max_coroutines=self.max_coroutines,
+                )
 
             duplicate_of_edges = build_duplicate_of_edges(episode, now, node_duplicates)
 
@@ -519,9 +712,22 @@ class Graphiti:
             if not self.store_raw_episode_content:
                 episode.content = ''
 
-            await add_nodes_and_edges_bulk(
-                self.driver, [episode], episodic_edges, hydrated_nodes, entity_edges, self.embedder
-            )
+            if self.write_coalescer is not None:
+                await self.write_coalescer.add_nodes_and_edges(
+                    [episode], episodic_edges, hydrated_nodes, entity_edges
+                )
+            else:
+                await add_nodes_and_edges_bulk(
+                    self.driver,
+                    [episode],
+                    episodic_edges,
+                    hydrated_nodes,
+                    entity_edges,
+                    self.embedder,
+                )
+
+            if self.episode_cache is not None:
+                self.episode_cache.add_episodes([episode])
 
             communities = []
             community_edges = []
@@ -559,6 +765,8 @@ class Graphiti:
         excluded_entity_types: list[str] | None = None,
         edge_types: dict[str, BaseModel] | None = None,
         edge_type_map: dict[tuple[str, str], list[str]] | None = None,
+        idempotent: bool = False,
+        batch_llm_client: BatchLLMClient | None = None,
     ):
         """
         Process multiple episodes in bulk and update the graph.
@@ -572,6 +780,17 @@ class Graphiti:
             A list of RawEpisode objects to be processed and added to the graph.
         group_id : str | None
             An id for the graph partition the episode is a part of.
+        idempotent : bool
+            Optional. If True, episodes without a uuid get one derived from group_id, source,
+            reference_time and a hash of their content. Episodes that were already ingested, or
+            that repeat an earlier episode in the same batch, are skipped. Episodes are only stored
+            together with their nodes and edges, so a batch that failed is processed again when it
+            is retried.
+        batch_llm_client : BatchLLMClient | None
+            Optional. If provided, the LLM prompts of each stage are collected and submitted
+            through this provider batch interface, and the stage resumes when the batch results
+            arrive. This trades latency for throughput and cost on large backfills. Prompts whose
+            batch responses stay invalid after resubmission are answered by the llm_client.
 
         Returns
         -------
@@ -580,12 +799,11 @@ class Graphiti:
         Notes
         -----
         This method performs several steps including:
-        - Saving all episodes to the database
         - Retrieving previous episode context for each new episode
         - Extracting nodes and edges from all episodes
         - Generating embeddings for nodes and edges
         - Deduplicating nodes and edges
-        - Saving nodes, episodic edges, and entity edges to the knowledge graph
+        - Saving episodes, nodes, episodic edges, and entity edges to the knowledge graph
 
         This bulk operation is designed for efficiency when processing multiple episodes
         at once. However, it's important to ensure that the bulk operation doesn't
@@ -595,13 +813,31 @@ class Graphiti:
         Important: This method does not perform edge invalidation or date extraction steps.
         If these operations are required, use the `add_episode` method instead for each
         individual episode.
+
+        Episodes are not chunked: each one is extracted with a single prompt regardless of its
+        length. Add long text episodes with `add_episode`, which splits them into chunks.
         """
         try:
             start = time()
             now = utc_now()
 
+            clients = self.clients
+            max_coroutines = self.max_coroutines
+            if batch_llm_client is not None:
+                # Stages fan out over all of their work so their prompts form a single batch. The
+                # concurrency governor still bounds the database and embedder calls.
+                clients = self.clients.model_copy(
+                    update={
+                        'llm_client': BatchCollectingLLMClient(
+                            batch_llm_client, fallback_llm_client=self.llm_client
+                        )
+                    }
+                )
+                max_coroutines = sys.maxsize
+
             # if group_id is None, use the default group id by the provider
             group_id = group_id or get_default_group_id(self.driver.provider)
+            validate_entity_types(entity_types)
             validate_group_id(group_id)
 
             # Create default edge type map
@@ -611,6 +847,46 @@ class Graphiti:
                 else {('Entity', 'Entity'): []}
             )
 
+            deterministic_uuids: list[str | None] = [None] * len(bulk_episodes)
+            if idempotent:
+                deterministic_uuids = [
+                    get_deterministic_episode_uuid(
+                        group_id, episode.source, episode.reference_time, episode.content
+                    )
+                    if episode.uuid is None
+                    else None
+                    for episode in bulk_episodes
+                ]
+                existing_episodes = await EpisodicNode.get_by_uuids(
+                    self.driver,
+                    [
+                        episode_uuid
+                        for episode_uuid in deterministic_uuids
+                        if episode_uuid is not None
+                    ],
+                )
+                seen_uuids: set[str] = {episode.uuid for episode in existing_episodes}
+
+                new_bulk_episodes: list[RawEpisode] = []
+                new_deterministic_uuids: list[str | None] = []
+                for episode, episode_uuid in zip(bulk_episodes, deterministic_uuids, strict=True):
+                    if episode_uuid is not None:
+                        if episode_uuid in seen_uuids:
+                            continue
+                        seen_uuids.add(episode_uuid)
+                    new_bulk_episodes.append(episode)
+                    new_deterministic_uuids.append(episode_uuid)
+
+                if len(new_bulk_episodes) < len(bulk_episodes):
+                    logger.info(
+                        f'Skipping {len(bulk_episodes) - len(new_bulk_episodes)} already ingested episodes'
+                    )
+                bulk_episodes = new_bulk_episodes
+                deterministic_uuids = new_deterministic_uuids
+
+                if len(bulk_episodes) == 0:
+                    return
+
             episodes = [
                 await EpisodicNode.get_by_uuid(self.driver, episode.uuid)
                 if episode.uuid is not None
@@ -626,37 +902,38 @@ class Graphiti:
                 )
                 for episode in bulk_episodes
             ]
+            for episode, deterministic_uuid in zip(episodes, deterministic_uuids, strict=True):
+                if deterministic_uuid is not None:
+                    episode.uuid = deterministic_uuid
 
             episodes_by_uuid: dict[str, EpisodicNode] = {
                 episode.uuid: episode for episode in episodes
             }
 
-            # Save all episodes
-            await add_nodes_and_edges_bulk(
-                driver=self.driver,
-                episodic_nodes=episodes,
-                episodic_edges=[],
-                entity_nodes=[],
-                entity_edges=[],
-                embedder=self.embedder,
-            )
+            # Episodes are only saved with their nodes and edges at the end, so a stored episode
+            # was fully ingested and a failed batch is extracted again when it is redelivered
 
             # Get previous episode context for each episode
             episode_context = await retrieve_previous_episodes_bulk(self.driver, episodes)
 
             # Extract all nodes and edges for each episode
             extracted_nodes_bulk, extracted_edges_bulk = await extract_nodes_and_edges_bulk(
-                self.clients,
+                clients,
                 episode_context,
                 edge_type_map=edge_type_map or edge_type_map_default,
                 edge_types=edge_types,
                 entity_types=entity_types,
                 excluded_entity_types=excluded_entity_types,
+                max_coroutines=max_coroutines,
             )
 
             # Dedupe extracted nodes in memory
             nodes_by_episode, uuid_map = await dedupe_nodes_bulk(
-                self.clients, extracted_nodes_bulk, episode_context, entity_types
+                clients,
+                extracted_nodes_bulk,
+                episode_context,
+                entity_types,
+                max_coroutines=max_coroutines,
             )
 
             # Create Episodic Edges
@@ -671,12 +948,13 @@ class Graphiti:
 
             # Dedupe extracted edges in memory
             edges_by_episode = await dedupe_edges_bulk(
-                self.clients,
+                clients,
                 extracted_edges_bulk_updated,
                 episode_context,
                 [],
                 edge_types or {},
                 edge_type_map or edge_type_map_default,
+                max_coroutines=max_coroutines,
             )
 
             # Extract node attributes
@@ -703,14 +981,15 @@ class Graphiti:
             new_hydrated_nodes: list[list[EntityNode]] = await semaphore_gather(
                 *[
                     extract_attributes_from_nodes(
-                        self.clients,
+                        clients,
                         [params[0]],
                         params[1][0],
                         params[1][0:],
                         entity_types,
                     )
                     for params in extract_attributes_params
-                ]
+                ],
+                max_coroutines=max_coroutines,
             )
 
             hydrated_nodes = [node for nodes in new_hydrated_nodes for node in nodes]
@@ -733,14 +1012,15 @@ class Graphiti:
             node_results = await semaphore_gather(
                 *[
                     resolve_extracted_nodes(
-                        self.clients,
+                        clients,
                         nodes_by_episode_unique[episode.uuid],
                         episode,
                         previous_episodes,
                         entity_types,
                     )
                     for episode, previous_episodes in episode_context
-                ]
+                ],
+                max_coroutines=max_coroutines,
             )
 
             resolved_nodes: list[EntityNode] = []
@@ -768,14 +1048,15 @@ class Graphiti:
             hydrated_nodes_results: list[list[EntityNode]] = await semaphore_gather(
                 *[
                     extract_attributes_from_nodes(
-                        self.clients,
+                        clients,
                         nodes_by_episode_unique[episode.uuid],
                         episode,
                         previous_episodes,
                         entity_types,
                     )
                     for episode, previous_episodes in episode_context
-                ]
+                ],
+                max_coroutines=max_coroutines,
             )
 
             final_hydrated_nodes = [node for nodes in hydrated_nodes_results for node in nodes]
@@ -794,7 +1075,7 @@ class Graphiti:
             edge_results = await semaphore_gather(
                 *[
                     resolve_extracted_edges(
-                        self.clients,
+                        clients,
                         edges_by_episode_unique[episode.uuid],
                         episode,
                         hydrated_nodes,
@@ -802,7 +1083,8 @@ class Graphiti:
                         edge_type_map or edge_type_map_default,
                     )
                     for episode in episodes
-                ]
+                ],
+                max_coroutines=max_coroutines,
             )
 
             resolved_edges: list[EntityEdge] = []
@@ -824,6 +1106,9 @@ class Graphiti:
                 self.embedder,
             )
 
+            if self.episode_cache is not None:
+                self.episode_cache.add_episodes(episodes)
+
             end = time()
             logger.info(f'Completed add_episode_bulk in {(end - start) * 1000} ms')
 
@@ -976,6 +1261,18 @@ class Graphiti:
 
         return SearchResults(edges=edges, nodes=nodes)
 
+    async def _get_ingested_episode_results(self, episode: EpisodicNode) -> AddEpisodeResults:
+        results = await self.get_nodes_and_edges_by_episode([episode.uuid])
+
+        return AddEpisodeResults(
+            episode=episode,
+            episodic_edges=[],
+            nodes=results.nodes,
+            edges=results.edges,
+            communities=[],
+            community_edges=[],
+        )
+
     async def add_triplet(self, source_node: EntityNode, edge: EntityEdge, target_node: EntityNode):
         if source_node.name_embedding is None:
             await source_node.generate_name_embedding(self.embedder)
@@ -1017,36 +1314,65 @@ class Graphiti:
         )
 
     async def remove_episode(self, episode_uuid: str):
-        # Find the episode to be deleted
-        episode = await EpisodicNode.get_by_uuid(self.driver, episode_uuid)
-
-        # Find edges mentioned by the episode
-        edges = await EntityEdge.get_by_uuids(self.driver, episode.entity_edges)
-
-        # We should only delete edges created by the episode
-        edges_to_delete: list[EntityEdge] = []
-        for edge in edges:
-            if edge.episodes and edge.episodes[0] == episode.uuid:
-                edges_to_delete.append(edge)
-
-        # Find nodes mentioned by the episode
-        nodes = await get_mentioned_nodes(self.driver, [episode])
-        # We should delete all nodes that are only mentioned in the deleted episode
-        nodes_to_delete: list[EntityNode] = []
-        for node in nodes:
-            query: LiteralString = 'MATCH (e:Episodic)-[:MENTIONS]->(n:Entity {uuid: $uuid}) RETURN count(*) AS episode_count'
-            records, _, _ = await self.driver.execute_query(query, uuid=node.uuid, routing_='r')
-
-            for record in records:
-                if record['episode_count'] == 1:
-                    nodes_to_delete.append(node)
+        # Ensure the episode exists, raises NodeNotFoundError otherwise
+        await EpisodicNode.get_by_uuid(self.driver, episode_uuid)
 
-        await semaphore_gather(
-            *[node.delete(self.driver) for node in nodes_to_delete],
-            max_coroutines=self.max_coroutines,
-        )
-        await semaphore_gather(
-            *[edge.delete(self.driver) for edge in edges_to_delete],
-            max_coroutines=self.max_coroutines,
-        )
-        await episode.delete(self.driver)
+        await self.remove_episodes([episode_uuid])
+
+    async def remove_episodes(self, episode_uuids: list[str]):
+        """
+        Remove episodes and the graph data that only exists because of them.
+
+        Entity edges first created by one of the episodes are deleted, as are entity nodes that
+        are only mentioned by the removed episodes. Everything is removed in a single transaction
+        using set-based queries. Unknown uuids are ignored.
+
+        Parameters
+        ----------
+        episode_uuids : list[str]
+            The uuids of the episodes to remove.
+        """
+        if len(episode_uuids) == 0:
+            return
+
+        async def delete_episodes(tx):
+            # We should only delete edges created by the episode
+            await tx.run(
+                """
+                MATCH (episode:Episodic)
+                WHERE episode.uuid IN $episode_uuids
+                UNWIND episode.entity_edges AS edge_uuid
+                MATCH (:Entity)-[e:RELATES_TO {uuid: edge_uuid}]->(:Entity)
+                WHERE e.episodes[0] = episode.uuid
+                DELETE e
+                """,
+                episode_uuids=episode_uuids,
+            )
+            # We should delete all nodes that are only mentioned in the deleted episodes
+            await tx.run(
+                """
+                MATCH (episode:Episodic)-[:MENTIONS]->(n:Entity)
+                WHERE episode.uuid IN $episode_uuids
+                WITH DISTINCT n
+                OPTIONAL MATCH (other:Episodic)-[:MENTIONS]->(n)
+                WHERE NOT other.uuid IN $episode_uuids
+                WITH n, count(other) AS other_mentions
+                WHERE other_mentions = 0
+                DETACH DELETE n
+                """,
+                episode_uuids=episode_uuids,
+            )
+            await tx.run(
+                """
+                MATCH (episode:Episodic)
+                WHERE episode.uuid IN $episode_uuids
+                DETACH DELETE episode
+                """,
+                episode_uuids=episode_uuids,
+            )
+
+        async with self.driver.session() as session:
+            await session.execute_write(delete_episodes)
+
+        if self.episode_cache is not None:
+            self.episode_cache.remove_episodes(episode_uuids)
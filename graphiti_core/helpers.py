@@ -28,7 +28,7 @@ from numpy._typing import NDArray
 from pydantic import BaseModel
 from typing_extensions import LiteralString
 
-from graphiti_core.driver.driver import GraphProvider
+from graphiti_core.driver.driver import GraphDriver, GraphProvider
 from graphiti_core.errors import GroupIdValidationError
 
 load_dotenv()
@@ -36,7 +36,16 @@ load_dotenv()
 USE_PARALLEL_RUNTIME = bool(os.getenv('USE_PARALLEL_RUNTIME', False))
 SEMAPHORE_LIMIT = int(os.getenv('SEMAPHORE_LIMIT', 20))
 MAX_REFLEXION_ITERATIONS = int(os.getenv('MAX_REFLEXION_ITERATIONS', 0))
+ATTRIBUTE_EXTRACTION_BATCH_SIZE = int(os.getenv('ATTRIBUTE_EXTRACTION_BATCH_SIZE', 1))
+EDGE_RESOLUTION_BATCH_SIZE = int(os.getenv('EDGE_RESOLUTION_BATCH_SIZE', 1))
+# Streamed edges resolved together, sharing their embedding call and database queries
+STREAMED_EDGE_RESOLUTION_BATCH_SIZE = int(os.getenv('STREAMED_EDGE_RESOLUTION_BATCH_SIZE', 10))
+NODE_DEDUPE_SIMILARITY_THRESHOLD = float(os.getenv('NODE_DEDUPE_SIMILARITY_THRESHOLD', 0.95))
+PREVIOUS_EPISODES_TOKEN_BUDGET = int(os.getenv('PREVIOUS_EPISODES_TOKEN_BUDGET', 0))
+CHUNK_TOKEN_SIZE = int(os.getenv('CHUNK_TOKEN_SIZE', 3000))
+CHUNK_OVERLAP_TOKENS = int(os.getenv('CHUNK_OVERLAP_TOKENS', 200))
 DEFAULT_PAGE_LIMIT = 20
+DEFAULT_DELETE_BATCH_SIZE = 10000
 
 RUNTIME_QUERY: LiteralString = (
     'CYPHER runtime = parallel parallelRuntimeSupport=all\n' if USE_PARALLEL_RUNTIME else ''
@@ -64,6 +73,49 @@ def get_default_group_id(provider: GraphProvider) -> str:
         return ''
 
 
+async def delete_in_batches(
+    driver: GraphDriver,
+    match_query: str,
+    variable: str,
+    delete_query: str,
+    batch_size: int = DEFAULT_DELETE_BATCH_SIZE,
+    **kwargs: Any,
+):
+    """
+    Delete everything bound to `variable` by match_query, committing every batch_size rows.
+
+    Memory use is bounded by the batch size rather than by the number of deleted objects.
+    Uses CALL { ... } IN TRANSACTIONS on Neo4j and repeated LIMIT queries on FalkorDB.
+    """
+    if driver.provider == GraphProvider.FALKORDB:
+        while True:
+            records, _, _ = await driver.execute_query(
+                match_query
+                + f"""
+                WITH {variable} LIMIT $batch_size
+                {delete_query}
+                RETURN count(*) AS deleted_count
+                """,
+                batch_size=batch_size,
+                **kwargs,
+            )
+            if len(records) == 0 or records[0]['deleted_count'] < batch_size:
+                break
+        return
+
+    # CALL { ... } IN TRANSACTIONS is only allowed in auto-commit transactions
+    async with driver.session() as session:
+        result = await session.run(
+            match_query
+            + f"""
+            CALL {{ WITH {variable} {delete_query} }} IN TRANSACTIONS OF $batch_size ROWS
+            """,
+            batch_size=batch_size,
+            **kwargs,
+        )
+        await result.consume()
+
+
 def lucene_sanitize(query: str) -> str:
     # Escape special characters from a query before passing into Lucene
     # + - && || ! ( ) { } [ ] ^ " ~ * ? : \ /
@@ -24,19 +24,22 @@ from typing import TYPE_CHECKING, Literal
 from pydantic import BaseModel, ValidationError
 
 from ..prompts.models import Message
-from .client import LLMClient
+from .cache import LLMCache
+from .client import LLMClient, validation_retries_enabled
 from .config import DEFAULT_MAX_TOKENS, LLMConfig, ModelSize
 from .errors import RateLimitError, RefusalError
+from .metrics import observed, record_llm_usage, record_llm_validation_retry
+from .utils import get_json_schema
 
 if TYPE_CHECKING:
     import anthropic
     from anthropic import AsyncAnthropic
-    from anthropic.types import MessageParam, ToolChoiceParam, ToolUnionParam
+    from anthropic.types import MessageParam, TextBlockParam, ToolChoiceParam, ToolUnionParam
 else:
     try:
         import anthropic
         from anthropic import AsyncAnthropic
-        from anthropic.types import MessageParam, ToolChoiceParam, ToolUnionParam
+        from anthropic.types import MessageParam, TextBlockParam, ToolChoiceParam, ToolUnionParam
     except ImportError:
         raise ImportError(
             'anthropic is required for AnthropicClient. '
@@ -74,6 +77,7 @@ class AnthropicClient(LLMClient):
         cache: Whether to cache the LLM responses.
         client: An optional client instance to use.
         max_tokens: The maximum number of tokens to generate.
+        prompt_caching: Whether to mark the tools and system prompt as a cacheable prefix.
 
     Methods:
         generate_response: Generate a response from the LLM.
@@ -89,9 +93,10 @@ class AnthropicClient(LLMClient):
     def __init__(
         self,
         config: LLMConfig | None = None,
-        cache: bool = False,
+        cache: bool | LLMCache = False,
         client: AsyncAnthropic | None = None,
         max_tokens: int = DEFAULT_MAX_TOKENS,
+        prompt_caching: bool = True,
     ) -> None:
         if config is None:
             config = LLMConfig()
@@ -104,6 +109,7 @@ class AnthropicClient(LLMClient):
         super().__init__(config, cache)
         # Explicitly set the instance model to the config model to prevent type checking errors
         self.model = typing.cast(AnthropicModel, config.model)
+        self.prompt_caching = prompt_caching
 
         if not client:
             self.client = AsyncAnthropic(
@@ -153,7 +159,7 @@ class AnthropicClient(LLMClient):
         """
         if response_model is not None:
             # Use the response_model to define the tool
-            model_schema = response_model.model_json_schema()
+            model_schema = get_json_schema(response_model)
             tool_name = response_model.__name__
             description = model_schema.get('description', f'Extract {tool_name} information')
         else:
@@ -201,6 +207,11 @@ class AnthropicClient(LLMClient):
             Exception: If an error occurs during the generation process.
         """
         system_message = messages[0]
+        system: list[TextBlockParam] = [{'type': 'text', 'text': system_message.content}]
+        if self.prompt_caching:
+            # Tools and the system prompt are identical across calls to the same prompt, so the
+            # breakpoint lets Anthropic serve that prefix from its prompt cache
+            system[0]['cache_control'] = {'type': 'ephemeral'}
         user_messages = [{'role': m.role, 'content': m.content} for m in messages[1:]]
         user_messages_cast = typing.cast(list[MessageParam], user_messages)
 
@@ -215,7 +226,7 @@ class AnthropicClient(LLMClient):
             # Create the appropriate tool based on whether response_model is provided
             tools, tool_choice = self._create_tool(response_model)
             result = await self.client.messages.create(
-                system=system_message.content,
+                system=system,
                 max_tokens=max_creation_tokens,
                 temperature=self.temperature,
                 messages=user_messages_cast,
@@ -223,6 +234,7 @@ class AnthropicClient(LLMClient):
                 tools=tools,
                 tool_choice=tool_choice,
             )
+            record_llm_usage(result.model, result.usage.input_tokens, result.usage.output_tokens)
 
             # Extract the tool output from the response
             for content_item in result.content:
@@ -259,6 +271,7 @@ class AnthropicClient(LLMClient):
         except Exception as e:
             raise e
 
+    @observed
     async def generate_response(
         self,
         messages: list[Message],
@@ -286,12 +299,21 @@ class AnthropicClient(LLMClient):
             max_tokens = self.max_tokens
 
         retry_count = 0
-        max_retries = 2
+        max_retries = 2 if validation_retries_enabled() else 0
         last_error: Exception | None = None
 
+        cache_key, cached_response = await self._get_cached_response(
+            messages, response_model, model_size
+        )
+        if cached_response is not None:
+            return cached_response
+
+        # Retries append to a copy rather than the caller's messages
+        messages = list(messages)
+
         while retry_count <= max_retries:
             try:
-                response = await self._generate_response(
+                response = await self._generate_response_with_rate_limit(
                     messages, response_model, max_tokens, model_size
                 )
 
@@ -299,9 +321,9 @@ class AnthropicClient(LLMClient):
                 if response_model is not None:
                     # Validate the response against the response_model
                     model_instance = response_model(**response)
-                    return model_instance.model_dump()
+                    response = model_instance.model_dump()
 
-                # If no validation needed, return the response
+                await self._cache_response(cache_key, response)
                 return response
 
             except (RateLimitError, RefusalError):
@@ -332,6 +354,7 @@ class AnthropicClient(LLMClient):
 
                 # Common retry logic
                 retry_count += 1
+                record_llm_validation_retry()
                 messages.append(Message(role='user', content=error_context))
                 logger.warning(f'Retrying after error (attempt {retry_count}/{max_retries}): {e}')
 
@@ -15,14 +15,18 @@ limitations under the License.
 """
 
 import logging
+from collections.abc import AsyncIterator
 from typing import ClassVar
 
+import openai
 from openai import AsyncAzureOpenAI
-from openai.types.chat import ChatCompletionMessageParam
+from openai.types.chat import ChatCompletionChunk, ChatCompletionMessageParam
 from pydantic import BaseModel
 
+from .cache import LLMCache
 from .config import DEFAULT_MAX_TOKENS, LLMConfig
 from .openai_base_client import BaseOpenAIClient
+from .rate_limiter import record_response_headers
 
 logger = logging.getLogger(__name__)
 
@@ -38,8 +42,9 @@ class AzureOpenAILLMClient(BaseOpenAIClient):
         azure_client: AsyncAzureOpenAI,
         config: LLMConfig | None = None,
         max_tokens: int = DEFAULT_MAX_TOKENS,
+        cache: bool | LLMCache = False,
     ):
-        super().__init__(config, cache=False, max_tokens=max_tokens)
+        super().__init__(config, cache=cache, max_tokens=max_tokens)
         self.client = azure_client
 
     async def _create_structured_completion(
@@ -51,13 +56,15 @@ class AzureOpenAILLMClient(BaseOpenAIClient):
         response_model: type[BaseModel],
     ):
         """Create a structured completion using Azure OpenAI's beta parse API."""
-        return await self.client.beta.chat.completions.parse(
+        response = await self.client.beta.chat.completions.with_raw_response.parse(
             model=model,
             messages=messages,
             temperature=temperature,
             max_tokens=max_tokens,
             response_format=response_model,  # type: ignore
         )
+        record_response_headers(response.headers)
+        return response.parse()
 
     async def _create_completion(
         self,
@@ -68,10 +75,37 @@ class AzureOpenAILLMClient(BaseOpenAIClient):
         response_model: type[BaseModel] | None = None,
     ):
         """Create a regular completion with JSON format using Azure OpenAI."""
-        return await self.client.chat.completions.create(
+        response = await self.client.chat.completions.with_raw_response.create(
             model=model,
             messages=messages,
             temperature=temperature,
             max_tokens=max_tokens,
             response_format={'type': 'json_object'},
         )
+        record_response_headers(response.headers)
+        return response.parse()
+
+    async def _create_completion_stream(
+        self,
+        model: str,
+        messages: list[ChatCompletionMessageParam],
+        temperature: float | None,
+        max_tokens: int,
+        response_model: type[BaseModel] | None = None,
+    ) -> AsyncIterator[ChatCompletionChunk]:
+        """Stream a completion, using structured output when a response model is given."""
+        async with self.client.chat.completions.stream(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            response_format=response_model or {'type': 'json_object'},
+            stream_options={'include_usage': True},
+        ) as stream:
+            try:
+                async for event in stream:
+                    if event.type == 'chunk':
+                        yield event.chunk
+            except openai.LengthFinishReasonError:
+                # Truncated at max_tokens, the content streamed so far has been yielded
+                return
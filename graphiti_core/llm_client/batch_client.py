@@ -0,0 +1,324 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+import logging
+import os
+import typing
+from abc import ABC, abstractmethod
+from typing import ClassVar
+from uuid import uuid4
+
+from pydantic import BaseModel, ValidationError
+
+from ..prompts.models import Message
+from .cache import LLMCache
+from .client import LLMClient
+from .config import DEFAULT_MAX_TOKENS, LLMConfig, ModelSize
+from .errors import BatchRequestError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL = 60
+DEFAULT_COLLECT_INTERVAL = 1.0
+DEFAULT_MAX_BATCH_SIZE = 50000
+
+REQUESTS_FILE = 'requests.jsonl'
+RESULTS_FILE = 'results.jsonl'
+
+
+class BatchRequest(BaseModel):
+    custom_id: str
+    messages: list[Message]
+    max_tokens: int = DEFAULT_MAX_TOKENS
+    model_size: ModelSize = ModelSize.medium
+
+
+class BatchResult(BaseModel):
+    custom_id: str
+    response: dict[str, typing.Any] | None = None
+    error: str | None = None
+
+
+class BatchLLMClient(ABC):
+    """
+    Provider batch interface, trading latency for throughput and cost.
+
+    Requests are submitted together and their results are fetched once the provider has processed
+    the whole batch, which can take hours. Batches are not subject to the per-minute rate limits of
+    online requests.
+    """
+
+    def __init__(
+        self, config: LLMConfig | None = None, poll_interval: float = DEFAULT_POLL_INTERVAL
+    ):
+        self.config = config if config is not None else LLMConfig()
+        self.poll_interval = poll_interval
+
+    @abstractmethod
+    async def submit_batch(self, requests: list[BatchRequest]) -> str:
+        """Submit requests for processing and return the id of the batch."""
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def get_batch_results(self, batch_id: str) -> list[BatchResult] | None:
+        """Return the results of a batch, or None while it is still being processed."""
+        raise NotImplementedError()
+
+    async def run_batch(self, requests: list[BatchRequest]) -> dict[str, BatchResult]:
+        """Submit requests and wait for their results, keyed by custom_id."""
+        batch_id = await self.submit_batch(requests)
+        logger.info(f'Submitted batch {batch_id} with {len(requests)} requests')
+
+        while True:
+            results = await self.get_batch_results(batch_id)
+            if results is not None:
+                break
+            await asyncio.sleep(self.poll_interval)
+
+        logger.info(f'Batch {batch_id} finished with {len(results)} results')
+        return {result.custom_id: result for result in results}
+
+
+class BatchCollectingLLMClient(LLMClient):
+    """
+    LLMClient answering generate_response calls through a BatchLLMClient.
+
+    Calls are collected until none has arrived for collect_interval seconds, or max_batch_size
+    calls are pending, and are then submitted as a single batch. A pipeline stage fanning out over
+    many episodes therefore becomes one provider batch, and each caller resumes when the batch's
+    results arrive.
+
+    Responses that failed or do not validate against the response model are resubmitted with the
+    error, and the resubmissions of a batch are collected into a follow-up batch. Once MAX_RETRIES
+    resubmissions have failed, the call is answered online by fallback_llm_client, if given.
+    """
+
+    MAX_RETRIES: ClassVar[int] = 2
+
+    def __init__(
+        self,
+        batch_client: BatchLLMClient,
+        cache: bool | LLMCache = False,
+        collect_interval: float = DEFAULT_COLLECT_INTERVAL,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        fallback_llm_client: LLMClient | None = None,
+    ):
+        super().__init__(batch_client.config, cache)
+        self.batch_client = batch_client
+        self.fallback_llm_client = fallback_llm_client
+        self.collect_interval = collect_interval
+        self.max_batch_size = max_batch_size
+        self._pending: list[tuple[BatchRequest, asyncio.Future]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._batches: set[asyncio.Task] = set()
+
+    async def generate_response(
+        self,
+        messages: list[Message],
+        response_model: type[BaseModel] | None = None,
+        max_tokens: int | None = None,
+        model_size: ModelSize = ModelSize.medium,
+    ) -> dict[str, typing.Any]:
+        if max_tokens is None:
+            max_tokens = self.max_tokens
+
+        cache_key, cached_response = await self._get_cached_response(
+            messages, response_model, model_size
+        )
+        if cached_response is not None:
+            return cached_response
+
+        # The schema goes in the prompt, as batch requests cannot carry the response model
+        prepared_messages = self._prepare_messages(messages, response_model)
+        for message in prepared_messages:
+            message.content = self._clean_input(message.content)
+
+        retry_count = 0
+        while True:
+            try:
+                response = await self._generate_response(
+                    prepared_messages, response_model, max_tokens, model_size
+                )
+                if response_model is not None:
+                    response_model.model_validate(response)
+                break
+            except (BatchRequestError, ValidationError) as e:
+                if retry_count >= self.MAX_RETRIES:
+                    if self.fallback_llm_client is None:
+                        raise
+                    logger.warning(
+                        f'Answering batch request online after {retry_count} retries: {e}'
+                    )
+                    return await self.fallback_llm_client.generate_response(
+                        messages, response_model, max_tokens, model_size
+                    )
+
+                retry_count += 1
+                error_context = (
+                    f'The previous response attempt was invalid. '
+                    f'Error type: {e.__class__.__name__}. '
+                    f'Error details: {str(e)}. '
+                    f'Please try again with a valid response, ensuring the output matches '
+                    f'the expected format and constraints.'
+                )
+                prepared_messages = prepared_messages + [
+                    Message(role='user', content=error_context)
+                ]
+                logger.warning(
+                    f'Resubmitting batch request (attempt {retry_count}/{self.MAX_RETRIES}): {e}'
+                )
+
+        await self._cache_response(cache_key, response)
+
+        return response
+
+    async def _generate_response(
+        self,
+        messages: list[Message],
+        response_model: type[BaseModel] | None = None,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+        model_size: ModelSize = ModelSize.medium,
+    ) -> dict[str, typing.Any]:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        request = BatchRequest(
+            custom_id=uuid4().hex, messages=messages, max_tokens=max_tokens, model_size=model_size
+        )
+        self._pending.append((request, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self.flush()
+        else:
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+            self._flush_handle = loop.call_later(self.collect_interval, self.flush)
+
+        return await future
+
+    def flush(self):
+        """Submit the calls collected so far without waiting for the collect interval."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        pending, self._pending = self._pending, []
+        if len(pending) == 0:
+            return
+
+        task = asyncio.create_task(self._run_batch(pending))
+        self._batches.add(task)
+        task.add_done_callback(self._batches.discard)
+
+    async def _run_batch(self, pending: list[tuple[BatchRequest, asyncio.Future]]):
+        try:
+            results = await self.batch_client.run_batch([request for request, _ in pending])
+        except Exception as e:
+            logger.error(f'Error running batch of {len(pending)} requests: {e}')
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for request, future in pending:
+            # Callers may have been cancelled while the batch was processed
+            if future.done():
+                continue
+
+            result = results.get(request.custom_id)
+            if result is None:
+                future.set_exception(
+                    BatchRequestError(f'No result for batch request {request.custom_id}')
+                )
+            elif result.response is None:
+                future.set_exception(
+                    BatchRequestError(f'Batch request {request.custom_id} failed: {result.error}')
+                )
+            else:
+                future.set_result(result.response)
+
+
+class FileBatchLLMClient(BatchLLMClient):
+    """
+    Local stand-in for a provider batch API, for tests and offline runs.
+
+    Each batch is a directory holding its requests in requests.jsonl. Its results are read from
+    results.jsonl in the same directory once that file exists. The file is written by an external
+    process or, when llm_client is given, by answering the requests with it on the first poll.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        llm_client: LLMClient | None = None,
+        config: LLMConfig | None = None,
+        poll_interval: float = 1.0,
+    ):
+        if config is None and llm_client is not None:
+            config = llm_client.config
+
+        super().__init__(config, poll_interval)
+        self.directory = directory
+        self.llm_client = llm_client
+
+    async def submit_batch(self, requests: list[BatchRequest]) -> str:
+        batch_id = uuid4().hex
+        batch_directory = os.path.join(self.directory, batch_id)
+        await asyncio.to_thread(
+            _write_jsonl, batch_directory, REQUESTS_FILE, [r.model_dump_json() for r in requests]
+        )
+        return batch_id
+
+    async def get_batch_results(self, batch_id: str) -> list[BatchResult] | None:
+        batch_directory = os.path.join(self.directory, batch_id)
+        results_path = os.path.join(batch_directory, RESULTS_FILE)
+
+        if not os.path.exists(results_path):
+            if self.llm_client is None:
+                return None
+            await self._process_batch(self.llm_client, batch_directory)
+
+        lines = await asyncio.to_thread(_read_jsonl, results_path)
+        return [BatchResult.model_validate_json(line) for line in lines]
+
+    async def _process_batch(self, llm_client: LLMClient, batch_directory: str):
+        lines = await asyncio.to_thread(_read_jsonl, os.path.join(batch_directory, REQUESTS_FILE))
+        requests = [BatchRequest.model_validate_json(line) for line in lines]
+
+        results: list[BatchResult] = []
+        for request in requests:
+            try:
+                response = await llm_client._generate_response(
+                    request.messages, None, request.max_tokens, request.model_size
+                )
+                results.append(BatchResult(custom_id=request.custom_id, response=response))
+            except Exception as e:
+                results.append(BatchResult(custom_id=request.custom_id, error=str(e)))
+
+        await asyncio.to_thread(
+            _write_jsonl, batch_directory, RESULTS_FILE, [r.model_dump_json() for r in results]
+        )
+
+
+def _write_jsonl(directory: str, file_name: str, lines: list[str]):
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, file_name), 'w') as f:
+        f.write('\n'.join(lines))
+
+
+def _read_jsonl(path: str) -> list[str]:
+    with open(path) as f:
+        return [line for line in f.read().splitlines() if line.strip()]
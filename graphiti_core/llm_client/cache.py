@@ -0,0 +1,143 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import typing
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from diskcache import Cache
+from pydantic import BaseModel
+
+from ..prompts.models import Message
+from .config import ModelSize
+from .utils import get_json_schema
+
+DEFAULT_CACHE_DIR = './llm_cache'
+DEFAULT_CACHE_MAX_SIZE = 10000
+
+
+def get_cache_key(
+    model: str | None,
+    model_size: ModelSize,
+    messages: list[Message],
+    response_model: type[BaseModel] | None = None,
+) -> str:
+    """Key a response by the model, model size, prompt messages and response schema."""
+    key_data = {
+        'model': model,
+        'model_size': model_size.value,
+        'messages': [m.model_dump() for m in messages],
+        'response_schema': get_json_schema(response_model) if response_model is not None else None,
+    }
+    return hashlib.sha256(json.dumps(key_data, sort_keys=True).encode()).hexdigest()
+
+
+class LLMCache(ABC):
+    """Async store for LLM responses, shared by all LLM clients."""
+
+    @abstractmethod
+    async def get(self, key: str) -> dict[str, typing.Any] | None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def set(self, key: str, value: dict[str, typing.Any]):
+        raise NotImplementedError()
+
+    async def close(self):
+        return
+
+
+class InMemoryLLMCache(LLMCache):
+    """Least recently used in-process cache.
+
+    Responses are stored serialized so callers that mutate a returned response cannot
+    change what later cache hits see.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_MAX_SIZE):
+        self.max_size = max_size
+        self._responses: OrderedDict[str, str] = OrderedDict()
+
+    async def get(self, key: str) -> dict[str, typing.Any] | None:
+        response = self._responses.get(key)
+        if response is None:
+            return None
+        self._responses.move_to_end(key)
+        return json.loads(response)
+
+    async def set(self, key: str, value: dict[str, typing.Any]):
+        self._responses[key] = json.dumps(value)
+        self._responses.move_to_end(key)
+        while len(self._responses) > self.max_size:
+            self._responses.popitem(last=False)
+
+
+class DiskLLMCache(LLMCache):
+    """diskcache backed cache, with reads and writes run off the event loop thread."""
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR):
+        self.cache = Cache(directory)
+
+    async def get(self, key: str) -> dict[str, typing.Any] | None:
+        return await asyncio.to_thread(self.cache.get, key)
+
+    async def set(self, key: str, value: dict[str, typing.Any]):
+        await asyncio.to_thread(self.cache.set, key, value)
+
+    async def close(self):
+        await asyncio.to_thread(self.cache.close)
+
+
+class SQLiteLLMCache(LLMCache):
+    """SQLite backed cache, with queries run off the event loop thread."""
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL)'
+            )
+            self._connection.commit()
+
+    async def get(self, key: str) -> dict[str, typing.Any] | None:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: dict[str, typing.Any]):
+        await asyncio.to_thread(self._set, key, value)
+
+    async def close(self):
+        await asyncio.to_thread(self._connection.close)
+
+    def _get(self, key: str) -> dict[str, typing.Any] | None:
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT value FROM llm_cache WHERE key = ?', (key,)
+            ).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def _set(self, key: str, value: dict[str, typing.Any]):
+        with self._lock:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO llm_cache (key, value) VALUES (?, ?)',
+                (key, json.dumps(value)),
+            )
+            self._connection.commit()
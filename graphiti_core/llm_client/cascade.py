@@ -0,0 +1,174 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import logging
+import typing
+from collections.abc import Callable
+
+from pydantic import BaseModel, ValidationError
+
+from ..prompts.models import Message
+from ..utils.concurrency import ConcurrencyGovernor
+from ..utils.hedging import HedgingPolicy
+from .client import LLMClient, get_prompt_key, without_validation_retries
+from .config import DEFAULT_MAX_TOKENS, ModelSize
+from .errors import RateLimitError, RefusalError
+from .metrics import LLMCallObserver
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ESCALATION_RATE = 0.5
+DEFAULT_MIN_SAMPLES = 20
+# Prompts routed to the medium model still try the small model on every Nth call
+DEFAULT_PROBE_INTERVAL = 10
+
+ConfidenceCheck = Callable[[type[BaseModel] | None, dict[str, typing.Any]], bool]
+
+
+class CascadeStats:
+    def __init__(self):
+        self.calls = 0
+        self.small_calls = 0
+        self.escalations = 0
+
+    @property
+    def escalation_rate(self) -> float:
+        return self.escalations / self.small_calls if self.small_calls else 0.0
+
+
+class CascadingLLMClient(LLMClient):
+    """
+    Runs prompts on the small model first and escalates to the medium model when needed.
+
+    A small model response is accepted when it validates against the response model and passes
+    is_confident, if given. Otherwise the prompt is run again on the medium model, instead of
+    re-prompting the small model with validation retries. Statistics are kept per prompt,
+    identified by its prompt name, or by its response model for messages not built by the prompt
+    library. Prompts that escalated more than max_escalation_rate of the time over at least
+    min_samples calls go to the medium model directly, apart from periodic probes of the small
+    model.
+
+    Every call is made through llm_client, so its rate limiter, governor and hedging policy apply.
+    The cascade has no rate limiter of its own.
+    """
+
+    def __init__(
+        self,
+        llm_client: LLMClient,
+        is_confident: ConfidenceCheck | None = None,
+        max_escalation_rate: float = DEFAULT_MAX_ESCALATION_RATE,
+        min_samples: int = DEFAULT_MIN_SAMPLES,
+        probe_interval: int = DEFAULT_PROBE_INTERVAL,
+    ):
+        super().__init__(llm_client.config)
+        # The limits in the shared config are enforced by llm_client's rate limiter
+        self.rate_limiter = None
+        self.llm_client = llm_client
+        self.is_confident = is_confident
+        self.max_escalation_rate = max_escalation_rate
+        self.min_samples = min_samples
+        self.probe_interval = probe_interval
+        self.stats: dict[str, CascadeStats] = {}
+
+    @property  # type: ignore[override]
+    def governor(self) -> ConcurrencyGovernor | None:
+        return self.llm_client.governor
+
+    @governor.setter
+    def governor(self, governor: ConcurrencyGovernor | None):
+        self.llm_client.governor = governor
+
+    @property  # type: ignore[override]
+    def hedging_policy(self) -> HedgingPolicy | None:
+        return self.llm_client.hedging_policy
+
+    @hedging_policy.setter
+    def hedging_policy(self, hedging_policy: HedgingPolicy | None):
+        self.llm_client.hedging_policy = hedging_policy
+
+    @property  # type: ignore[override]
+    def call_observer(self) -> LLMCallObserver | None:
+        return self.llm_client.call_observer
+
+    @call_observer.setter
+    def call_observer(self, call_observer: LLMCallObserver | None):
+        self.llm_client.call_observer = call_observer
+
+    async def _generate_response(
+        self,
+        messages: list[Message],
+        response_model: type[BaseModel] | None = None,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+        model_size: ModelSize = ModelSize.medium,
+    ) -> dict[str, typing.Any]:
+        return await self.llm_client._generate_response(
+            messages, response_model, max_tokens, model_size
+        )
+
+    async def generate_response(
+        self,
+        messages: list[Message],
+        response_model: type[BaseModel] | None = None,
+        max_tokens: int | None = None,
+        model_size: ModelSize = ModelSize.medium,
+    ) -> dict[str, typing.Any]:
+        prompt = get_prompt_key(messages, response_model)
+        stats = self.stats.setdefault(prompt, CascadeStats())
+        stats.calls += 1
+
+        if model_size == ModelSize.medium and self._route_to_medium(stats):
+            return await self.llm_client.generate_response(
+                messages, response_model, max_tokens, ModelSize.medium
+            )
+
+        stats.small_calls += 1
+        try:
+            with without_validation_retries():
+                response = await self.llm_client.generate_response(
+                    messages, response_model, max_tokens, ModelSize.small
+                )
+            reason = self._get_rejection_reason(response, response_model)
+            if reason is None:
+                return response
+        except (RateLimitError, RefusalError):
+            raise
+        except Exception as e:
+            reason = f'{e.__class__.__name__}: {e}'
+
+        stats.escalations += 1
+        logger.debug(f'Escalating {prompt} to the medium model: {reason}')
+        return await self.llm_client.generate_response(
+            messages, response_model, max_tokens, ModelSize.medium
+        )
+
+    def _route_to_medium(self, stats: CascadeStats) -> bool:
+        if stats.small_calls < self.min_samples or stats.calls % self.probe_interval == 0:
+            return False
+        return stats.escalation_rate > self.max_escalation_rate
+
+    def _get_rejection_reason(
+        self, response: dict[str, typing.Any], response_model: type[BaseModel] | None
+    ) -> str | None:
+        if response_model is not None:
+            try:
+                response_model.model_validate(response)
+            except ValidationError as e:
+                return f'invalid response: {e}'
+
+        if self.is_confident is not None and not self.is_confident(response_model, response):
+            return 'low confidence'
+
+        return None
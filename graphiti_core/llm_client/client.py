@@ -14,23 +14,36 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-import hashlib
 import json
 import logging
 import typing
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
 
 import httpx
-from diskcache import Cache
 from pydantic import BaseModel
 from tenacity import retry, retry_if_exception, stop_after_attempt, wait_random_exponential
 
 from ..prompts.models import Message
+from ..utils.concurrency import ConcurrencyGovernor, ConcurrencyPool, acquire_slot
+from ..utils.hedging import HedgingPolicy
+from .cache import DiskLLMCache, LLMCache, get_cache_key
 from .config import DEFAULT_MAX_TOKENS, LLMConfig, ModelSize
 from .errors import RateLimitError
+from .metrics import LLMCallObserver, observed, record_llm_cache_hit, record_llm_retry
+from .rate_limiter import (
+    RateLimiter,
+    collect_response_headers,
+    estimate_request_tokens,
+    get_rate_limit_headers,
+)
+from .utils import get_serialized_schema
 
 DEFAULT_TEMPERATURE = 0
-DEFAULT_CACHE_DIR = './llm_cache'
+
+UNSTRUCTURED_PROMPT = 'unstructured'
 
 MULTILINGUAL_EXTRACTION_RESPONSES = (
     '\n\nAny extracted information should be returned in the same language as it was written in.'
@@ -38,6 +51,32 @@ MULTILINGUAL_EXTRACTION_RESPONSES = (
 
 logger = logging.getLogger(__name__)
 
+# Whether generate_response may re-prompt the model after an invalid response
+_validation_retries_enabled: ContextVar[bool] = ContextVar(
+    'llm_validation_retries_enabled', default=True
+)
+
+
+@contextmanager
+def without_validation_retries() -> Iterator[None]:
+    """Make generate_response calls within the block fail on the first invalid response."""
+    token = _validation_retries_enabled.set(False)
+    try:
+        yield
+    finally:
+        _validation_retries_enabled.reset(token)
+
+
+def validation_retries_enabled() -> bool:
+    return _validation_retries_enabled.get()
+
+
+def get_prompt_key(messages: list[Message], response_model: type[BaseModel] | None) -> str:
+    """Identify the prompt of a call by its prompt name, or by its response model."""
+    if messages and messages[0].prompt_name is not None:
+        return messages[0].prompt_name
+    return response_model.__name__ if response_model is not None else UNSTRUCTURED_PROMPT
+
 
 def is_server_or_retry_error(exception):
     if isinstance(exception, RateLimitError | json.decoder.JSONDecodeError):
@@ -49,7 +88,12 @@ def is_server_or_retry_error(exception):
 
 
 class LLMClient(ABC):
-    def __init__(self, config: LLMConfig | None, cache: bool = False):
+    governor: ConcurrencyGovernor | None = None
+    hedging_policy: HedgingPolicy | None = None
+    # Receives the metrics of every generate_response call, e.g. to export them as telemetry
+    call_observer: LLMCallObserver | None = None
+
+    def __init__(self, config: LLMConfig | None, cache: bool | LLMCache = False):
         if config is None:
             config = LLMConfig()
 
@@ -58,12 +102,18 @@ class LLMClient(ABC):
         self.small_model = config.small_model
         self.temperature = config.temperature
         self.max_tokens = config.max_tokens
-        self.cache_enabled = cache
-        self.cache_dir = None
 
-        # Only create the cache directory if caching is enabled
-        if self.cache_enabled:
-            self.cache_dir = Cache(DEFAULT_CACHE_DIR)
+        # cache=True keeps the original on-disk cache, only created if caching is enabled
+        self.cache: LLMCache | None = (
+            cache if isinstance(cache, LLMCache) else DiskLLMCache() if cache else None
+        )
+        self.cache_enabled = self.cache is not None
+
+        self.rate_limiter: RateLimiter | None = (
+            RateLimiter(config.requests_per_minute, config.tokens_per_minute)
+            if config.requests_per_minute or config.tokens_per_minute
+            else None
+        )
 
     def _clean_input(self, input: str) -> str:
         """Clean input string of invalid unicode and control characters.
@@ -91,11 +141,14 @@ class LLMClient(ABC):
         stop=stop_after_attempt(4),
         wait=wait_random_exponential(multiplier=10, min=5, max=120),
         retry=retry_if_exception(is_server_or_retry_error),
-        after=lambda retry_state: logger.warning(
-            f'Retrying {retry_state.fn.__name__ if retry_state.fn else "function"} after {retry_state.attempt_number} attempts...'
-        )
-        if retry_state.attempt_number > 1
-        else None,
+        after=lambda retry_state: (
+            logger.warning(
+                f'Retrying {retry_state.fn.__name__ if retry_state.fn else "function"} after {retry_state.attempt_number} attempts...'
+            )
+            if retry_state.attempt_number > 1
+            else None
+        ),
+        before_sleep=lambda retry_state: record_llm_retry(),
         reraise=True,
     )
     async def _generate_response_with_retry(
@@ -106,55 +159,141 @@ class LLMClient(ABC):
         model_size: ModelSize = ModelSize.medium,
     ) -> dict[str, typing.Any]:
         try:
-            return await self._generate_response(messages, response_model, max_tokens, model_size)
+            return await self._generate_response_with_rate_limit(
+                messages, response_model, max_tokens, model_size
+            )
         except (httpx.HTTPStatusError, RateLimitError) as e:
             raise e
 
-    @abstractmethod
-    async def _generate_response(
+    async def _generate_response_with_rate_limit(
         self,
         messages: list[Message],
         response_model: type[BaseModel] | None = None,
         max_tokens: int = DEFAULT_MAX_TOKENS,
         model_size: ModelSize = ModelSize.medium,
     ) -> dict[str, typing.Any]:
-        pass
+        """
+        Call _generate_response once the model's rate limits and an LLM slot allow it.
 
-    def _get_cache_key(self, messages: list[Message]) -> str:
-        # Create a unique cache key based on the messages and model
-        message_str = json.dumps([m.model_dump() for m in messages], sort_keys=True)
-        key_str = f'{self.model}:{message_str}'
-        return hashlib.md5(key_str.encode()).hexdigest()
+        With a hedging policy, a slow call is duplicated and the first response is used. Latencies
+        are tracked per prompt and model size, from the moment the call has its slot.
+        """
+        if self.hedging_policy is None:
+            async with self._llm_slot(messages, max_tokens, model_size):
+                return await self._generate_response(
+                    messages, response_model, max_tokens, model_size
+                )
+
+        return await self.hedging_policy.run(
+            f'{get_prompt_key(messages, response_model)}:{model_size.value}',
+            lambda: self._generate_response(messages, response_model, max_tokens, model_size),
+            lambda: self._llm_slot(messages, max_tokens, model_size),
+        )
 
-    async def generate_response(
+    @asynccontextmanager
+    async def _llm_slot(
+        self, messages: list[Message], max_tokens: int, model_size: ModelSize
+    ) -> AsyncIterator[None]:
+        """Wait for the model's rate limits and an LLM slot, then report the call's outcome."""
+        if self.rate_limiter is None:
+            async with acquire_slot(self.governor, ConcurrencyPool.llm):
+                yield
+            return
+
+        model = (self.small_model if model_size == ModelSize.small else self.model) or ''
+        await self.rate_limiter.acquire(model, estimate_request_tokens(messages, max_tokens))
+        try:
+            with collect_response_headers() as headers:
+                async with acquire_slot(self.governor, ConcurrencyPool.llm):
+                    yield
+        except RateLimitError as e:
+            self.rate_limiter.record_rate_limited(model, get_rate_limit_headers(e))
+            raise
+
+        # Successful responses carry the remaining budgets too, so the limits adapt before any 429
+        self.rate_limiter.record_success(model, headers)
+
+    @abstractmethod
+    async def _generate_response(
         self,
         messages: list[Message],
         response_model: type[BaseModel] | None = None,
-        max_tokens: int | None = None,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
         model_size: ModelSize = ModelSize.medium,
     ) -> dict[str, typing.Any]:
-        if max_tokens is None:
-            max_tokens = self.max_tokens
+        pass
+
+    async def _get_cached_response(
+        self,
+        messages: list[Message],
+        response_model: type[BaseModel] | None,
+        model_size: ModelSize,
+    ) -> tuple[str | None, dict[str, typing.Any] | None]:
+        """
+        Look up a response before the messages are modified for the provider.
+
+        Returns the cache key to store the response under and the cached response, if any. The key
+        is None when caching is disabled.
+        """
+        if self.cache is None:
+            return None, None
+
+        model = self.small_model if model_size == ModelSize.small else self.model
+        cache_key = get_cache_key(model, model_size, messages, response_model)
+        cached_response = await self.cache.get(cache_key)
+        if cached_response is not None:
+            logger.debug(f'Cache hit for {cache_key}')
+            record_llm_cache_hit()
+        return cache_key, cached_response
+
+    async def _cache_response(self, cache_key: str | None, response: dict[str, typing.Any]):
+        if self.cache is not None and cache_key is not None:
+            await self.cache.set(cache_key, response)
+
+    def _prepare_messages(
+        self, messages: list[Message], response_model: type[BaseModel] | None = None
+    ) -> list[Message]:
+        """
+        Copy the messages with the response schema and multilingual instructions added.
+
+        Both are appended to the system message rather than after the per-call data, so calls to
+        the same prompt share a byte-identical prefix that providers can serve from their prompt
+        caches. The caller's messages are not modified.
+        """
+        prepared = [message.model_copy() for message in messages]
+        if not prepared:
+            return prepared
 
         if response_model is not None:
-            serialized_model = json.dumps(response_model.model_json_schema())
-            messages[
-                -1
+            serialized_model = get_serialized_schema(response_model)
+            prepared[
+                0
             ].content += (
                 f'\n\nRespond with a JSON object in the following format:\n\n{serialized_model}'
             )
 
         # Add multilingual extraction instructions
-        messages[0].content += MULTILINGUAL_EXTRACTION_RESPONSES
+        prepared[0].content += MULTILINGUAL_EXTRACTION_RESPONSES
+        return prepared
 
-        if self.cache_enabled and self.cache_dir is not None:
-            cache_key = self._get_cache_key(messages)
+    @observed
+    async def generate_response(
+        self,
+        messages: list[Message],
+        response_model: type[BaseModel] | None = None,
+        max_tokens: int | None = None,
+        model_size: ModelSize = ModelSize.medium,
+    ) -> dict[str, typing.Any]:
+        if max_tokens is None:
+            max_tokens = self.max_tokens
 
-            cached_response = self.cache_dir.get(cache_key)
-            if cached_response is not None:
-                logger.debug(f'Cache hit for {cache_key}')
-                return cached_response
+        cache_key, cached_response = await self._get_cached_response(
+            messages, response_model, model_size
+        )
+        if cached_response is not None:
+            return cached_response
 
+        messages = self._prepare_messages(messages, response_model)
         for message in messages:
             message.content = self._clean_input(message.content)
 
@@ -162,12 +301,25 @@ class LLMClient(ABC):
             messages, response_model, max_tokens, model_size
         )
 
-        if self.cache_enabled and self.cache_dir is not None:
-            cache_key = self._get_cache_key(messages)
-            self.cache_dir.set(cache_key, response)
+        await self._cache_response(cache_key, response)
 
         return response
 
+    async def generate_response_stream(
+        self,
+        messages: list[Message],
+        response_model: type[BaseModel] | None = None,
+        max_tokens: int | None = None,
+        model_size: ModelSize = ModelSize.medium,
+    ) -> AsyncIterator[str]:
+        """
+        Yield the JSON response text as it is generated.
+
+        Clients without streaming support yield the complete response at once.
+        """
+        response = await self.generate_response(messages, response_model, max_tokens, model_size)
+        yield json.dumps(response)
+
     def _get_failed_generation_log(self, messages: list[Message], output: str | None) -> str:
         """
         Log the full input messages, the raw output (if any), and the exception for debugging failed generations.
@@ -42,6 +42,8 @@ class LLMConfig:
         temperature: float = DEFAULT_TEMPERATURE,
         max_tokens: int = DEFAULT_MAX_TOKENS,
         small_model: str | None = None,
+        requests_per_minute: int | None = None,
+        tokens_per_minute: int | None = None,
     ):
         """
         Initialize the LLMConfig with the provided parameters.
@@ -59,6 +61,11 @@ class LLMConfig:
 
                 small_model (str, optional): The specific LLM model to use for generating responses of simpler prompts.
                                                                 Defaults to "gpt-4.1-nano".
+
+                requests_per_minute (int, optional): Requests per minute allowed for each model. When this or
+                                                                tokens_per_minute is set, calls wait for budget before being sent.
+
+                tokens_per_minute (int, optional): Prompt and completion tokens per minute allowed for each model.
         """
         self.base_url = base_url
         self.api_key = api_key
@@ -66,3 +73,5 @@ class LLMConfig:
         self.small_model = small_model
         self.temperature = temperature
         self.max_tokens = max_tokens
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
@@ -37,3 +37,11 @@ class EmptyResponseError(Exception):
     def __init__(self, message: str):
         self.message = message
         super().__init__(self.message)
+
+
+class BatchRequestError(Exception):
+    """Exception raised when a request submitted through a batch API fails."""
+
+    def __init__(self, message: str):
+        self.message = message
+        super().__init__(self.message)
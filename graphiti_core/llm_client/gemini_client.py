@@ -23,9 +23,12 @@ from typing import TYPE_CHECKING, ClassVar
 from pydantic import BaseModel
 
 from ..prompts.models import Message
-from .client import MULTILINGUAL_EXTRACTION_RESPONSES, LLMClient
+from .cache import LLMCache
+from .client import LLMClient, validation_retries_enabled
 from .config import LLMConfig, ModelSize
 from .errors import RateLimitError
+from .metrics import observed, record_llm_usage, record_llm_validation_retry
+from .utils import get_serialized_schema
 
 if TYPE_CHECKING:
     from google import genai
@@ -93,7 +96,7 @@ class GeminiClient(LLMClient):
     def __init__(
         self,
         config: LLMConfig | None = None,
-        cache: bool = False,
+        cache: bool | LLMCache = False,
         max_tokens: int | None = None,
         thinking_config: types.ThinkingConfig | None = None,
         client: 'genai.Client | None' = None,
@@ -103,7 +106,7 @@ class GeminiClient(LLMClient):
 
         Args:
             config (LLMConfig | None): The configuration for the LLM client, including API key, model, temperature, and max tokens.
-            cache (bool): Whether to use caching for responses. Defaults to False.
+            cache (bool | LLMCache): Whether to cache responses, or the cache to use. Defaults to False.
             thinking_config (types.ThinkingConfig | None): Optional thinking configuration for models that support it.
                 Only use with models that support thinking (gemini-2.5+). Defaults to None.
             client (genai.Client | None): An optional async client instance to use. If not provided, a new genai.Client is created.
@@ -260,11 +263,11 @@ class GeminiClient(LLMClient):
             system_prompt = ''
             if response_model is not None:
                 # Get the schema from the Pydantic model
-                pydantic_schema = response_model.model_json_schema()
+                serialized_schema = get_serialized_schema(response_model)
 
                 # Create instruction to output in the desired JSON format
                 system_prompt += (
-                    f'Output ONLY valid JSON matching this schema: {json.dumps(pydantic_schema)}.\n'
+                    f'Output ONLY valid JSON matching this schema: {serialized_schema}.\n'
                     'Do not include any explanatory text before or after the JSON.\n\n'
                 )
 
@@ -303,6 +306,9 @@ class GeminiClient(LLMClient):
                 contents=gemini_messages,
                 config=generation_config,
             )
+            usage = getattr(response, 'usage_metadata', None)
+            if usage is not None:
+                record_llm_usage(model, usage.prompt_token_count, usage.candidates_token_count)
 
             # Always capture the raw output for debugging
             raw_output = getattr(response, 'text', None)
@@ -351,6 +357,7 @@ class GeminiClient(LLMClient):
             logger.error(f'Error in generating LLM response: {e}')
             raise Exception from e
 
+    @observed
     async def generate_response(
         self,
         messages: list[Message],
@@ -371,16 +378,26 @@ class GeminiClient(LLMClient):
         Returns:
             dict[str, typing.Any]: The response from the language model.
         """
+        # Resolved up front, as the rate limiter counts max_tokens against the tokens/min budget
+        max_tokens = self._resolve_max_tokens(max_tokens, self._get_model_for_size(model_size))
+
         retry_count = 0
+        max_attempts = self.MAX_RETRIES if validation_retries_enabled() else 1
         last_error = None
         last_output = None
 
-        # Add multilingual extraction instructions
-        messages[0].content += MULTILINGUAL_EXTRACTION_RESPONSES
+        cache_key, cached_response = await self._get_cached_response(
+            messages, response_model, model_size
+        )
+        if cached_response is not None:
+            return cached_response
+
+        # The schema is passed through the provider's structured output support instead
+        messages = self._prepare_messages(messages)
 
-        while retry_count < self.MAX_RETRIES:
+        while retry_count < max_attempts:
             try:
-                response = await self._generate_response(
+                response = await self._generate_response_with_rate_limit(
                     messages=messages,
                     response_model=response_model,
                     max_tokens=max_tokens,
@@ -391,6 +408,7 @@ class GeminiClient(LLMClient):
                     if isinstance(response, dict) and 'content' in response
                     else None
                 )
+                await self._cache_response(cache_key, response)
                 return response
             except RateLimitError as e:
                 # Rate limit errors should not trigger retries (fail fast)
@@ -405,6 +423,8 @@ class GeminiClient(LLMClient):
                     raise Exception(f'Content blocked by safety filters: {e}') from e
 
                 retry_count += 1
+                if retry_count < max_attempts:
+                    record_llm_validation_retry()
 
                 # Construct a detailed error message for the LLM
                 error_context = (
@@ -418,11 +438,11 @@ class GeminiClient(LLMClient):
                 error_message = Message(role='user', content=error_context)
                 messages.append(error_message)
                 logger.warning(
-                    f'Retrying after application error (attempt {retry_count}/{self.MAX_RETRIES}): {e}'
+                    f'Retrying after application error (attempt {retry_count}/{max_attempts}): {e}'
                 )
 
         # If we exit the loop without returning, all retries are exhausted
         logger.error('🦀 LLM generation failed and retries are exhausted.')
         logger.error(self._get_failed_generation_log(messages, last_output))
-        logger.error(f'Max retries ({self.MAX_RETRIES}) exceeded. Last error: {last_error}')
+        logger.error(f'Max retries ({max_attempts}) exceeded. Last error: {last_error}')
         raise last_error or Exception('Max retries exceeded')
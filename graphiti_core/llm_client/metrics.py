@@ -0,0 +1,153 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import functools
+import logging
+import time
+import typing
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from pydantic import BaseModel
+
+from ..prompts.models import Message
+from .config import ModelSize
+
+logger = logging.getLogger(__name__)
+
+F = typing.TypeVar('F', bound=Callable[..., Awaitable[dict[str, typing.Any]]])
+
+
+class LLMCallMetrics(BaseModel):
+    """Measurements of one generate_response call, including its retries."""
+
+    prompt_name: str | None = None
+    model: str | None = None
+    model_size: ModelSize = ModelSize.medium
+    input_tokens: int | None = None
+    output_tokens: int | None = None
+    latency: float = 0.0
+    retries: int = 0
+    validation_retries: int = 0
+    cache_hit: bool = False
+    error: str | None = None
+
+    def to_attributes(self) -> dict[str, str | int | float | bool]:
+        """Return the metrics as OpenTelemetry attributes, following the GenAI conventions."""
+        attributes: dict[str, str | int | float | bool | None] = {
+            'gen_ai.operation.name': 'chat',
+            'gen_ai.request.model': self.model,
+            'gen_ai.usage.input_tokens': self.input_tokens,
+            'gen_ai.usage.output_tokens': self.output_tokens,
+            'graphiti.prompt.name': self.prompt_name,
+            'graphiti.llm.model_size': self.model_size.value,
+            'graphiti.llm.retries': self.retries,
+            'graphiti.llm.validation_retries': self.validation_retries,
+            'graphiti.llm.cache_hit': self.cache_hit,
+            'error.type': self.error,
+        }
+        return {key: value for key, value in attributes.items() if value is not None}
+
+
+LLMCallObserver = Callable[[LLMCallMetrics], None]
+
+_current_call: ContextVar[LLMCallMetrics | None] = ContextVar('llm_call_metrics', default=None)
+
+
+def observed(func: F) -> F:
+    """
+    Report the metrics of a generate_response call to the client's call_observer, if it has one.
+
+    The metrics are collected in a context variable, so the record_* functions below add to the
+    call in progress from anywhere in the client, including hedged attempts running in tasks.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(
+        self: typing.Any,
+        messages: list[Message],
+        response_model: type[BaseModel] | None = None,
+        max_tokens: int | None = None,
+        model_size: ModelSize = ModelSize.medium,
+    ) -> dict[str, typing.Any]:
+        with observe_llm_call(self, messages, model_size):
+            return await func(self, messages, response_model, max_tokens, model_size)
+
+    return typing.cast(F, wrapper)
+
+
+@contextmanager
+def observe_llm_call(
+    client: typing.Any, messages: list[Message], model_size: ModelSize
+) -> Iterator[None]:
+    """Collect the metrics of the LLM call made within the block and report them, like observed."""
+    call_observer: LLMCallObserver | None = getattr(client, 'call_observer', None)
+    if call_observer is None:
+        yield
+        return
+
+    metrics = LLMCallMetrics(
+        prompt_name=messages[0].prompt_name if messages else None,
+        model=client.small_model if model_size == ModelSize.small else client.model,
+        model_size=model_size,
+    )
+    token = _current_call.set(metrics)
+    start = time.monotonic()
+    try:
+        yield
+    except Exception as e:
+        metrics.error = e.__class__.__name__
+        raise
+    finally:
+        metrics.latency = time.monotonic() - start
+        _current_call.reset(token)
+        try:
+            call_observer(metrics)
+        except Exception as e:
+            logger.warning(f'LLM call observer failed: {e}')
+
+
+def record_llm_usage(model: str | None, input_tokens: int | None, output_tokens: int | None):
+    """Add the token usage of a provider response to the call in progress."""
+    metrics = _current_call.get()
+    if metrics is None:
+        return
+
+    if model:
+        metrics.model = model
+    if input_tokens is not None:
+        metrics.input_tokens = (metrics.input_tokens or 0) + input_tokens
+    if output_tokens is not None:
+        metrics.output_tokens = (metrics.output_tokens or 0) + output_tokens
+
+
+def record_llm_retry():
+    metrics = _current_call.get()
+    if metrics is not None:
+        metrics.retries += 1
+
+
+def record_llm_validation_retry():
+    metrics = _current_call.get()
+    if metrics is not None:
+        metrics.validation_retries += 1
+
+
+def record_llm_cache_hit():
+    metrics = _current_call.get()
+    if metrics is not None:
+        metrics.cache_hit = True
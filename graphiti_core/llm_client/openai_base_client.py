@@ -14,10 +14,12 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import asyncio
 import json
 import logging
 import typing
 from abc import abstractmethod
+from collections.abc import AsyncIterator
 from typing import Any, ClassVar
 
 import openai
@@ -25,9 +27,11 @@ from openai.types.chat import ChatCompletionMessageParam
 from pydantic import BaseModel
 
 from ..prompts.models import Message
-from .client import MULTILINGUAL_EXTRACTION_RESPONSES, LLMClient
+from .cache import LLMCache
+from .client import LLMClient, validation_retries_enabled
 from .config import DEFAULT_MAX_TOKENS, LLMConfig, ModelSize
 from .errors import RateLimitError, RefusalError
+from .metrics import observe_llm_call, observed, record_llm_usage, record_llm_validation_retry
 
 logger = logging.getLogger(__name__)
 
@@ -49,12 +53,9 @@ class BaseOpenAIClient(LLMClient):
     def __init__(
         self,
         config: LLMConfig | None = None,
-        cache: bool = False,
+        cache: bool | LLMCache = False,
         max_tokens: int = DEFAULT_MAX_TOKENS,
     ):
-        if cache:
-            raise NotImplementedError('Caching is not implemented for OpenAI-based clients')
-
         if config is None:
             config = LLMConfig()
 
@@ -85,6 +86,22 @@ class BaseOpenAIClient(LLMClient):
         """Create a structured completion using the specific client implementation."""
         pass
 
+    def _create_completion_stream(
+        self,
+        model: str,
+        messages: list[ChatCompletionMessageParam],
+        temperature: float | None,
+        max_tokens: int,
+        response_model: type[BaseModel] | None = None,
+    ) -> AsyncIterator[Any]:
+        """
+        Stream the chunks of a completion, structured by response_model if given and JSON otherwise,
+        using the specific client implementation.
+
+        Optional: subclasses without it answer generate_response_stream with a regular call.
+        """
+        raise NotImplementedError()
+
     def _convert_messages_to_openai_format(
         self, messages: list[Message]
     ) -> list[ChatCompletionMessageParam]:
@@ -116,6 +133,11 @@ class BaseOpenAIClient(LLMClient):
         else:
             raise Exception(f'Invalid response from LLM: {response_object.model_dump()}')
 
+    def _record_usage(self, model: str, response: Any):
+        usage = getattr(response, 'usage', None)
+        if usage is not None:
+            record_llm_usage(model, usage.prompt_tokens, usage.completion_tokens)
+
     def _handle_json_response(self, response: Any) -> dict[str, Any]:
         """Handle JSON response parsing."""
         result = response.choices[0].message.content or '{}'
@@ -141,6 +163,7 @@ class BaseOpenAIClient(LLMClient):
                     max_tokens=max_tokens or self.max_tokens,
                     response_model=response_model,
                 )
+                self._record_usage(model, response)
                 return self._handle_structured_response(response)
             else:
                 response = await self._create_completion(
@@ -149,6 +172,7 @@ class BaseOpenAIClient(LLMClient):
                     temperature=self.temperature,
                     max_tokens=max_tokens or self.max_tokens,
                 )
+                self._record_usage(model, response)
                 return self._handle_json_response(response)
 
         except openai.LengthFinishReasonError as e:
@@ -159,6 +183,7 @@ class BaseOpenAIClient(LLMClient):
             logger.error(f'Error in generating LLM response: {e}')
             raise
 
+    @observed
     async def generate_response(
         self,
         messages: list[Message],
@@ -171,16 +196,24 @@ class BaseOpenAIClient(LLMClient):
             max_tokens = self.max_tokens
 
         retry_count = 0
+        max_retries = self.MAX_RETRIES if validation_retries_enabled() else 0
         last_error = None
 
-        # Add multilingual extraction instructions
-        messages[0].content += MULTILINGUAL_EXTRACTION_RESPONSES
+        cache_key, cached_response = await self._get_cached_response(
+            messages, response_model, model_size
+        )
+        if cached_response is not None:
+            return cached_response
 
-        while retry_count <= self.MAX_RETRIES:
+        # The schema is passed through the provider's structured output support instead
+        messages = self._prepare_messages(messages)
+
+        while retry_count <= max_retries:
             try:
-                response = await self._generate_response(
+                response = await self._generate_response_with_rate_limit(
                     messages, response_model, max_tokens, model_size
                 )
+                await self._cache_response(cache_key, response)
                 return response
             except (RateLimitError, RefusalError):
                 # These errors should not trigger retries
@@ -192,11 +225,12 @@ class BaseOpenAIClient(LLMClient):
                 last_error = e
 
                 # Don't retry if we've hit the max retries
-                if retry_count >= self.MAX_RETRIES:
-                    logger.error(f'Max retries ({self.MAX_RETRIES}) exceeded. Last error: {e}')
+                if retry_count >= max_retries:
+                    logger.error(f'Max retries ({max_retries}) exceeded. Last error: {e}')
                     raise
 
                 retry_count += 1
+                record_llm_validation_retry()
 
                 # Construct a detailed error message for the LLM
                 error_context = (
@@ -210,8 +244,96 @@ class BaseOpenAIClient(LLMClient):
                 error_message = Message(role='user', content=error_context)
                 messages.append(error_message)
                 logger.warning(
-                    f'Retrying after application error (attempt {retry_count}/{self.MAX_RETRIES}): {e}'
+                    f'Retrying after application error (attempt {retry_count}/{max_retries}): {e}'
                 )
 
         # If we somehow get here, raise the last error
         raise last_error or Exception('Max retries exceeded with no specific error')
+
+    async def generate_response_stream(
+        self,
+        messages: list[Message],
+        response_model: type[BaseModel] | None = None,
+        max_tokens: int | None = None,
+        model_size: ModelSize = ModelSize.medium,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a completion, with the response schema enforced through structured output.
+
+        The stream is read by a task that holds the LLM slot only while the provider is sending, so
+        a slow consumer does not keep the slot busy. Metrics are reported like generate_response.
+        Output that has been yielded cannot be taken back, so streamed calls are neither retried
+        nor hedged and errors are raised instead.
+        """
+        if type(self)._create_completion_stream is BaseOpenAIClient._create_completion_stream:
+            async for chunk in super().generate_response_stream(
+                messages, response_model, max_tokens, model_size
+            ):
+                yield chunk
+            return
+
+        if max_tokens is None:
+            max_tokens = self.max_tokens
+
+        chunks: asyncio.Queue[str | None] = asyncio.Queue()
+        reader = asyncio.ensure_future(
+            self._read_completion_stream(chunks, messages, response_model, max_tokens, model_size)
+        )
+        try:
+            while (chunk := await chunks.get()) is not None:
+                yield chunk
+            await reader
+        finally:
+            reader.cancel()
+
+    async def _read_completion_stream(
+        self,
+        chunks: asyncio.Queue[str | None],
+        messages: list[Message],
+        response_model: type[BaseModel] | None,
+        max_tokens: int,
+        model_size: ModelSize,
+    ):
+        """Read a completion stream into chunks, followed by None once it has ended or failed."""
+        try:
+            with observe_llm_call(self, messages, model_size):
+                cache_key, cached_response = await self._get_cached_response(
+                    messages, response_model, model_size
+                )
+                if cached_response is not None:
+                    chunks.put_nowait(json.dumps(cached_response))
+                    return
+
+                # The schema is passed through the provider's structured output support instead
+                messages = self._prepare_messages(messages)
+                openai_messages = self._convert_messages_to_openai_format(messages)
+                model = self._get_model_for_size(model_size)
+
+                output: list[str] = []
+                async with self._llm_slot(messages, max_tokens, model_size):
+                    try:
+                        async for chunk in self._create_completion_stream(
+                            model=model,
+                            messages=openai_messages,
+                            temperature=self.temperature,
+                            max_tokens=max_tokens,
+                            response_model=response_model,
+                        ):
+                            self._record_usage(model, chunk)
+                            content = chunk.choices[0].delta.content if chunk.choices else None
+                            if content:
+                                output.append(content)
+                                chunks.put_nowait(content)
+                    except openai.RateLimitError as e:
+                        raise RateLimitError from e
+
+                try:
+                    response = json.loads(''.join(output))
+                except json.JSONDecodeError as e:
+                    # Truncated output, e.g. at max_tokens. The caller keeps what it could parse.
+                    logger.warning(f'Streamed response is not valid JSON, not caching it: {e}')
+                    return
+
+                await self._cache_response(cache_key, response)
+        finally:
+            chunks.put_nowait(None)
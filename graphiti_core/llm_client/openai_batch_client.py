@@ -0,0 +1,127 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import json
+import logging
+import typing
+
+from openai import AsyncOpenAI
+
+from .batch_client import DEFAULT_POLL_INTERVAL, BatchLLMClient, BatchRequest, BatchResult
+from .config import LLMConfig, ModelSize
+from .openai_base_client import DEFAULT_MODEL, DEFAULT_SMALL_MODEL
+
+logger = logging.getLogger(__name__)
+
+BATCH_ENDPOINT = '/v1/chat/completions'
+BATCH_PENDING_STATUSES = {'validating', 'in_progress', 'finalizing', 'cancelling'}
+
+
+class OpenAIBatchClient(BatchLLMClient):
+    """
+    BatchLLMClient using the OpenAI Batch API.
+
+    Requests are uploaded as a JSONL file of chat completions in JSON mode. Batches ending as
+    expired or cancelled return the results they completed; the remaining requests fail.
+    """
+
+    def __init__(
+        self,
+        config: LLMConfig | None = None,
+        client: typing.Any = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        completion_window: typing.Literal['24h'] = '24h',
+    ):
+        if config is None:
+            config = LLMConfig()
+
+        super().__init__(config, poll_interval)
+        self.completion_window: typing.Literal['24h'] = completion_window
+
+        if client is None:
+            self.client = AsyncOpenAI(api_key=config.api_key, base_url=config.base_url)
+        else:
+            self.client = client
+
+    def _get_model_for_size(self, model_size: ModelSize) -> str:
+        if model_size == ModelSize.small:
+            return self.config.small_model or DEFAULT_SMALL_MODEL
+        return self.config.model or DEFAULT_MODEL
+
+    async def submit_batch(self, requests: list[BatchRequest]) -> str:
+        lines = [
+            json.dumps(
+                {
+                    'custom_id': request.custom_id,
+                    'method': 'POST',
+                    'url': BATCH_ENDPOINT,
+                    'body': {
+                        'model': self._get_model_for_size(request.model_size),
+                        'messages': [
+                            {'role': m.role, 'content': m.content} for m in request.messages
+                        ],
+                        'temperature': self.config.temperature,
+                        'max_tokens': request.max_tokens,
+                        'response_format': {'type': 'json_object'},
+                    },
+                }
+            )
+            for request in requests
+        ]
+
+        batch_file = await self.client.files.create(
+            file=('graphiti_batch.jsonl', '\n'.join(lines).encode()), purpose='batch'
+        )
+        batch = await self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=self.completion_window,
+        )
+        return batch.id
+
+    async def get_batch_results(self, batch_id: str) -> list[BatchResult] | None:
+        batch = await self.client.batches.retrieve(batch_id)
+        if batch.status in BATCH_PENDING_STATUSES:
+            return None
+
+        if batch.status != 'completed':
+            logger.warning(f'Batch {batch_id} ended with status {batch.status}')
+
+        results: list[BatchResult] = []
+        for file_id in [batch.output_file_id, batch.error_file_id]:
+            if file_id is None:
+                continue
+
+            content = await self.client.files.content(file_id)
+            for line in content.text.splitlines():
+                if line.strip():
+                    results.append(_parse_batch_result(json.loads(line)))
+
+        return results
+
+
+def _parse_batch_result(line: dict[str, typing.Any]) -> BatchResult:
+    custom_id = line['custom_id']
+    response = line.get('response') or {}
+    if line.get('error') is not None or response.get('status_code') != 200:
+        error = line.get('error') or response.get('body')
+        return BatchResult(custom_id=custom_id, error=json.dumps(error))
+
+    content = response['body']['choices'][0]['message']['content'] or ''
+    try:
+        return BatchResult(custom_id=custom_id, response=json.loads(content))
+    except json.JSONDecodeError as e:
+        return BatchResult(custom_id=custom_id, error=f'Invalid JSON in response: {e}')
@@ -15,13 +15,17 @@ limitations under the License.
 """
 
 import typing
+from collections.abc import AsyncIterator
 
+import openai
 from openai import AsyncOpenAI
-from openai.types.chat import ChatCompletionMessageParam
+from openai.types.chat import ChatCompletionChunk, ChatCompletionMessageParam
 from pydantic import BaseModel
 
+from .cache import LLMCache
 from .config import DEFAULT_MAX_TOKENS, LLMConfig
 from .openai_base_client import BaseOpenAIClient
+from .rate_limiter import record_response_headers
 
 
 class OpenAIClient(BaseOpenAIClient):
@@ -38,7 +42,7 @@ class OpenAIClient(BaseOpenAIClient):
     def __init__(
         self,
         config: LLMConfig | None = None,
-        cache: bool = False,
+        cache: bool | LLMCache = False,
         client: typing.Any = None,
         max_tokens: int = DEFAULT_MAX_TOKENS,
     ):
@@ -47,7 +51,7 @@ class OpenAIClient(BaseOpenAIClient):
 
         Args:
             config (LLMConfig | None): The configuration for the LLM client, including API key, model, base URL, temperature, and max tokens.
-            cache (bool): Whether to use caching for responses. Defaults to False.
+            cache (bool | LLMCache): Whether to cache responses, or the cache to use. Defaults to False.
             client (Any | None): An optional async client instance to use. If not provided, a new AsyncOpenAI client is created.
         """
         super().__init__(config, cache, max_tokens)
@@ -69,13 +73,15 @@ class OpenAIClient(BaseOpenAIClient):
         response_model: type[BaseModel],
     ):
         """Create a structured completion using OpenAI's beta parse API."""
-        return await self.client.beta.chat.completions.parse(
+        response = await self.client.beta.chat.completions.with_raw_response.parse(
             model=model,
             messages=messages,
             temperature=temperature,
             max_tokens=max_tokens,
             response_format=response_model,  # type: ignore
         )
+        record_response_headers(response.headers)
+        return response.parse()
 
     async def _create_completion(
         self,
@@ -86,10 +92,37 @@ class OpenAIClient(BaseOpenAIClient):
         response_model: type[BaseModel] | None = None,
     ):
         """Create a regular completion with JSON format."""
-        return await self.client.chat.completions.create(
+        response = await self.client.chat.completions.with_raw_response.create(
             model=model,
             messages=messages,
             temperature=temperature,
             max_tokens=max_tokens,
             response_format={'type': 'json_object'},
         )
+        record_response_headers(response.headers)
+        return response.parse()
+
+    async def _create_completion_stream(
+        self,
+        model: str,
+        messages: list[ChatCompletionMessageParam],
+        temperature: float | None,
+        max_tokens: int,
+        response_model: type[BaseModel] | None = None,
+    ) -> AsyncIterator[ChatCompletionChunk]:
+        """Stream a completion, using structured output when a response model is given."""
+        async with self.client.chat.completions.stream(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            response_format=response_model or {'type': 'json_object'},
+            stream_options={'include_usage': True},
+        ) as stream:
+            try:
+                async for event in stream:
+                    if event.type == 'chunk':
+                        yield event.chunk
+            except openai.LengthFinishReasonError:
+                # Truncated at max_tokens, the content streamed so far has been yielded
+                return
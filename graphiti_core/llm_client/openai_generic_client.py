@@ -25,9 +25,12 @@ from openai.types.chat import ChatCompletionMessageParam
 from pydantic import BaseModel
 
 from ..prompts.models import Message
-from .client import MULTILINGUAL_EXTRACTION_RESPONSES, LLMClient
+from .cache import LLMCache
+from .client import LLMClient, validation_retries_enabled
 from .config import DEFAULT_MAX_TOKENS, LLMConfig, ModelSize
 from .errors import RateLimitError, RefusalError
+from .metrics import observed, record_llm_usage, record_llm_validation_retry
+from .rate_limiter import record_response_headers
 
 logger = logging.getLogger(__name__)
 
@@ -48,7 +51,7 @@ class OpenAIGenericClient(LLMClient):
         max_tokens (int): The maximum number of tokens to generate in a response.
 
     Methods:
-        __init__(config: LLMConfig | None = None, cache: bool = False, client: typing.Any = None):
+        __init__(config: LLMConfig | None = None, cache: bool | LLMCache = False, client: typing.Any = None):
             Initializes the OpenAIClient with the provided configuration, cache setting, and client.
 
         _generate_response(messages: list[Message]) -> dict[str, typing.Any]:
@@ -59,21 +62,20 @@ class OpenAIGenericClient(LLMClient):
     MAX_RETRIES: ClassVar[int] = 2
 
     def __init__(
-        self, config: LLMConfig | None = None, cache: bool = False, client: typing.Any = None
+        self,
+        config: LLMConfig | None = None,
+        cache: bool | LLMCache = False,
+        client: typing.Any = None,
     ):
         """
         Initialize the OpenAIClient with the provided configuration, cache setting, and client.
 
         Args:
             config (LLMConfig | None): The configuration for the LLM client, including API key, model, base URL, temperature, and max tokens.
-            cache (bool): Whether to use caching for responses. Defaults to False.
+            cache (bool | LLMCache): Whether to cache responses, or the cache to use. Defaults to False.
             client (Any | None): An optional async client instance to use. If not provided, a new AsyncOpenAI client is created.
 
         """
-        # removed caching to simplify the `generate_response` override
-        if cache:
-            raise NotImplementedError('Caching is not implemented for OpenAI')
-
         if config is None:
             config = LLMConfig()
 
@@ -99,13 +101,19 @@ class OpenAIGenericClient(LLMClient):
             elif m.role == 'system':
                 openai_messages.append({'role': 'system', 'content': m.content})
         try:
-            response = await self.client.chat.completions.create(
+            raw_response = await self.client.chat.completions.with_raw_response.create(
                 model=self.model or DEFAULT_MODEL,
                 messages=openai_messages,
                 temperature=self.temperature,
                 max_tokens=self.max_tokens,
                 response_format={'type': 'json_object'},
             )
+            record_response_headers(raw_response.headers)
+            response = raw_response.parse()
+            if response.usage is not None:
+                record_llm_usage(
+                    response.model, response.usage.prompt_tokens, response.usage.completion_tokens
+                )
             result = response.choices[0].message.content or ''
             return json.loads(result)
         except openai.RateLimitError as e:
@@ -114,6 +122,7 @@ class OpenAIGenericClient(LLMClient):
             logger.error(f'Error in generating LLM response: {e}')
             raise
 
+    @observed
     async def generate_response(
         self,
         messages: list[Message],
@@ -125,24 +134,23 @@ class OpenAIGenericClient(LLMClient):
             max_tokens = self.max_tokens
 
         retry_count = 0
+        max_retries = self.MAX_RETRIES if validation_retries_enabled() else 0
         last_error = None
 
-        if response_model is not None:
-            serialized_model = json.dumps(response_model.model_json_schema())
-            messages[
-                -1
-            ].content += (
-                f'\n\nRespond with a JSON object in the following format:\n\n{serialized_model}'
-            )
+        cache_key, cached_response = await self._get_cached_response(
+            messages, response_model, model_size
+        )
+        if cached_response is not None:
+            return cached_response
 
-        # Add multilingual extraction instructions
-        messages[0].content += MULTILINGUAL_EXTRACTION_RESPONSES
+        messages = self._prepare_messages(messages, response_model)
 
-        while retry_count <= self.MAX_RETRIES:
+        while retry_count <= max_retries:
             try:
-                response = await self._generate_response(
+                response = await self._generate_response_with_rate_limit(
                     messages, response_model, max_tokens=max_tokens, model_size=model_size
                 )
+                await self._cache_response(cache_key, response)
                 return response
             except (RateLimitError, RefusalError):
                 # These errors should not trigger retries
@@ -154,11 +162,12 @@ class OpenAIGenericClient(LLMClient):
                 last_error = e
 
                 # Don't retry if we've hit the max retries
-                if retry_count >= self.MAX_RETRIES:
-                    logger.error(f'Max retries ({self.MAX_RETRIES}) exceeded. Last error: {e}')
+                if retry_count >= max_retries:
+                    logger.error(f'Max retries ({max_retries}) exceeded. Last error: {e}')
                     raise
 
                 retry_count += 1
+                record_llm_validation_retry()
 
                 # Construct a detailed error message for the LLM
                 error_context = (
@@ -172,7 +181,7 @@ class OpenAIGenericClient(LLMClient):
                 error_message = Message(role='user', content=error_context)
                 messages.append(error_message)
                 logger.warning(
-                    f'Retrying after application error (attempt {retry_count}/{self.MAX_RETRIES}): {e}'
+                    f'Retrying after application error (attempt {retry_count}/{max_retries}): {e}'
                 )
 
         # If we somehow get here, raise the last error
@@ -0,0 +1,248 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+import logging
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import monotonic
+
+from ..prompts.models import Message
+
+logger = logging.getLogger(__name__)
+
+# Rough average for English text with common LLM tokenizers
+CHARS_PER_TOKEN = 4
+
+# AIMD: the allowed rate is halved on a 429 and recovers by 5% of the limit per success
+AIMD_DECREASE_FACTOR = 0.5
+AIMD_INCREASE_STEP = 0.05
+MIN_RATE_SCALE = 0.05
+
+REQUEST_LIMIT_HEADERS = ['x-ratelimit-limit-requests', 'anthropic-ratelimit-requests-limit']
+REQUEST_REMAINING_HEADERS = [
+    'x-ratelimit-remaining-requests',
+    'anthropic-ratelimit-requests-remaining',
+]
+TOKEN_LIMIT_HEADERS = ['x-ratelimit-limit-tokens', 'anthropic-ratelimit-tokens-limit']
+TOKEN_REMAINING_HEADERS = ['x-ratelimit-remaining-tokens', 'anthropic-ratelimit-tokens-remaining']
+RETRY_AFTER_HEADER = 'retry-after'
+RATE_LIMIT_HEADERS = (
+    REQUEST_LIMIT_HEADERS
+    + REQUEST_REMAINING_HEADERS
+    + TOKEN_LIMIT_HEADERS
+    + TOKEN_REMAINING_HEADERS
+)
+
+# Rate limit headers of the successful responses to the request in progress
+_response_headers: ContextVar[dict[str, str] | None] = ContextVar(
+    'llm_response_headers', default=None
+)
+
+
+def estimate_request_tokens(messages: list[Message], max_tokens: int) -> int:
+    """Estimate the tokens a request counts against a tokens/min limit, prompt plus completion."""
+    return sum(len(message.content) for message in messages) // CHARS_PER_TOKEN + max_tokens
+
+
+class TokenBucket:
+    """Bucket holding up to one minute of capacity, refilled continuously."""
+
+    def __init__(self, limit_per_minute: float):
+        # The configured limit caps the limits reported by the provider
+        self.configured_limit_per_minute = limit_per_minute
+        self.limit_per_minute = limit_per_minute
+        self.capacity = limit_per_minute
+        self.available = limit_per_minute
+        self._updated_at = monotonic()
+
+    def set_capacity(self, capacity: float):
+        self._refill()
+        self.capacity = capacity
+        self.available = min(self.available, capacity)
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount can be consumed. Amounts above the capacity wait for a full bucket."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.available >= amount:
+            return 0
+        return (amount - self.available) * 60 / self.capacity
+
+    def consume(self, amount: float):
+        self._refill()
+        self.available -= min(amount, self.capacity)
+
+    def _refill(self):
+        now = monotonic()
+        self.available = min(
+            self.capacity, self.available + (now - self._updated_at) * self.capacity / 60
+        )
+        self._updated_at = now
+
+
+class ModelRateLimiter:
+    """Requests/min and tokens/min limits of a single model, adapted with AIMD."""
+
+    def __init__(self, requests_per_minute: int | None, tokens_per_minute: int | None):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.rate_scale = 1.0
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int):
+        """Wait until the request fits in both budgets. Waiting callers are served in order."""
+        async with self._lock:
+            while True:
+                wait = max(
+                    self.requests.wait_time(1) if self.requests is not None else 0,
+                    self.tokens.wait_time(tokens) if self.tokens is not None else 0,
+                    self._blocked_until - monotonic(),
+                )
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+
+            if self.requests is not None:
+                self.requests.consume(1)
+            if self.tokens is not None:
+                self.tokens.consume(tokens)
+
+    def record_success(self):
+        if self.rate_scale < 1.0:
+            self.rate_scale = min(1.0, self.rate_scale + AIMD_INCREASE_STEP)
+            self._apply_rate_scale()
+
+    def record_rate_limited(self, retry_after: float | None = None):
+        self.rate_scale = max(MIN_RATE_SCALE, self.rate_scale * AIMD_DECREASE_FACTOR)
+        self._apply_rate_scale()
+        if retry_after is not None:
+            self._blocked_until = max(self._blocked_until, monotonic() + retry_after)
+
+    def update_from_headers(self, headers: Mapping[str, str]):
+        """Adopt the provider's limits, capped by the configured ones, and remaining budgets."""
+        for bucket, limit_headers, remaining_headers in [
+            (self.requests, REQUEST_LIMIT_HEADERS, REQUEST_REMAINING_HEADERS),
+            (self.tokens, TOKEN_LIMIT_HEADERS, TOKEN_REMAINING_HEADERS),
+        ]:
+            if bucket is None:
+                continue
+
+            limit = _get_header_number(headers, limit_headers)
+            if limit is not None and limit > 0:
+                bucket.limit_per_minute = min(limit, bucket.configured_limit_per_minute)
+                bucket.set_capacity(bucket.limit_per_minute * self.rate_scale)
+
+            remaining = _get_header_number(headers, remaining_headers)
+            if remaining is not None:
+                bucket.available = min(bucket.available, remaining)
+
+    def _apply_rate_scale(self):
+        for bucket in [self.requests, self.tokens]:
+            if bucket is not None:
+                bucket.set_capacity(bucket.limit_per_minute * self.rate_scale)
+
+
+class RateLimiter:
+    """
+    Proactive per-model limiter for LLM calls.
+
+    Calls wait for budget before they are sent instead of failing with 429s and backing off. The
+    configured limits are the ceiling; they are lowered multiplicatively when the provider still
+    returns 429s and recover additively on success, and they follow the provider's rate limit
+    headers when those are available.
+    """
+
+    def __init__(
+        self, requests_per_minute: int | None = None, tokens_per_minute: int | None = None
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._models: dict[str, ModelRateLimiter] = {}
+
+    def get_model_limiter(self, model: str) -> ModelRateLimiter:
+        limiter = self._models.get(model)
+        if limiter is None:
+            limiter = ModelRateLimiter(self.requests_per_minute, self.tokens_per_minute)
+            self._models[model] = limiter
+        return limiter
+
+    async def acquire(self, model: str, tokens: int):
+        await self.get_model_limiter(model).acquire(tokens)
+
+    def record_success(self, model: str, headers: Mapping[str, str] | None = None):
+        limiter = self.get_model_limiter(model)
+        if headers:
+            limiter.update_from_headers(headers)
+        limiter.record_success()
+
+    def record_rate_limited(self, model: str, headers: Mapping[str, str] | None = None):
+        limiter = self.get_model_limiter(model)
+        retry_after = None
+        if headers is not None:
+            limiter.update_from_headers(headers)
+            retry_after = _get_header_number(headers, [RETRY_AFTER_HEADER])
+
+        logger.warning(f'Rate limited by provider for model {model}, lowering request rate')
+        limiter.record_rate_limited(retry_after)
+
+
+@contextmanager
+def collect_response_headers() -> Iterator[dict[str, str]]:
+    """Collect the rate limit headers recorded by provider calls made within the block."""
+    headers: dict[str, str] = {}
+    token = _response_headers.set(headers)
+    try:
+        yield headers
+    finally:
+        _response_headers.reset(token)
+
+
+def record_response_headers(headers: Mapping[str, str] | None):
+    """Keep the rate limit headers of a successful provider response for the rate limiter."""
+    collected = _response_headers.get()
+    if collected is None or headers is None:
+        return
+
+    for name in RATE_LIMIT_HEADERS:
+        value = headers.get(name)
+        if value is not None:
+            collected[name] = value
+
+
+def get_rate_limit_headers(error: BaseException | None) -> Mapping[str, str] | None:
+    """Find the HTTP response headers of a provider rate limit error, if it carries any."""
+    while error is not None:
+        response = getattr(error, 'response', None)
+        headers = getattr(response, 'headers', None)
+        if headers is not None:
+            return headers
+        error = error.__cause__
+    return None
+
+
+def _get_header_number(headers: Mapping[str, str], names: list[str]) -> float | None:
+    for name in names:
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            return float(value)
+        except ValueError:
+            continue
+    return None
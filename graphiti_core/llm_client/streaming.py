@@ -0,0 +1,81 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import logging
+import typing
+from collections.abc import AsyncIterator
+
+from pydantic import BaseModel, ValidationError
+from pydantic_core import from_json
+
+logger = logging.getLogger(__name__)
+
+M = typing.TypeVar('M', bound=BaseModel)
+
+
+async def stream_list_items(
+    chunks: AsyncIterator[str], field: str, item_model: type[M]
+) -> AsyncIterator[M]:
+    """
+    Yield the items of a list field of a streamed JSON object as soon as each one is complete.
+
+    An item is complete once the next one has started, or the stream has ended. The partial JSON
+    is only parsed again when a chunk could have closed an item. Items that fail validation are
+    skipped. If the stream ends in truncated JSON, e.g. at max_tokens, the items before the last
+    one are kept and the last one is dropped.
+    """
+    buffer = ''
+    emitted = 0
+
+    async for chunk in chunks:
+        buffer += chunk
+        if '}' not in chunk:
+            continue
+
+        items = _get_list_field(from_json(buffer, allow_partial=True), field)
+        # The last item may still be incomplete
+        for item in items[emitted : len(items) - 1]:
+            emitted += 1
+            validated_item = _validate_item(item, item_model)
+            if validated_item is not None:
+                yield validated_item
+
+    try:
+        items = _get_list_field(from_json(buffer), field)
+    except ValueError as e:
+        logger.warning(f'Streamed JSON is truncated, keeping the complete {field} items: {e}')
+        try:
+            items = _get_list_field(from_json(buffer, allow_partial=True), field)[:-1]
+        except ValueError:
+            items = []
+
+    for item in items[emitted:]:
+        validated_item = _validate_item(item, item_model)
+        if validated_item is not None:
+            yield validated_item
+
+
+def _get_list_field(data: typing.Any, field: str) -> list[typing.Any]:
+    items = data.get(field) if isinstance(data, dict) else None
+    return items if isinstance(items, list) else []
+
+
+def _validate_item(item: typing.Any, item_model: type[M]) -> M | None:
+    try:
+        return item_model.model_validate(item)
+    except ValidationError as e:
+        logger.warning(f'Skipping invalid streamed {item_model.__name__}: {e}')
+        return None
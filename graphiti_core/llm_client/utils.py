@@ -14,13 +14,21 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import json
 import logging
+import typing
+from functools import lru_cache
 from time import time
 
+from pydantic import BaseModel
+
 from graphiti_core.embedder.client import EmbedderClient
 
 logger = logging.getLogger(__name__)
 
+# Bounded so dynamically created response models cannot grow the caches without limit
+SCHEMA_CACHE_SIZE = 1024
+
 
 async def generate_embedding(embedder: EmbedderClient, text: str):
     start = time()
@@ -32,3 +40,14 @@ async def generate_embedding(embedder: EmbedderClient, text: str):
     logger.debug(f'embedded text of length {len(text)} in {end - start} ms')
 
     return embedding
+
+
+@lru_cache(maxsize=SCHEMA_CACHE_SIZE)
+def get_json_schema(response_model: type[BaseModel]) -> dict[str, typing.Any]:
+    """JSON schema of a response model, generated once per model class. It must not be modified."""
+    return response_model.model_json_schema()
+
+
+@lru_cache(maxsize=SCHEMA_CACHE_SIZE)
+def get_serialized_schema(response_model: type[BaseModel]) -> str:
+    return json.dumps(get_json_schema(response_model))
@@ -67,23 +67,27 @@ def get_entity_node_save_query(provider: GraphProvider, labels: str) -> str:
 
 def get_entity_node_save_bulk_query(provider: GraphProvider, nodes: list[dict]) -> str | Any:
     if provider == GraphProvider.FALKORDB:
-        queries = []
+        # FalkorDB cannot set labels from a parameter, so emit one UNWIND per distinct label set
+        nodes_by_labels: dict[tuple[str, ...], list[dict]] = {}
         for node in nodes:
-            for label in node['labels']:
-                queries.append(
-                    (
-                        f"""
-                        UNWIND $nodes AS node
-                        MERGE (n:Entity {{uuid: node.uuid}})
-                        SET n:{label}
-                        SET n = node
-                        WITH n, node
-                        SET n.name_embedding = vecf32(node.name_embedding)
-                        RETURN n.uuid AS uuid
-                        """,
-                        {'nodes': [node]},
-                    )
+            nodes_by_labels.setdefault(tuple(sorted(node['labels'])), []).append(node)
+
+        queries = []
+        for labels, label_nodes in nodes_by_labels.items():
+            queries.append(
+                (
+                    f"""
+                    UNWIND $nodes AS node
+                    MERGE (n:Entity {{uuid: node.uuid}})
+                    SET n:{':'.join(labels)}
+                    SET n = node
+                    WITH n, node
+                    SET n.name_embedding = vecf32(node.name_embedding)
+                    RETURN n.uuid AS uuid
+                    """,
+                    {'nodes': label_nodes},
                 )
+            )
         return queries
 
     return """
@@ -18,9 +18,10 @@ import logging
 from abc import ABC, abstractmethod
 from datetime import datetime
 from enum import Enum
+from hashlib import sha256
 from time import time
 from typing import Any
-from uuid import uuid4
+from uuid import UUID, uuid4, uuid5
 
 from pydantic import BaseModel, Field
 from typing_extensions import LiteralString
@@ -28,7 +29,7 @@ from typing_extensions import LiteralString
 from graphiti_core.driver.driver import GraphDriver, GraphProvider
 from graphiti_core.embedder import EmbedderClient
 from graphiti_core.errors import NodeNotFoundError
-from graphiti_core.helpers import parse_db_date
+from graphiti_core.helpers import DEFAULT_DELETE_BATCH_SIZE, delete_in_batches, parse_db_date
 from graphiti_core.models.nodes.node_db_queries import (
     COMMUNITY_NODE_RETURN,
     ENTITY_NODE_RETURN,
@@ -37,10 +38,12 @@ from graphiti_core.models.nodes.node_db_queries import (
     get_community_node_save_query,
     get_entity_node_save_query,
 )
-from graphiti_core.utils.datetime_utils import utc_now
+from graphiti_core.utils.datetime_utils import ensure_utc, utc_now
 
 logger = logging.getLogger(__name__)
 
+EPISODE_UUID_NAMESPACE = UUID('a4c1c3a0-6f3e-5b1d-8e0a-2f5d7c9b1e34')
+
 
 class EpisodeType(Enum):
     """
@@ -118,25 +121,55 @@ class Node(BaseModel, ABC):
         return False
 
     @classmethod
-    async def delete_by_group_id(cls, driver: GraphDriver, group_id: str):
+    async def delete_by_group_id(
+        cls, driver: GraphDriver, group_id: str, batch_size: int = DEFAULT_DELETE_BATCH_SIZE
+    ):
         if driver.provider == GraphProvider.FALKORDB:
             for label in ['Entity', 'Episodic', 'Community']:
-                await driver.execute_query(
-                    f"""
-                    MATCH (n:{label} {{group_id: $group_id}})
-                    DETACH DELETE n
-                    """,
+                await delete_in_batches(
+                    driver,
+                    f'MATCH (n:{label} {{group_id: $group_id}})',
+                    'n',
+                    'DETACH DELETE n',
+                    batch_size,
                     group_id=group_id,
                 )
         else:
-            await driver.execute_query(
-                """
-                MATCH (n:Entity|Episodic|Community {group_id: $group_id})
-                DETACH DELETE n
-                """,
+            await delete_in_batches(
+                driver,
+                'MATCH (n:Entity|Episodic|Community {group_id: $group_id})',
+                'n',
+                'DETACH DELETE n',
+                batch_size,
                 group_id=group_id,
             )
 
+    @classmethod
+    async def delete_by_uuids(
+        cls, driver: GraphDriver, uuids: list[str], batch_size: int = DEFAULT_DELETE_BATCH_SIZE
+    ):
+        if driver.provider == GraphProvider.FALKORDB:
+            for label in ['Entity', 'Episodic', 'Community']:
+                await delete_in_batches(
+                    driver,
+                    f'MATCH (n:{label}) WHERE n.uuid IN $uuids',
+                    'n',
+                    'DETACH DELETE n',
+                    batch_size,
+                    uuids=uuids,
+                )
+        else:
+            await delete_in_batches(
+                driver,
+                'MATCH (n:Entity|Episodic|Community) WHERE n.uuid IN $uuids',
+                'n',
+                'DETACH DELETE n',
+                batch_size,
+                uuids=uuids,
+            )
+
+        logger.debug(f'Deleted Nodes: {uuids}')
+
     @classmethod
     async def get_by_uuid(cls, driver: GraphDriver, uuid: str): ...
 
@@ -574,3 +607,23 @@ async def create_entity_node_embeddings(embedder: EmbedderClient, nodes: list[En
     name_embeddings = await embedder.create_batch([node.name for node in nodes])
     for node, name_embedding in zip(nodes, name_embeddings, strict=True):
         node.name_embedding = name_embedding
+
+
+def get_deterministic_episode_uuid(
+    group_id: str, source: EpisodeType, reference_time: datetime, content: str
+) -> str:
+    """
+    Content-addressed episode uuid, identical for every delivery of the same episode.
+
+    Two episodes get the same uuid when they share group_id, source, reference time (compared
+    in UTC) and content.
+    """
+    content_hash = sha256(content.encode('utf-8')).hexdigest()
+    reference_time_str = (ensure_utc(reference_time) or reference_time).isoformat()
+
+    return str(
+        uuid5(
+            EPISODE_UUID_NAMESPACE,
+            f'{group_id}\x00{source.value}\x00{reference_time_str}\x00{content_hash}',
+        )
+    )
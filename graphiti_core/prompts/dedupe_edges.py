@@ -34,6 +34,16 @@ class EdgeDuplicate(BaseModel):
     fact_type: str = Field(..., description='One of the provided fact types or DEFAULT')
 
 
+class EdgeDuplicateResolution(EdgeDuplicate):
+    id: int = Field(..., description='id of the NEW FACT this resolution belongs to')
+
+
+class EdgeDuplicates(BaseModel):
+    edge_duplicates: list[EdgeDuplicateResolution] = Field(
+        ..., description='List of resolutions, one for each NEW FACT'
+    )
+
+
 class UniqueFact(BaseModel):
     uuid: str = Field(..., description='unique identifier of the fact')
     fact: str = Field(..., description='fact of a unique edge')
@@ -47,12 +57,14 @@ class Prompt(Protocol):
     edge: PromptVersion
     edge_list: PromptVersion
     resolve_edge: PromptVersion
+    resolve_edges: PromptVersion
 
 
 class Versions(TypedDict):
     edge: PromptFunction
     edge_list: PromptFunction
     resolve_edge: PromptFunction
+    resolve_edges: PromptFunction
 
 
 def edge(context: dict[str, Any]) -> list[Message]:
@@ -160,4 +172,48 @@ def resolve_edge(context: dict[str, Any]) -> list[Message]:
     ]
 
 
-versions: Versions = {'edge': edge, 'edge_list': edge_list, 'resolve_edge': resolve_edge}
+def resolve_edges(context: dict[str, Any]) -> list[Message]:
+    return [
+        Message(
+            role='system',
+            content='You are a helpful assistant that de-duplicates facts from fact lists and determines which existing '
+            'facts are contradicted by new facts.',
+        ),
+        Message(
+            role='user',
+            content=f"""
+        <NEW FACTS>
+        {json.dumps(context['new_edges'], indent=2)}
+        </NEW FACTS>
+
+        Each NEW FACT comes with its own EXISTING FACTS, FACT INVALIDATION CANDIDATES and FACT TYPES.
+        Resolve every NEW FACT independently, only using the lists that belong to it.
+
+        Task:
+        If a NEW FACT represents identical factual information of one or more of its EXISTING FACTS, return the idx of the duplicate facts.
+        Facts with similar information that contain key differences should not be marked as duplicates.
+        If the NEW FACT is not a duplicate of any of its EXISTING FACTS, return an empty list.
+
+        Given its predefined FACT TYPES, determine if the NEW FACT should be classified as one of these types.
+        Return the fact type as fact_type or DEFAULT if the NEW FACT is not one of its FACT TYPES.
+
+        Based on its FACT INVALIDATION CANDIDATES, determine which existing facts the NEW FACT contradicts.
+        Return a list containing all idx's of the facts that are contradicted by the NEW FACT.
+        If there are no contradicted facts, return an empty list.
+
+        Return exactly one resolution per NEW FACT, with its id set to the id of that NEW FACT.
+
+        Guidelines:
+        1. Some facts may be very similar but will have key differences, particularly around numeric values in the facts.
+            Do not mark these facts as duplicates.
+        """,
+        ),
+    ]
+
+
+versions: Versions = {
+    'edge': edge,
+    'edge_list': edge_list,
+    'resolve_edge': resolve_edge,
+    'resolve_edges': resolve_edges,
+}
@@ -19,6 +19,7 @@ from typing import Any, Protocol, TypedDict
 
 from pydantic import BaseModel, Field
 
+from .extract_nodes import ExtractedEntity
 from .models import Message, PromptFunction, PromptVersion
 
 
@@ -41,6 +42,13 @@ class ExtractedEdges(BaseModel):
     edges: list[Edge]
 
 
+class ExtractedGraph(BaseModel):
+    extracted_entities: list[ExtractedEntity] = Field(..., description='List of extracted entities')
+    edges: list[Edge] = Field(
+        ..., description='List of facts between the extracted entities, referenced by their index'
+    )
+
+
 class MissingFacts(BaseModel):
     missing_facts: list[str] = Field(..., description="facts that weren't extracted")
 
@@ -49,44 +57,20 @@ class Prompt(Protocol):
     edge: PromptVersion
     reflexion: PromptVersion
     extract_attributes: PromptVersion
+    extract_nodes_and_edges: PromptVersion
 
 
 class Versions(TypedDict):
     edge: PromptFunction
     reflexion: PromptFunction
     extract_attributes: PromptFunction
+    extract_nodes_and_edges: PromptFunction
 
 
 def edge(context: dict[str, Any]) -> list[Message]:
-    return [
-        Message(
-            role='system',
-            content='You are an expert fact extractor that extracts fact triples from text. '
-            '1. Extracted fact triples should also be extracted with relevant date information.'
-            '2. Treat the CURRENT TIME as the time the CURRENT MESSAGE was sent. All temporal information should be extracted relative to this time.',
-        ),
-        Message(
-            role='user',
-            content=f"""
-<FACT TYPES>
-{context['edge_types']}
-</FACT TYPES>
-
-<PREVIOUS_MESSAGES>
-{json.dumps([ep for ep in context['previous_episodes']], indent=2)}
-</PREVIOUS_MESSAGES>
-
-<CURRENT_MESSAGE>
-{context['episode_content']}
-</CURRENT_MESSAGE>
-
-<ENTITIES>
-{context['nodes']} 
-</ENTITIES>
-
-<REFERENCE_TIME>
-{context['reference_time']}  # ISO 8601 (UTC); used to resolve relative time mentions
-</REFERENCE_TIME>
+    sys_prompt = """You are an expert fact extractor that extracts fact triples from text. 
+1. Extracted fact triples should also be extracted with relevant date information.
+2. Treat the CURRENT TIME as the time the CURRENT MESSAGE was sent. All temporal information should be extracted relative to this time.
 
 # TASK
 Extract all factual relationships between the given ENTITIES based on the CURRENT MESSAGE.
@@ -101,9 +85,6 @@ Only extract facts that:
 
 You may use information from the PREVIOUS MESSAGES only to disambiguate references or support continuity.
 
-
-{context['custom_prompt']}
-
 # EXTRACTION RULES
 
 1. Only emit facts where both the subject and object match IDs in ENTITIES.
@@ -121,9 +102,34 @@ You may use information from the PREVIOUS MESSAGES only to disambiguate referenc
 - If a change/termination is expressed, set `invalid_at` to the relevant timestamp.
 - Leave both fields `null` if no explicit or resolvable time is stated.
 - If only a date is mentioned (no time), assume 00:00:00.
-- If only a year is mentioned, use January 1st at 00:00:00.
-        """,
-        ),
+- If only a year is mentioned, use January 1st at 00:00:00."""
+
+    user_prompt = f"""
+<FACT TYPES>
+{context['edge_types']}
+</FACT TYPES>
+
+<PREVIOUS_MESSAGES>
+{json.dumps([ep for ep in context['previous_episodes']], indent=2)}
+</PREVIOUS_MESSAGES>
+
+<CURRENT_MESSAGE>
+{context['episode_content']}
+</CURRENT_MESSAGE>
+
+<ENTITIES>
+{context['nodes']} 
+</ENTITIES>
+
+<REFERENCE_TIME>
+{context['reference_time']}  # ISO 8601 (UTC); used to resolve relative time mentions
+</REFERENCE_TIME>
+
+{context['custom_prompt']}
+"""
+    return [
+        Message(role='system', content=sys_prompt),
+        Message(role='user', content=user_prompt),
     ]
 
 
@@ -187,8 +193,81 @@ def extract_attributes(context: dict[str, Any]) -> list[Message]:
     ]
 
 
+def extract_nodes_and_edges(context: dict[str, Any]) -> list[Message]:
+    sys_prompt = """You are an AI assistant that extracts entity nodes and the fact triples between them from text.
+    Your primary task is to extract and classify significant entities, then extract the factual relationships between them in a single pass.
+
+# TASK
+1. Extract all significant entities, concepts, or actors that are explicitly or implicitly mentioned in the CURRENT MESSAGE.
+2. Extract all factual relationships between the extracted entities based on the CURRENT MESSAGE.
+
+You may use information from the PREVIOUS MESSAGES only to disambiguate references or support continuity.
+
+# ENTITY RULES
+
+1. If the CURRENT MESSAGE is a conversation, always extract the speaker (the part before the colon `:` in each dialogue line) as an entity.
+2. Exclude entities mentioned only in the PREVIOUS MESSAGES.
+3. Classify each entity using the descriptions in ENTITY TYPES and set its `entity_type_id`.
+4. Do NOT extract entities representing relationships, actions, dates, times, or other temporal information.
+5. Be explicit and unambiguous in naming entities, using full names and resolving pronouns.
+6. Each entity is referenced by its position in `extracted_entities`, starting at 0.
+
+# FACT RULES
+
+1. `source_entity_id` and `target_entity_id` must be positions of two **distinct** entities in `extracted_entities`.
+2. Use a SCREAMING_SNAKE_CASE string as the `relation_type` (e.g., FOUNDED, WORKS_AT).
+3. The FACT TYPES provide the most important types of facts, but are not an exhaustive list. Each fact type's
+    fact_type_signature represents its source and target entity types.
+4. Do not emit duplicate or semantically redundant facts.
+5. The `fact` should quote or closely paraphrase the original source sentence(s).
+6. Use `REFERENCE_TIME` to resolve vague or relative temporal expressions (e.g., "last week").
+7. Do **not** hallucinate or infer temporal bounds from unrelated events.
+
+# DATETIME RULES
+
+- Use ISO 8601 with “Z” suffix (UTC) (e.g., 2025-04-30T00:00:00Z).
+- If the fact is ongoing (present tense), set `valid_at` to REFERENCE_TIME.
+- If a change/termination is expressed, set `invalid_at` to the relevant timestamp.
+- Leave both fields `null` if no explicit or resolvable time is stated.
+- If only a date is mentioned (no time), assume 00:00:00.
+- If only a year is mentioned, use January 1st at 00:00:00."""
+
+    user_prompt = f"""
+<ENTITY TYPES>
+{context['entity_types']}
+</ENTITY TYPES>
+
+<FACT TYPES>
+{context['edge_types']}
+</FACT TYPES>
+
+<SOURCE DESCRIPTION>
+{context['source_description']}
+</SOURCE DESCRIPTION>
+
+<PREVIOUS_MESSAGES>
+{json.dumps([ep for ep in context['previous_episodes']], indent=2)}
+</PREVIOUS_MESSAGES>
+
+<CURRENT_MESSAGE>
+{context['episode_content']}
+</CURRENT_MESSAGE>
+
+<REFERENCE_TIME>
+{context['reference_time']}  # ISO 8601 (UTC); used to resolve relative time mentions
+</REFERENCE_TIME>
+
+{context['custom_prompt']}
+"""
+    return [
+        Message(role='system', content=sys_prompt),
+        Message(role='user', content=user_prompt),
+    ]
+
+
 versions: Versions = {
     'edge': edge,
     'reflexion': reflexion,
     'extract_attributes': extract_attributes,
+    'extract_nodes_and_edges': extract_nodes_and_edges,
 }
@@ -59,6 +59,7 @@ class Prompt(Protocol):
     reflexion: PromptVersion
     classify_nodes: PromptVersion
     extract_attributes: PromptVersion
+    extract_attributes_batch: PromptVersion
 
 
 class Versions(TypedDict):
@@ -68,24 +69,12 @@ class Versions(TypedDict):
     reflexion: PromptFunction
     classify_nodes: PromptFunction
     extract_attributes: PromptFunction
+    extract_attributes_batch: PromptFunction
 
 
 def extract_message(context: dict[str, Any]) -> list[Message]:
     sys_prompt = """You are an AI assistant that extracts entity nodes from conversational messages. 
-    Your primary task is to extract and classify the speaker and other significant entities mentioned in the conversation."""
-
-    user_prompt = f"""
-<ENTITY TYPES>
-{context['entity_types']}
-</ENTITY TYPES>
-
-<PREVIOUS MESSAGES>
-{json.dumps([ep for ep in context['previous_episodes']], indent=2)}
-</PREVIOUS MESSAGES>
-
-<CURRENT MESSAGE>
-{context['episode_content']}
-</CURRENT MESSAGE>
+    Your primary task is to extract and classify the speaker and other significant entities mentioned in the conversation.
 
 Instructions:
 
@@ -109,7 +98,20 @@ reference entities.
    - Do NOT extract dates, times, or other temporal information—these will be handled separately.
 
 5. **Formatting**:
-   - Be **explicit and unambiguous** in naming entities (e.g., use full names when available).
+   - Be **explicit and unambiguous** in naming entities (e.g., use full names when available)."""
+
+    user_prompt = f"""
+<ENTITY TYPES>
+{context['entity_types']}
+</ENTITY TYPES>
+
+<PREVIOUS MESSAGES>
+{json.dumps([ep for ep in context['previous_episodes']], indent=2)}
+</PREVIOUS MESSAGES>
+
+<CURRENT MESSAGE>
+{context['episode_content']}
+</CURRENT MESSAGE>
 
 {context['custom_prompt']}
 """
@@ -121,7 +123,15 @@ reference entities.
 
 def extract_json(context: dict[str, Any]) -> list[Message]:
     sys_prompt = """You are an AI assistant that extracts entity nodes from JSON. 
-    Your primary task is to extract and classify relevant entities from JSON files"""
+    Your primary task is to extract and classify relevant entities from JSON files
+
+Given a source description and JSON, extract relevant entities from the provided JSON.
+For each entity extracted, also determine its entity type based on the provided ENTITY TYPES and their descriptions.
+Indicate the classified entity type by providing its entity_type_id.
+
+Guidelines:
+1. Always try to extract an entities that the JSON represents. This will often be something like a "name" or "user field
+2. Do NOT extract any properties that contain dates"""
 
     user_prompt = f"""
 <ENTITY TYPES>
@@ -136,14 +146,6 @@ def extract_json(context: dict[str, Any]) -> list[Message]:
 </JSON>
 
 {context['custom_prompt']}
-
-Given the above source description and JSON, extract relevant entities from the provided JSON.
-For each entity extracted, also determine its entity type based on the provided ENTITY TYPES and their descriptions.
-Indicate the classified entity type by providing its entity_type_id.
-
-Guidelines:
-1. Always try to extract an entities that the JSON represents. This will often be something like a "name" or "user field
-2. Do NOT extract any properties that contain dates
 """
     return [
         Message(role='system', content=sys_prompt),
@@ -153,7 +155,17 @@ Guidelines:
 
 def extract_text(context: dict[str, Any]) -> list[Message]:
     sys_prompt = """You are an AI assistant that extracts entity nodes from text. 
-    Your primary task is to extract and classify the speaker and other significant entities mentioned in the provided text."""
+    Your primary task is to extract and classify the speaker and other significant entities mentioned in the provided text.
+
+Given a TEXT, extract entities from the TEXT that are explicitly or implicitly mentioned.
+For each entity extracted, also determine its entity type based on the provided ENTITY TYPES and their descriptions.
+Indicate the classified entity type by providing its entity_type_id.
+
+Guidelines:
+1. Extract significant entities, concepts, or actors mentioned in the conversation.
+2. Avoid creating nodes for relationships or actions.
+3. Avoid creating nodes for temporal information like dates, times or years (these will be added to edges later).
+4. Be as explicit as possible in your node names, using full names and avoiding abbreviations."""
 
     user_prompt = f"""
 <ENTITY TYPES>
@@ -164,17 +176,7 @@ def extract_text(context: dict[str, Any]) -> list[Message]:
 {context['episode_content']}
 </TEXT>
 
-Given the above text, extract entities from the TEXT that are explicitly or implicitly mentioned.
-For each entity extracted, also determine its entity type based on the provided ENTITY TYPES and their descriptions.
-Indicate the classified entity type by providing its entity_type_id.
-
 {context['custom_prompt']}
-
-Guidelines:
-1. Extract significant entities, concepts, or actors mentioned in the conversation.
-2. Avoid creating nodes for relationships or actions.
-3. Avoid creating nodes for temporal information like dates, times or years (these will be added to edges later).
-4. Be as explicit as possible in your node names, using full names and avoiding abbreviations.
 """
     return [
         Message(role='system', content=sys_prompt),
@@ -270,6 +272,40 @@ def extract_attributes(context: dict[str, Any]) -> list[Message]:
     ]
 
 
+def extract_attributes_batch(context: dict[str, Any]) -> list[Message]:
+    return [
+        Message(
+            role='system',
+            content='You are a helpful assistant that extracts entity properties from the provided text.',
+        ),
+        Message(
+            role='user',
+            content=f"""
+
+        <MESSAGES>
+        {json.dumps(context['previous_episodes'], indent=2)}
+        {json.dumps(context['episode_content'], indent=2)}
+        </MESSAGES>
+
+        Given the above MESSAGES and the following list of ENTITIES, update the attributes of each entity based on
+        the information provided in MESSAGES. Use the provided attribute descriptions to better understand how each
+        attribute should be determined.
+
+        Guidelines:
+        1. Do not hallucinate entity property values if they cannot be found in the current context.
+        2. Only use the provided MESSAGES and ENTITIES to set attribute values.
+        3. The summary attribute represents a summary of an ENTITY, and should be updated with new information about
+            that Entity from the MESSAGES. Summaries must be no longer than 250 words.
+        4. Return exactly one attributes object per ENTITY, with its entity_id set to the entity_id of that ENTITY.
+
+        <ENTITIES>
+        {json.dumps(context['nodes'], indent=2, default=str)}
+        </ENTITIES>
+        """,
+        ),
+    ]
+
+
 versions: Versions = {
     'extract_message': extract_message,
     'extract_json': extract_json,
@@ -277,4 +313,5 @@ versions: Versions = {
     'reflexion': reflexion,
     'classify_nodes': classify_nodes,
     'extract_attributes': extract_attributes,
+    'extract_attributes_batch': extract_attributes_batch,
 }
@@ -67,26 +67,29 @@ class PromptLibraryImpl(TypedDict):
 
 
 class VersionWrapper:
-    def __init__(self, func: PromptFunction):
+    def __init__(self, func: PromptFunction, name: str | None = None):
         self.func = func
+        self.name = name
 
     def __call__(self, context: dict[str, Any]) -> list[Message]:
         messages = self.func(context)
         for message in messages:
             message.content += DO_NOT_ESCAPE_UNICODE if message.role == 'system' else ''
+            message.prompt_name = self.name
         return messages
 
 
 class PromptTypeWrapper:
-    def __init__(self, versions: dict[str, PromptFunction]):
+    def __init__(self, versions: dict[str, PromptFunction], prompt_type: str | None = None):
         for version, func in versions.items():
-            setattr(self, version, VersionWrapper(func))
+            name = f'{prompt_type}.{version}' if prompt_type is not None else version
+            setattr(self, version, VersionWrapper(func, name))
 
 
 class PromptLibraryWrapper:
     def __init__(self, library: PromptLibraryImpl):
         for prompt_type, versions in library.items():
-            setattr(self, prompt_type, PromptTypeWrapper(versions))  # type: ignore[arg-type]
+            setattr(self, prompt_type, PromptTypeWrapper(versions, prompt_type))  # type: ignore[arg-type]
 
 
 PROMPT_LIBRARY_IMPL: PromptLibraryImpl = {
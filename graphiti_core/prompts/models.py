@@ -17,12 +17,14 @@ limitations under the License.
 from collections.abc import Callable
 from typing import Any, Protocol
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class Message(BaseModel):
     role: str
     content: str
+    # Set by the prompt library to identify the prompt in LLM call metrics, never sent or cached
+    prompt_name: str | None = Field(default=None, exclude=True)
 
 
 class PromptVersion(Protocol):
@@ -42,7 +42,7 @@ from graphiti_core.utils.maintenance.edge_operations import (
 )
 from graphiti_core.utils.maintenance.graph_data_operations import (
     EPISODE_WINDOW_LEN,
-    retrieve_episodes,
+    retrieve_episode_windows,
 )
 from graphiti_core.utils.maintenance.node_operations import (
     extract_nodes,
@@ -66,17 +66,29 @@ class RawEpisode(BaseModel):
 async def retrieve_previous_episodes_bulk(
     driver: GraphDriver, episodes: list[EpisodicNode]
 ) -> list[tuple[EpisodicNode, list[EpisodicNode]]]:
-    previous_episodes_list = await semaphore_gather(
-        *[
-            retrieve_episodes(
-                driver, episode.valid_at, last_n=EPISODE_WINDOW_LEN, group_ids=[episode.group_id]
-            )
-            for episode in episodes
-        ]
+    """
+    Retrieve the episode window of each episode, including the episodes of the batch itself.
+
+    The batch is not saved until its extraction has finished, so its episodes are merged into
+    the windows read from the graph.
+    """
+    previous_episodes_list = await retrieve_episode_windows(
+        driver, episodes, last_n=EPISODE_WINDOW_LEN
     )
-    episode_tuples: list[tuple[EpisodicNode, list[EpisodicNode]]] = [
-        (episode, previous_episodes_list[i]) for i, episode in enumerate(episodes)
-    ]
+    episode_tuples: list[tuple[EpisodicNode, list[EpisodicNode]]] = []
+    for episode, stored_episodes in zip(episodes, previous_episodes_list, strict=True):
+        window: dict[str, EpisodicNode] = {
+            previous_episode.uuid: previous_episode for previous_episode in stored_episodes
+        }
+        for batch_episode in episodes:
+            if (
+                batch_episode.group_id == episode.group_id
+                and batch_episode.valid_at <= episode.valid_at
+            ):
+                window[batch_episode.uuid] = batch_episode
+
+        previous_episodes = sorted(window.values(), key=lambda e: e.valid_at)[-EPISODE_WINDOW_LEN:]
+        episode_tuples.append((episode, previous_episodes))
 
     return episode_tuples
 
@@ -172,12 +184,14 @@ async def extract_nodes_and_edges_bulk(
     entity_types: dict[str, BaseModel] | None = None,
     excluded_entity_types: list[str] | None = None,
     edge_types: dict[str, BaseModel] | None = None,
+    max_coroutines: int | None = None,
 ) -> tuple[list[list[EntityNode]], list[list[EntityEdge]]]:
     extracted_nodes_bulk: list[list[EntityNode]] = await semaphore_gather(
         *[
             extract_nodes(clients, episode, previous_episodes, entity_types, excluded_entity_types)
             for episode, previous_episodes in episode_tuples
-        ]
+        ],
+        max_coroutines=max_coroutines,
     )
 
     extracted_edges_bulk: list[list[EntityEdge]] = await semaphore_gather(
@@ -192,7 +206,8 @@ async def extract_nodes_and_edges_bulk(
                 edge_types=edge_types,
             )
             for i, (episode, previous_episodes) in enumerate(episode_tuples)
-        ]
+        ],
+        max_coroutines=max_coroutines,
     )
 
     return extracted_nodes_bulk, extracted_edges_bulk
@@ -203,6 +218,7 @@ async def dedupe_nodes_bulk(
     extracted_nodes: list[list[EntityNode]],
     episode_tuples: list[tuple[EpisodicNode, list[EpisodicNode]]],
     entity_types: dict[str, BaseModel] | None = None,
+    max_coroutines: int | None = None,
 ) -> tuple[dict[str, list[EntityNode]], dict[str, str]]:
     embedder = clients.embedder
     min_score = 0.8
@@ -257,7 +273,8 @@ async def dedupe_nodes_bulk(
                 existing_nodes_override=dedupe_tuples[i][1],
             )
             for i, dedupe_tuple in enumerate(dedupe_tuples)
-        ]
+        ],
+        max_coroutines=max_coroutines,
     )
 
     # Collect all duplicate pairs sorted by uuid
@@ -292,6 +309,7 @@ async def dedupe_edges_bulk(
     _entities: list[EntityNode],
     edge_types: dict[str, BaseModel],
     _edge_type_map: dict[tuple[str, str], list[str]],
+    max_coroutines: int | None = None,
 ) -> dict[str, list[EntityEdge]]:
     embedder = clients.embedder
     min_score = 0.6
@@ -346,7 +364,8 @@ async def dedupe_edges_bulk(
                 clients.llm_client, edge, candidates, candidates, episode, edge_types
             )
             for episode, edge, candidates in dedupe_tuples
-        ]
+        ],
+        max_coroutines=max_coroutines,
     )
 
     # For now we won't track edge invalidation
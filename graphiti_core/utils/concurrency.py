@@ -0,0 +1,104 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+import functools
+import os
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import AbstractAsyncContextManager, asynccontextmanager, nullcontext
+from enum import Enum
+from typing import Any, TypeVar
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Kept here rather than in helpers, which imports the driver package this module is used by
+DEFAULT_CONCURRENCY_LIMIT = int(os.getenv('SEMAPHORE_LIMIT', 20))
+LLM_CONCURRENCY_LIMIT = int(os.getenv('LLM_CONCURRENCY_LIMIT', DEFAULT_CONCURRENCY_LIMIT))
+EMBEDDER_CONCURRENCY_LIMIT = int(os.getenv('EMBEDDER_CONCURRENCY_LIMIT', DEFAULT_CONCURRENCY_LIMIT))
+RERANKER_CONCURRENCY_LIMIT = int(os.getenv('RERANKER_CONCURRENCY_LIMIT', DEFAULT_CONCURRENCY_LIMIT))
+DB_CONCURRENCY_LIMIT = int(os.getenv('DB_CONCURRENCY_LIMIT', DEFAULT_CONCURRENCY_LIMIT))
+TOTAL_CONCURRENCY_LIMIT = int(os.getenv('TOTAL_CONCURRENCY_LIMIT', 0))
+
+T = TypeVar('T')
+
+
+class ConcurrencyPool(Enum):
+    llm = 'llm'
+    embedder = 'embedder'
+    reranker = 'reranker'
+    db = 'db'
+
+
+class ConcurrencyGovernor:
+    """
+    Shared bounds on in-flight LLM, embedder, reranker and database operations.
+
+    Slots are only taken by leaf operations (a completion, an embedding request, a rerank, a
+    query), never by the gathers fanning out to them, so nested fan-outs cannot multiply the
+    amount of concurrent work or deadlock waiting on their own children. Each pool has its own
+    limit and total_limit, when set, additionally caps all pools together.
+    """
+
+    def __init__(
+        self,
+        llm_limit: int = LLM_CONCURRENCY_LIMIT,
+        embedder_limit: int = EMBEDDER_CONCURRENCY_LIMIT,
+        reranker_limit: int = RERANKER_CONCURRENCY_LIMIT,
+        db_limit: int = DB_CONCURRENCY_LIMIT,
+        total_limit: int | None = TOTAL_CONCURRENCY_LIMIT or None,
+    ):
+        self.limits = {
+            ConcurrencyPool.llm: llm_limit,
+            ConcurrencyPool.embedder: embedder_limit,
+            ConcurrencyPool.reranker: reranker_limit,
+            ConcurrencyPool.db: db_limit,
+        }
+        self.total_limit = total_limit
+        self._pools = {pool: asyncio.Semaphore(limit) for pool, limit in self.limits.items()}
+        self._total = asyncio.Semaphore(total_limit) if total_limit else None
+
+    @asynccontextmanager
+    async def slot(self, pool: ConcurrencyPool) -> AsyncIterator[None]:
+        async with self._pools[pool]:
+            if self._total is None:
+                yield
+            else:
+                async with self._total:
+                    yield
+
+
+def acquire_slot(
+    governor: ConcurrencyGovernor | None, pool: ConcurrencyPool
+) -> AbstractAsyncContextManager[None]:
+    return governor.slot(pool) if governor is not None else nullcontext()
+
+
+def governed(
+    pool: ConcurrencyPool,
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """Run a client method in a slot of its governor's pool, if the client has a governor."""
+
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(func)
+        async def wrapper(self: Any, *args: Any, **kwargs: Any) -> T:
+            async with acquire_slot(getattr(self, 'governor', None), pool):
+                return await func(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,137 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import logging
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from pydantic import BaseModel, Field
+
+from graphiti_core.driver.driver import GraphDriver
+from graphiti_core.nodes import EpisodeType, EpisodicNode
+from graphiti_core.search.search_utils import RELEVANT_SCHEMA_LIMIT
+from graphiti_core.utils.datetime_utils import ensure_utc
+from graphiti_core.utils.maintenance.graph_data_operations import retrieve_episodes
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_GROUPS = 10000
+
+# Used to load the most recent episodes regardless of their reference time
+MAX_REFERENCE_TIME = datetime(9999, 12, 31, tzinfo=timezone.utc)
+
+
+class EpisodeWindow(BaseModel):
+    episodes: list[EpisodicNode] = Field(
+        default_factory=list, description='most recent episodes in chronological order'
+    )
+    truncated: bool = Field(
+        default=False, description='whether older episodes than the ones held may exist'
+    )
+
+
+class RecentEpisodeCache:
+    """
+    In-memory window of the most recent episodes per group and source.
+
+    Windows are loaded from the graph on first use and kept current as episodes are written, so
+    steady-state ingestion can fetch previous episodes without querying the graph. Requests the
+    window cannot answer, e.g. for a reference time older than the window, fall back to the graph.
+    The cache only sees writes made through the Graphiti instance that owns it.
+    """
+
+    def __init__(self, capacity: int = RELEVANT_SCHEMA_LIMIT, max_groups: int = DEFAULT_MAX_GROUPS):
+        self.capacity = capacity
+        self.max_groups = max_groups
+        self._windows: OrderedDict[tuple[str, str | None], EpisodeWindow] = OrderedDict()
+
+    async def retrieve_episodes(
+        self,
+        driver: GraphDriver,
+        reference_time: datetime,
+        last_n: int = RELEVANT_SCHEMA_LIMIT,
+        group_ids: list[str] | None = None,
+        source: EpisodeType | None = None,
+    ) -> list[EpisodicNode]:
+        """Same contract as graph_data_operations.retrieve_episodes."""
+        if group_ids is None or len(group_ids) != 1 or last_n > self.capacity:
+            return await retrieve_episodes(driver, reference_time, last_n, group_ids, source)
+
+        key = (group_ids[0], source.name if source is not None else None)
+        window = self._windows.get(key)
+        if window is None:
+            episodes = await retrieve_episodes(
+                driver, MAX_REFERENCE_TIME, self.capacity, group_ids, source
+            )
+            window = EpisodeWindow(episodes=episodes, truncated=len(episodes) >= self.capacity)
+            self._set_window(key, window)
+        else:
+            self._windows.move_to_end(key)
+
+        reference_time_utc = ensure_utc(reference_time)
+        candidates = [
+            episode
+            for episode in window.episodes
+            if reference_time_utc is None or _valid_at(episode) <= reference_time_utc
+        ]
+
+        if len(candidates) >= last_n:
+            return candidates[len(candidates) - last_n :] if last_n > 0 else []
+        if not window.truncated:
+            return candidates
+
+        # Older episodes than the ones in the window are needed
+        logger.debug(f'Recent episode cache miss for group {group_ids[0]}')
+        return await retrieve_episodes(driver, reference_time, last_n, group_ids, source)
+
+    def add_episodes(self, episodes: list[EpisodicNode]):
+        """Record written episodes in the windows that are already loaded."""
+        for episode in episodes:
+            for key in [(episode.group_id, None), (episode.group_id, episode.source.name)]:
+                window = self._windows.get(key)
+                if window is None:
+                    continue
+
+                window_episodes = [e for e in window.episodes if e.uuid != episode.uuid]
+                window_episodes.append(episode)
+                window_episodes.sort(key=_valid_at)
+                if len(window_episodes) > self.capacity:
+                    window_episodes = window_episodes[len(window_episodes) - self.capacity :]
+                    window.truncated = True
+                window.episodes = window_episodes
+
+    def remove_episodes(self, episode_uuids: list[str]):
+        """Drop the windows holding any of the removed episodes so they are reloaded."""
+        uuids = set(episode_uuids)
+        for key in [
+            key
+            for key, window in self._windows.items()
+            if any(episode.uuid in uuids for episode in window.episodes)
+        ]:
+            del self._windows[key]
+
+    def clear(self):
+        self._windows.clear()
+
+    def _set_window(self, key: tuple[str, str | None], window: EpisodeWindow):
+        self._windows[key] = window
+        self._windows.move_to_end(key)
+        while len(self._windows) > self.max_groups:
+            self._windows.popitem(last=False)
+
+
+def _valid_at(episode: EpisodicNode) -> datetime:
+    return ensure_utc(episode.valid_at) or episode.valid_at
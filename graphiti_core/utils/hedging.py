@@ -0,0 +1,179 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+import functools
+import logging
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from contextlib import AbstractAsyncContextManager, nullcontext
+from typing import Any, TypeVar
+
+from .concurrency import ConcurrencyPool, acquire_slot
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEDGE_PERCENTILE = 0.95
+DEFAULT_LATENCY_WINDOW = 200
+DEFAULT_MIN_SAMPLES = 20
+# Duplicates issued per request, so hedging adds at most this fraction of extra spend
+DEFAULT_MAX_HEDGE_RATE = 0.05
+DEFAULT_MIN_HEDGE_DELAY = 1.0
+
+T = TypeVar('T')
+
+
+class HedgingPolicy:
+    """
+    Duplicates requests that take longer than usual and keeps the first response.
+
+    Latencies of successful requests are tracked per request type, e.g. per prompt. Once
+    min_samples latencies of a type have been observed, a request that has not returned after the
+    given percentile of the recent latencies is issued again. The first successful response wins
+    and the other request is cancelled. No more than max_hedge_rate duplicates are issued per
+    request, which bounds the extra spend.
+    """
+
+    def __init__(
+        self,
+        percentile: float = DEFAULT_HEDGE_PERCENTILE,
+        window_size: int = DEFAULT_LATENCY_WINDOW,
+        min_samples: int = DEFAULT_MIN_SAMPLES,
+        max_hedge_rate: float = DEFAULT_MAX_HEDGE_RATE,
+        min_delay: float = DEFAULT_MIN_HEDGE_DELAY,
+    ):
+        if not 0 < percentile < 1:
+            raise ValueError('percentile must be between 0 and 1')
+
+        self.percentile = percentile
+        self.window_size = window_size
+        self.min_samples = max(min_samples, 1)
+        self.max_hedge_rate = max_hedge_rate
+        self.min_delay = min_delay
+        self.requests = 0
+        self.hedges = 0
+        self._latencies: dict[str, deque[float]] = {}
+
+    def get_hedge_delay(self, key: str) -> float | None:
+        """Seconds to wait before duplicating a request of this type, None if not enough samples."""
+        latencies = self._latencies.get(key)
+        if latencies is None or len(latencies) < self.min_samples:
+            return None
+
+        ordered = sorted(latencies)
+        index = min(int(self.percentile * len(ordered)), len(ordered) - 1)
+        return max(ordered[index], self.min_delay)
+
+    def record_latency(self, key: str, latency: float):
+        self._latencies.setdefault(key, deque(maxlen=self.window_size)).append(latency)
+
+    async def run(
+        self,
+        key: str,
+        request: Callable[[], Awaitable[T]],
+        slot: Callable[[], AbstractAsyncContextManager[Any]] | None = None,
+    ) -> T:
+        """
+        Run request, issuing it a second time if it is slow and the hedge budget allows.
+
+        Each attempt first enters its own slot, e.g. a rate limit and concurrency slot. Latencies
+        and the hedge delay are measured from there, so time spent queueing locally neither
+        triggers hedges nor counts as provider latency.
+        """
+        self.requests += 1
+        started = asyncio.Event()
+        attempts = [asyncio.ensure_future(self._attempt(key, request, slot, started))]
+        waiting = asyncio.ensure_future(started.wait())
+        try:
+            # The hedge delay starts once the first attempt has left the local queues
+            await asyncio.wait([attempts[0], waiting], return_when=asyncio.FIRST_COMPLETED)
+
+            if not attempts[0].done():
+                done, _ = await asyncio.wait(attempts, timeout=self.get_hedge_delay(key))
+                if not done and self._spend_hedge():
+                    logger.debug(f'Hedging slow {key} request')
+                    attempts.append(asyncio.ensure_future(self._attempt(key, request, slot)))
+
+            pending = set(attempts)
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for attempt in done:
+                    if attempt.exception() is None:
+                        return attempt.result()
+
+                # Every attempt failed, raise the error of the last one
+                if not pending:
+                    return done.pop().result()
+        finally:
+            waiting.cancel()
+            for attempt in attempts:
+                attempt.cancel()
+
+    def _spend_hedge(self) -> bool:
+        if self.hedges + 1 > self.max_hedge_rate * self.requests:
+            return False
+
+        self.hedges += 1
+        return True
+
+    async def _attempt(
+        self,
+        key: str,
+        request: Callable[[], Awaitable[T]],
+        slot: Callable[[], AbstractAsyncContextManager[Any]] | None,
+        started: asyncio.Event | None = None,
+    ) -> T:
+        async with slot() if slot is not None else nullcontext():
+            if started is not None:
+                started.set()
+
+            # Cancelled losers are not recorded, as their cut-short durations would lower the
+            # hedge delay and cause more hedging
+            start = time.monotonic()
+            result = await request()
+            self.record_latency(key, time.monotonic() - start)
+            return result
+
+
+def hedged(
+    pool: ConcurrencyPool,
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """
+    Run a client method in a slot of its governor's pool, like governed, and under its hedging
+    policy, if the client has one. A duplicate call takes a slot of its own.
+    """
+
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(func)
+        async def wrapper(self: Any, *args: Any, **kwargs: Any) -> T:
+            def slot() -> AbstractAsyncContextManager[None]:
+                return acquire_slot(getattr(self, 'governor', None), pool)
+
+            hedging_policy: HedgingPolicy | None = getattr(self, 'hedging_policy', None)
+            if hedging_policy is None:
+                async with slot():
+                    return await func(self, *args, **kwargs)
+
+            return await hedging_policy.run(
+                f'{type(self).__name__}.{func.__name__}',
+                lambda: func(self, *args, **kwargs),
+                slot,
+            )
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,250 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import json
+import logging
+from abc import ABC, abstractmethod
+from copy import deepcopy
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+from graphiti_core.edges import EntityEdge
+from graphiti_core.nodes import EntityNode, EpisodicNode
+from graphiti_core.utils.datetime_utils import utc_now
+
+logger = logging.getLogger(__name__)
+
+LIST_SEGMENT = '[]'
+
+
+class JsonExtractionResult(BaseModel):
+    nodes: list[EntityNode] = Field(default_factory=list)
+    edges: list[EntityEdge] = Field(default_factory=list)
+    unmapped_content: str | None = Field(
+        default=None,
+        description='JSON of the fields that still need LLM extraction, None if there are none',
+    )
+
+
+class JsonEpisodeExtractor(ABC):
+    """Extracts nodes and edges from JSON episodes without calling the LLM."""
+
+    @abstractmethod
+    def extract(self, episode: EpisodicNode) -> JsonExtractionResult:
+        raise NotImplementedError()
+
+
+class JsonEntityMapping(BaseModel):
+    key: str = Field(description='name used to reference the entities in relation mappings')
+    path: str = Field(
+        description='dot separated path to the entity name, with [] to iterate over a list, '
+        'e.g. "customer.name" or "items[].product"'
+    )
+    entity_type: str = Field(default='Entity', description='label added to the entity nodes')
+
+
+class JsonRelationMapping(BaseModel):
+    source: str = Field(description='key of the source entity mapping')
+    target: str = Field(description='key of the target entity mapping')
+    relation_type: str = Field(description='FACT_PREDICATE_IN_SCREAMING_SNAKE_CASE')
+    fact_template: str | None = Field(
+        default=None,
+        description='fact text, formatted with {source} and {target} set to the entity names',
+    )
+
+
+class JsonSchemaMapping(BaseModel):
+    entities: list[JsonEntityMapping] = Field(default_factory=list)
+    relations: list[JsonRelationMapping] = Field(default_factory=list)
+    llm_fallback: bool = Field(
+        default=True, description='whether unmapped fields are sent to LLM extraction'
+    )
+
+
+class SchemaMappedJsonExtractor(JsonEpisodeExtractor):
+    """
+    Maps JSON paths of a known event schema directly to entities and relations.
+
+    Relations between entities under the same list are built per list element, so
+    "items[].product" and "items[].supplier" pair each product with its own supplier. Fields that
+    are not mapped are returned as unmapped_content for LLM extraction when llm_fallback is set.
+    """
+
+    def __init__(self, mapping: JsonSchemaMapping):
+        self.mapping = mapping
+        self._entity_mappings = {
+            entity_mapping.key: entity_mapping for entity_mapping in mapping.entities
+        }
+
+        for relation_mapping in mapping.relations:
+            for key in [relation_mapping.source, relation_mapping.target]:
+                if key not in self._entity_mappings:
+                    raise ValueError(f'Relation mapping references unknown entity key: {key}')
+
+    def extract(self, episode: EpisodicNode) -> JsonExtractionResult:
+        try:
+            data = json.loads(episode.content)
+        except json.JSONDecodeError as e:
+            logger.warning(f'Episode {episode.uuid} is not valid JSON, using LLM extraction: {e}')
+            return JsonExtractionResult(unmapped_content=episode.content)
+
+        nodes_by_key: dict[tuple[str, str], EntityNode] = {}
+
+        def get_node(entity_mapping: JsonEntityMapping, name: str) -> EntityNode:
+            node_key = (entity_mapping.entity_type, ' '.join(name.lower().split()))
+            node = nodes_by_key.get(node_key)
+            if node is None:
+                node = EntityNode(
+                    name=name,
+                    group_id=episode.group_id,
+                    labels=list({'Entity', entity_mapping.entity_type}),
+                    summary='',
+                    created_at=utc_now(),
+                )
+                nodes_by_key[node_key] = node
+            return node
+
+        for entity_mapping in self.mapping.entities:
+            for name in _entity_names(data, _parse_path(entity_mapping.path)):
+                get_node(entity_mapping, name)
+
+        edges: list[EntityEdge] = []
+        for relation_mapping in self.mapping.relations:
+            source_mapping = self._entity_mappings[relation_mapping.source]
+            target_mapping = self._entity_mappings[relation_mapping.target]
+            source_path = _parse_path(source_mapping.path)
+            target_path = _parse_path(target_mapping.path)
+
+            # Pair entities within the innermost list both paths go through
+            scope_length = _shared_scope_length(source_path, target_path)
+            for scope in _resolve_path(data, source_path[:scope_length]):
+                for source_name in _entity_names(scope, source_path[scope_length:]):
+                    for target_name in _entity_names(scope, target_path[scope_length:]):
+                        source_node = get_node(source_mapping, source_name)
+                        target_node = get_node(target_mapping, target_name)
+                        if source_node.uuid == target_node.uuid:
+                            continue
+
+                        fact = (
+                            relation_mapping.fact_template.format(
+                                source=source_node.name, target=target_node.name
+                            )
+                            if relation_mapping.fact_template is not None
+                            else f'{source_node.name} {relation_mapping.relation_type} '
+                            f'{target_node.name}'
+                        )
+                        edges.append(
+                            EntityEdge(
+                                source_node_uuid=source_node.uuid,
+                                target_node_uuid=target_node.uuid,
+                                name=relation_mapping.relation_type,
+                                group_id=episode.group_id,
+                                fact=fact,
+                                episodes=[episode.uuid],
+                                created_at=utc_now(),
+                                valid_at=episode.valid_at,
+                            )
+                        )
+
+        unmapped_content: str | None = None
+        if self.mapping.llm_fallback:
+            unmapped_data = deepcopy(data)
+            for entity_mapping in self.mapping.entities:
+                unmapped_data = _remove_path(unmapped_data, _parse_path(entity_mapping.path))
+            if not _is_empty(unmapped_data):
+                unmapped_content = json.dumps(unmapped_data)
+
+        logger.debug(
+            f'Mapped {len(nodes_by_key)} nodes and {len(edges)} edges from JSON episode '
+            f'{episode.uuid}, unmapped fields: {unmapped_content is not None}'
+        )
+
+        return JsonExtractionResult(
+            nodes=list(nodes_by_key.values()), edges=edges, unmapped_content=unmapped_content
+        )
+
+
+def _parse_path(path: str) -> list[str]:
+    segments: list[str] = []
+    for part in path.split('.'):
+        if part.endswith(LIST_SEGMENT):
+            if part[: -len(LIST_SEGMENT)]:
+                segments.append(part[: -len(LIST_SEGMENT)])
+            segments.append(LIST_SEGMENT)
+        elif part:
+            segments.append(part)
+    return segments
+
+
+def _resolve_path(data: Any, segments: list[str]) -> list[Any]:
+    values = [data]
+    for segment in segments:
+        next_values = []
+        for value in values:
+            if segment == LIST_SEGMENT:
+                if isinstance(value, list):
+                    next_values.extend(value)
+            elif isinstance(value, dict) and segment in value:
+                next_values.append(value[segment])
+        values = next_values
+    return values
+
+
+def _entity_names(data: Any, segments: list[str]) -> list[str]:
+    return [
+        str(value).strip()
+        for value in _resolve_path(data, segments)
+        if isinstance(value, str | int | float)
+        and not isinstance(value, bool)
+        and str(value).strip()
+    ]
+
+
+def _shared_scope_length(source_path: list[str], target_path: list[str]) -> int:
+    scope_length = 0
+    for i, (source_segment, target_segment) in enumerate(
+        zip(source_path, target_path, strict=False)
+    ):
+        if source_segment != target_segment:
+            break
+        if source_segment == LIST_SEGMENT:
+            scope_length = i + 1
+    return scope_length
+
+
+def _remove_path(data: Any, segments: list[str]) -> Any:
+    if len(segments) == 0:
+        return None
+
+    segment, rest = segments[0], segments[1:]
+    if segment == LIST_SEGMENT:
+        if not isinstance(data, list):
+            return data
+        remaining = [_remove_path(item, rest) for item in data]
+        return [item for item in remaining if not _is_empty(item)]
+
+    if not isinstance(data, dict) or segment not in data:
+        return data
+
+    value = _remove_path(data[segment], rest)
+    if _is_empty(value):
+        return {key: item for key, item in data.items() if key != segment}
+    return {**data, segment: value}
+
+
+def _is_empty(data: Any) -> bool:
+    return data is None or (isinstance(data, dict | list) and len(data) == 0)
@@ -14,9 +14,12 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import asyncio
 import logging
+from collections.abc import AsyncIterator
 from datetime import datetime
 from time import time
+from typing import Any
 
 from pydantic import BaseModel
 from typing_extensions import LiteralString
@@ -29,19 +32,29 @@ from graphiti_core.edges import (
     create_entity_edge_embeddings,
 )
 from graphiti_core.graphiti_types import GraphitiClients
-from graphiti_core.helpers import MAX_REFLEXION_ITERATIONS, semaphore_gather
+from graphiti_core.helpers import (
+    EDGE_RESOLUTION_BATCH_SIZE,
+    MAX_REFLEXION_ITERATIONS,
+    STREAMED_EDGE_RESOLUTION_BATCH_SIZE,
+    semaphore_gather,
+)
 from graphiti_core.llm_client import LLMClient
 from graphiti_core.llm_client.config import ModelSize
+from graphiti_core.llm_client.streaming import stream_list_items
 from graphiti_core.nodes import CommunityNode, EntityNode, EpisodicNode
 from graphiti_core.prompts import prompt_library
-from graphiti_core.prompts.dedupe_edges import EdgeDuplicate
+from graphiti_core.prompts.dedupe_edges import EdgeDuplicate, EdgeDuplicates
+from graphiti_core.prompts.extract_edges import Edge as ExtractedEdge
 from graphiti_core.prompts.extract_edges import ExtractedEdges, MissingFacts
 from graphiti_core.search.search_filters import SearchFilters
 from graphiti_core.search.search_utils import get_edge_invalidation_candidates, get_relevant_edges
 from graphiti_core.utils.datetime_utils import ensure_utc, utc_now
+from graphiti_core.utils.text_utils import build_previous_episodes_context
 
 logger = logging.getLogger(__name__)
 
+EXTRACT_EDGES_MAX_TOKENS = 16384
+
 
 def build_episodic_edges(
     entity_nodes: list[EntityNode],
@@ -118,40 +131,12 @@ async def extract_edges(
 ) -> list[EntityEdge]:
     start = time()
 
-    extract_edges_max_tokens = 16384
     llm_client = clients.llm_client
 
-    edge_type_signature_map: dict[str, tuple[str, str]] = {
-        edge_type: signature
-        for signature, edge_types in edge_type_map.items()
-        for edge_type in edge_types
-    }
-
-    edge_types_context = (
-        [
-            {
-                'fact_type_name': type_name,
-                'fact_type_signature': edge_type_signature_map.get(type_name, ('Entity', 'Entity')),
-                'fact_type_description': type_model.__doc__,
-            }
-            for type_name, type_model in edge_types.items()
-        ]
-        if edge_types is not None
-        else []
-    )
-
     # Prepare context for LLM
-    context = {
-        'episode_content': episode.content,
-        'nodes': [
-            {'id': idx, 'name': node.name, 'entity_types': node.labels}
-            for idx, node in enumerate(nodes)
-        ],
-        'previous_episodes': [ep.content for ep in previous_episodes],
-        'reference_time': episode.valid_at,
-        'edge_types': edge_types_context,
-        'custom_prompt': '',
-    }
+    context = _build_extract_edges_context(
+        episode, nodes, previous_episodes, edge_type_map, edge_types
+    )
 
     facts_missed = True
     reflexion_iterations = 0
@@ -159,7 +144,7 @@ async def extract_edges(
         llm_response = await llm_client.generate_response(
             prompt_library.extract_edges.edge(context),
             response_model=ExtractedEdges,
-            max_tokens=extract_edges_max_tokens,
+            max_tokens=EXTRACT_EDGES_MAX_TOKENS,
         )
         edges_data = ExtractedEdges(**llm_response).edges
 
@@ -170,7 +155,7 @@ async def extract_edges(
             reflexion_response = await llm_client.generate_response(
                 prompt_library.extract_edges.reflexion(context),
                 response_model=MissingFacts,
-                max_tokens=extract_edges_max_tokens,
+                max_tokens=EXTRACT_EDGES_MAX_TOKENS,
             )
 
             missing_facts = reflexion_response.get('missing_facts', [])
@@ -189,7 +174,168 @@ async def extract_edges(
     if len(edges_data) == 0:
         return []
 
-    # Convert the extracted data into EntityEdge objects
+    return build_extracted_edges(edges_data, nodes, episode, group_id)
+
+
+async def extract_edges_stream(
+    clients: GraphitiClients,
+    episode: EpisodicNode,
+    nodes: list[EntityNode],
+    previous_episodes: list[EpisodicNode],
+    edge_type_map: dict[tuple[str, str], list[str]],
+    group_id: str = '',
+    edge_types: dict[str, BaseModel] | None = None,
+) -> AsyncIterator[EntityEdge]:
+    """Yield extracted edges one by one, as soon as the LLM has generated each of them."""
+    if MAX_REFLEXION_ITERATIONS > 0:
+        # Reflexion re-extracts the whole list of edges, so edges are only final at the end
+        for edge in await extract_edges(
+            clients, episode, nodes, previous_episodes, edge_type_map, group_id, edge_types
+        ):
+            yield edge
+        return
+
+    context = _build_extract_edges_context(
+        episode, nodes, previous_episodes, edge_type_map, edge_types
+    )
+    chunks = clients.llm_client.generate_response_stream(
+        prompt_library.extract_edges.edge(context),
+        response_model=ExtractedEdges,
+        max_tokens=EXTRACT_EDGES_MAX_TOKENS,
+    )
+    async for edge_data in stream_list_items(chunks, 'edges', ExtractedEdge):
+        for edge in build_extracted_edges([edge_data], nodes, episode, group_id):
+            yield edge
+
+
+async def extract_and_resolve_edges_streaming(
+    clients: GraphitiClients,
+    episode: EpisodicNode,
+    extracted_nodes: list[EntityNode],
+    previous_episodes: list[EpisodicNode],
+    node_resolution: asyncio.Future[
+        tuple[list[EntityNode], dict[str, str], list[tuple[EntityNode, EntityNode]]]
+    ],
+    edge_type_map: dict[tuple[str, str], list[str]],
+    group_id: str = '',
+    edge_types: dict[str, BaseModel] | None = None,
+    batch_size: int | None = None,
+) -> tuple[list[EntityEdge], list[EntityEdge]]:
+    """
+    Extract edges from a streamed response and resolve them while later edges are generated.
+
+    Edges point at the extracted nodes, so they are held back until node_resolution has mapped
+    those to the resolved nodes. From then on, every batch_size edges are resolved as soon as they
+    have been generated, with one embedding call and one set of database queries per batch. Their
+    duplicate checks are batched by EDGE_RESOLUTION_BATCH_SIZE, as for edges that are not streamed.
+    """
+    batch_size = max(
+        batch_size if batch_size is not None else STREAMED_EDGE_RESOLUTION_BATCH_SIZE, 1
+    )
+    pending_edges: list[EntityEdge] = []
+    resolutions: list[asyncio.Task[tuple[list[EntityEdge], list[EntityEdge]]]] = []
+
+    def resolve_pending_edges():
+        nodes, uuid_map, _ = node_resolution.result()
+        for edge in pending_edges:
+            edge.source_node_uuid = uuid_map.get(edge.source_node_uuid, edge.source_node_uuid)
+            edge.target_node_uuid = uuid_map.get(edge.target_node_uuid, edge.target_node_uuid)
+
+        resolutions.append(
+            asyncio.create_task(
+                resolve_extracted_edges(
+                    clients,
+                    list(pending_edges),
+                    episode,
+                    nodes,
+                    edge_types or {},
+                    edge_type_map,
+                )
+            )
+        )
+        pending_edges.clear()
+
+    try:
+        async for edge in extract_edges_stream(
+            clients,
+            episode,
+            extracted_nodes,
+            previous_episodes,
+            edge_type_map,
+            group_id,
+            edge_types,
+        ):
+            pending_edges.append(edge)
+            if node_resolution.done() and len(pending_edges) >= batch_size:
+                resolve_pending_edges()
+
+        await node_resolution
+        if len(pending_edges) > 0:
+            resolve_pending_edges()
+
+        results = await asyncio.gather(*resolutions)
+    except BaseException:
+        for resolution in resolutions:
+            resolution.cancel()
+        raise
+
+    resolved_edges = [edge for resolved, _ in results for edge in resolved]
+    invalidated_edges = [edge for _, invalidated in results for edge in invalidated]
+
+    return resolved_edges, invalidated_edges
+
+
+def _build_extract_edges_context(
+    episode: EpisodicNode,
+    nodes: list[EntityNode],
+    previous_episodes: list[EpisodicNode],
+    edge_type_map: dict[tuple[str, str], list[str]],
+    edge_types: dict[str, BaseModel] | None,
+) -> dict[str, Any]:
+    return {
+        'episode_content': episode.content,
+        'nodes': [
+            {'id': idx, 'name': node.name, 'entity_types': node.labels}
+            for idx, node in enumerate(nodes)
+        ],
+        'previous_episodes': build_previous_episodes_context(previous_episodes),
+        'reference_time': episode.valid_at,
+        'edge_types': build_edge_types_context(edge_type_map, edge_types),
+        'custom_prompt': '',
+    }
+
+
+def build_edge_types_context(
+    edge_type_map: dict[tuple[str, str], list[str]],
+    edge_types: dict[str, BaseModel] | None,
+) -> list[dict[str, Any]]:
+    edge_type_signature_map: dict[str, tuple[str, str]] = {
+        edge_type: signature
+        for signature, edge_types in edge_type_map.items()
+        for edge_type in edge_types
+    }
+
+    return (
+        [
+            {
+                'fact_type_name': type_name,
+                'fact_type_signature': edge_type_signature_map.get(type_name, ('Entity', 'Entity')),
+                'fact_type_description': type_model.__doc__,
+            }
+            for type_name, type_model in edge_types.items()
+        ]
+        if edge_types is not None
+        else []
+    )
+
+
+def build_extracted_edges(
+    edges_data: list[ExtractedEdge],
+    nodes: list[EntityNode],
+    episode: EpisodicNode,
+    group_id: str,
+) -> list[EntityEdge]:
+    """Convert extracted edge data, whose entity ids index into nodes, into EntityEdge objects."""
     edges = []
     for edge_data in edges_data:
         # Validate Edge Date information
@@ -251,10 +397,12 @@ async def resolve_extracted_edges(
     entities: list[EntityNode],
     edge_types: dict[str, BaseModel],
     edge_type_map: dict[tuple[str, str], list[str]],
+    batch_size: int | None = None,
 ) -> tuple[list[EntityEdge], list[EntityEdge]]:
     driver = clients.driver
     llm_client = clients.llm_client
     embedder = clients.embedder
+    batch_size = batch_size if batch_size is not None else EDGE_RESOLUTION_BATCH_SIZE
     await create_entity_edge_embeddings(embedder, extracted_edges)
 
     search_results = await semaphore_gather(
@@ -301,27 +449,59 @@ async def resolve_extracted_edges(
         edge_types_lst.append(extracted_edge_types)
 
     # resolve edges with related edges in the graph and find invalidation candidates
-    results: list[tuple[EntityEdge, list[EntityEdge], list[EntityEdge]]] = list(
-        await semaphore_gather(
+    results: list[tuple[EntityEdge, list[EntityEdge], list[EntityEdge]]]
+    if batch_size <= 1:
+        results = list(
+            await semaphore_gather(
+                *[
+                    resolve_extracted_edge(
+                        llm_client,
+                        extracted_edge,
+                        related_edges,
+                        existing_edges,
+                        episode,
+                        extracted_edge_types,
+                    )
+                    for extracted_edge, related_edges, existing_edges, extracted_edge_types in zip(
+                        extracted_edges,
+                        related_edges_lists,
+                        edge_invalidation_candidates,
+                        edge_types_lst,
+                        strict=True,
+                    )
+                ]
+            )
+        )
+    else:
+        # Edges without candidates resolve to themselves and never need the LLM
+        results = [(extracted_edge, [], []) for extracted_edge in extracted_edges]
+        candidate_indices = [
+            i
+            for i in range(len(extracted_edges))
+            if len(related_edges_lists[i]) > 0 or len(edge_invalidation_candidates[i]) > 0
+        ]
+        index_batches = [
+            candidate_indices[i : i + batch_size]
+            for i in range(0, len(candidate_indices), batch_size)
+        ]
+
+        batch_results = await semaphore_gather(
             *[
-                resolve_extracted_edge(
+                resolve_extracted_edges_batch(
                     llm_client,
-                    extracted_edge,
-                    related_edges,
-                    existing_edges,
+                    [extracted_edges[i] for i in index_batch],
+                    [related_edges_lists[i] for i in index_batch],
+                    [edge_invalidation_candidates[i] for i in index_batch],
                     episode,
-                    extracted_edge_types,
-                )
-                for extracted_edge, related_edges, existing_edges, extracted_edge_types in zip(
-                    extracted_edges,
-                    related_edges_lists,
-                    edge_invalidation_candidates,
-                    edge_types_lst,
-                    strict=True,
+                    [edge_types_lst[i] for i in index_batch],
                 )
+                for index_batch in index_batches
             ]
         )
-    )
+
+        for index_batch, batch_result in zip(index_batches, batch_results, strict=True):
+            for i, result in zip(index_batch, batch_result, strict=True):
+                results[i] = result
 
     resolved_edges: list[EntityEdge] = []
     invalidated_edges: list[EntityEdge] = []
@@ -423,8 +603,142 @@ async def resolve_extracted_edge(
         model_size=ModelSize.small,
     )
     response_object = EdgeDuplicate(**llm_response)
-    duplicate_facts = response_object.duplicate_facts
 
+    resolution = await apply_edge_duplicate_resolution(
+        llm_client,
+        response_object,
+        extracted_edge,
+        related_edges,
+        existing_edges,
+        episode,
+        edge_types,
+    )
+
+    end = time()
+    logger.debug(
+        f'Resolved Edge: {extracted_edge.name} is {resolution[0].name}, in {(end - start) * 1000} ms'
+    )
+
+    return resolution
+
+
+async def resolve_extracted_edges_batch(
+    llm_client: LLMClient,
+    extracted_edges: list[EntityEdge],
+    related_edges_lists: list[list[EntityEdge]],
+    existing_edges_lists: list[list[EntityEdge]],
+    episode: EpisodicNode,
+    edge_types_lst: list[dict[str, BaseModel]],
+) -> list[tuple[EntityEdge, list[EntityEdge], list[EntityEdge]]]:
+    """
+    Resolve several extracted edges against their candidates with a single LLM call.
+
+    Edges the LLM does not return a resolution for are resolved individually.
+    """
+    if len(extracted_edges) == 1:
+        return [
+            await resolve_extracted_edge(
+                llm_client,
+                extracted_edges[0],
+                related_edges_lists[0],
+                existing_edges_lists[0],
+                episode,
+                edge_types_lst[0],
+            )
+        ]
+
+    start = time()
+
+    new_edges_context = [
+        {
+            'id': i,
+            'fact': extracted_edge.fact,
+            'existing_facts': [
+                {'idx': j, 'fact': edge.fact} for j, edge in enumerate(related_edges)
+            ],
+            'fact_invalidation_candidates': [
+                {'idx': j, 'fact': edge.fact} for j, edge in enumerate(existing_edges)
+            ],
+            'fact_types': [
+                {
+                    'fact_type_id': j,
+                    'fact_type_name': type_name,
+                    'fact_type_description': type_model.__doc__,
+                }
+                for j, (type_name, type_model) in enumerate(edge_types.items())
+            ],
+        }
+        for i, (extracted_edge, related_edges, existing_edges, edge_types) in enumerate(
+            zip(
+                extracted_edges,
+                related_edges_lists,
+                existing_edges_lists,
+                edge_types_lst,
+                strict=True,
+            )
+        )
+    ]
+
+    llm_response = await llm_client.generate_response(
+        prompt_library.dedupe_edges.resolve_edges({'new_edges': new_edges_context}),
+        response_model=EdgeDuplicates,
+        model_size=ModelSize.small,
+    )
+    edge_duplicates = EdgeDuplicates(**llm_response).edge_duplicates
+
+    responses: dict[int, EdgeDuplicate] = {}
+    for edge_duplicate in edge_duplicates:
+        if 0 <= edge_duplicate.id < len(extracted_edges) and edge_duplicate.id not in responses:
+            responses[edge_duplicate.id] = edge_duplicate
+
+    results: list[tuple[EntityEdge, list[EntityEdge], list[EntityEdge]]] = list(
+        await semaphore_gather(
+            *[
+                apply_edge_duplicate_resolution(
+                    llm_client,
+                    responses[i],
+                    extracted_edges[i],
+                    related_edges_lists[i],
+                    existing_edges_lists[i],
+                    episode,
+                    edge_types_lst[i],
+                )
+                if i in responses
+                else resolve_extracted_edge(
+                    llm_client,
+                    extracted_edges[i],
+                    related_edges_lists[i],
+                    existing_edges_lists[i],
+                    episode,
+                    edge_types_lst[i],
+                )
+                for i in range(len(extracted_edges))
+            ]
+        )
+    )
+
+    if len(responses) < len(extracted_edges):
+        logger.debug(
+            f'Batched edge resolution missed {len(extracted_edges) - len(responses)} edges, '
+            f'resolved them individually'
+        )
+
+    end = time()
+    logger.debug(f'Resolved {len(extracted_edges)} edges in batch in {(end - start) * 1000} ms')
+
+    return results
+
+
+async def apply_edge_duplicate_resolution(
+    llm_client: LLMClient,
+    response_object: EdgeDuplicate,
+    extracted_edge: EntityEdge,
+    related_edges: list[EntityEdge],
+    existing_edges: list[EntityEdge],
+    episode: EpisodicNode,
+    edge_types: dict[str, BaseModel] | None = None,
+) -> tuple[EntityEdge, list[EntityEdge], list[EntityEdge]]:
+    duplicate_facts = response_object.duplicate_facts
     duplicate_fact_ids: list[int] = [i for i in duplicate_facts if 0 <= i < len(related_edges)]
 
     resolved_edge = extracted_edge
@@ -461,11 +775,6 @@ async def resolve_extracted_edge(
 
             resolved_edge.attributes = edge_attributes_response
 
-    end = time()
-    logger.debug(
-        f'Resolved Edge: {extracted_edge.name} is {resolved_edge.name}, in {(end - start) * 1000} ms'
-    )
-
     now = utc_now()
 
     if resolved_edge.invalid_at and not resolved_edge.expired_at:
@@ -19,9 +19,9 @@ from datetime import datetime
 
 from typing_extensions import LiteralString
 
-from graphiti_core.driver.driver import GraphDriver
+from graphiti_core.driver.driver import GraphDriver, GraphProvider
 from graphiti_core.graph_queries import get_fulltext_indices, get_range_indices
-from graphiti_core.helpers import semaphore_gather
+from graphiti_core.helpers import DEFAULT_DELETE_BATCH_SIZE, delete_in_batches, semaphore_gather
 from graphiti_core.models.nodes.node_db_queries import EPISODIC_NODE_RETURN
 from graphiti_core.nodes import EpisodeType, EpisodicNode, get_episodic_node_from_record
 
@@ -63,22 +63,32 @@ async def build_indices_and_constraints(driver: GraphDriver, delete_existing: bo
     )
 
 
-async def clear_data(driver: GraphDriver, group_ids: list[str] | None = None):
-    async with driver.session() as session:
-
-        async def delete_all(tx):
-            await tx.run('MATCH (n) DETACH DELETE n')
-
-        async def delete_group_ids(tx):
-            await tx.run(
-                'MATCH (n:Entity|Episodic|Community) WHERE n.group_id IN $group_ids DETACH DELETE n',
+async def clear_data(
+    driver: GraphDriver,
+    group_ids: list[str] | None = None,
+    batch_size: int = DEFAULT_DELETE_BATCH_SIZE,
+):
+    if group_ids is None:
+        await delete_in_batches(driver, 'MATCH (n)', 'n', 'DETACH DELETE n', batch_size)
+    elif driver.provider == GraphProvider.FALKORDB:
+        for label in ['Entity', 'Episodic', 'Community']:
+            await delete_in_batches(
+                driver,
+                f'MATCH (n:{label}) WHERE n.group_id IN $group_ids',
+                'n',
+                'DETACH DELETE n',
+                batch_size,
                 group_ids=group_ids,
             )
-
-        if group_ids is None:
-            await session.execute_write(delete_all)
-        else:
-            await session.execute_write(delete_group_ids)
+    else:
+        await delete_in_batches(
+            driver,
+            'MATCH (n:Entity|Episodic|Community) WHERE n.group_id IN $group_ids',
+            'n',
+            'DETACH DELETE n',
+            batch_size,
+            group_ids=group_ids,
+        )
 
 
 async def retrieve_episodes(
@@ -133,3 +143,80 @@ async def retrieve_episodes(
 
     episodes = [get_episodic_node_from_record(record) for record in result]
     return list(reversed(episodes))  # Return in chronological order
+
+
+async def retrieve_episode_windows(
+    driver: GraphDriver,
+    episodes: list[EpisodicNode],
+    last_n: int = EPISODE_WINDOW_LEN,
+) -> list[list[EpisodicNode]]:
+    """
+    Retrieve the last n episodes of each episode's group relative to each episode's valid_at,
+    in a single query on Neo4j. FalkorDB gets one retrieve_episodes query per episode, as the
+    single query relies on correlated CALL subqueries.
+
+    Args:
+        driver (Driver): The graph driver instance.
+        episodes (list[EpisodicNode]): The episodes whose windows should be retrieved.
+        last_n (int, optional): The number of most recent episodes to retrieve per episode.
+
+    Returns:
+        list[list[EpisodicNode]]: For each input episode, the same episodes retrieve_episodes would
+                                  return for its valid_at and group_id, in chronological order.
+    """
+    if len(episodes) == 0:
+        return []
+
+    if driver.provider != GraphProvider.NEO4J:
+        return await semaphore_gather(
+            *[
+                retrieve_episodes(driver, episode.valid_at, last_n, [episode.group_id])
+                for episode in episodes
+            ]
+        )
+
+    query: LiteralString = """
+        UNWIND $episodes AS episode
+        CALL {
+            WITH episode
+            MATCH (e:Episodic {group_id: episode.group_id})
+            WHERE e.valid_at <= episode.valid_at
+            RETURN e
+            ORDER BY e.valid_at DESC
+            LIMIT $num_episodes
+        }
+        WITH episode, collect(e) AS previous_episodes
+        RETURN
+            episode.uuid AS episode_uuid,
+            [e IN previous_episodes | {
+                content: e.content,
+                created_at: e.created_at,
+                valid_at: e.valid_at,
+                uuid: e.uuid,
+                name: e.name,
+                group_id: e.group_id,
+                source_description: e.source_description,
+                source: e.source,
+                entity_edges: e.entity_edges
+            }] AS previous_episodes
+        """
+    result, _, _ = await driver.execute_query(
+        query,
+        episodes=[
+            {'uuid': episode.uuid, 'group_id': episode.group_id, 'valid_at': episode.valid_at}
+            for episode in episodes
+        ],
+        num_episodes=last_n,
+        routing_='r',
+    )
+
+    windows: dict[str, list[EpisodicNode]] = {
+        record['episode_uuid']: list(
+            reversed(
+                [get_episodic_node_from_record(episode) for episode in record['previous_episodes']]
+            )
+        )
+        for record in result
+    }
+
+    return [windows.get(episode.uuid, []) for episode in episodes]
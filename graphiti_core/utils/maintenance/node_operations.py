@@ -16,34 +16,56 @@ limitations under the License.
 
 import logging
 from contextlib import suppress
+from functools import lru_cache
 from time import time
 from typing import Any
-from uuid import uuid4
 
+import numpy as np
 import pydantic
 from pydantic import BaseModel, Field
 
+from graphiti_core.edges import EntityEdge
+from graphiti_core.errors import EntityTypeValidationError
 from graphiti_core.graphiti_types import GraphitiClients
-from graphiti_core.helpers import MAX_REFLEXION_ITERATIONS, semaphore_gather
+from graphiti_core.helpers import (
+    ATTRIBUTE_EXTRACTION_BATCH_SIZE,
+    MAX_REFLEXION_ITERATIONS,
+    NODE_DEDUPE_SIMILARITY_THRESHOLD,
+    normalize_l2,
+    semaphore_gather,
+)
 from graphiti_core.llm_client import LLMClient
 from graphiti_core.llm_client.config import ModelSize
 from graphiti_core.nodes import EntityNode, EpisodeType, EpisodicNode, create_entity_node_embeddings
 from graphiti_core.prompts import prompt_library
 from graphiti_core.prompts.dedupe_nodes import NodeDuplicate, NodeResolutions
+from graphiti_core.prompts.extract_edges import ExtractedGraph
 from graphiti_core.prompts.extract_nodes import (
     ExtractedEntities,
     ExtractedEntity,
     MissedEntities,
 )
-from graphiti_core.search.search import search
-from graphiti_core.search.search_config import SearchResults
-from graphiti_core.search.search_config_recipes import NODE_HYBRID_SEARCH_RRF
 from graphiti_core.search.search_filters import SearchFilters
+from graphiti_core.search.search_utils import get_relevant_nodes
 from graphiti_core.utils.datetime_utils import utc_now
-from graphiti_core.utils.maintenance.edge_operations import filter_existing_duplicate_of_edges
+from graphiti_core.utils.json_extraction import JsonEpisodeExtractor
+from graphiti_core.utils.maintenance.edge_operations import (
+    build_edge_types_context,
+    build_extracted_edges,
+    extract_edges,
+    filter_existing_duplicate_of_edges,
+)
+from graphiti_core.utils.text_utils import build_previous_episodes_context
 
 logger = logging.getLogger(__name__)
 
+ATTRIBUTE_MODEL_CACHE_SIZE = 256
+# Field the batched attribute extraction response uses to match attributes to their entity
+BATCH_ENTITY_ID_FIELD = 'entity_id'
+
+# Name, annotation and description of each field of an entity type
+EntityTypeFields = tuple[tuple[str, Any, str | None], ...]
+
 
 async def extract_nodes_reflexion(
     llm_client: LLMClient,
@@ -54,7 +76,7 @@ async def extract_nodes_reflexion(
     # Prepare context for LLM
     context = {
         'episode_content': episode.content,
-        'previous_episodes': [ep.content for ep in previous_episodes],
+        'previous_episodes': build_previous_episodes_context(previous_episodes),
         'extracted_entities': node_names,
     }
 
@@ -80,31 +102,12 @@ async def extract_nodes(
     entities_missed = True
     reflexion_iterations = 0
 
-    entity_types_context = [
-        {
-            'entity_type_id': 0,
-            'entity_type_name': 'Entity',
-            'entity_type_description': 'Default entity classification. Use this entity type if the entity is not one of the other listed types.',
-        }
-    ]
-
-    entity_types_context += (
-        [
-            {
-                'entity_type_id': i + 1,
-                'entity_type_name': type_name,
-                'entity_type_description': type_model.__doc__,
-            }
-            for i, (type_name, type_model) in enumerate(entity_types.items())
-        ]
-        if entity_types is not None
-        else []
-    )
+    entity_types_context = _build_entity_types_context(entity_types)
 
     context = {
         'episode_content': episode.content,
         'episode_timestamp': episode.valid_at.isoformat(),
-        'previous_episodes': [ep.content for ep in previous_episodes],
+        'previous_episodes': build_previous_episodes_context(previous_episodes),
         'custom_prompt': custom_prompt,
         'entity_types': entity_types_context,
         'source_description': episode.source_description,
@@ -148,15 +151,297 @@ async def extract_nodes(
     end = time()
     logger.debug(f'Extracted new nodes: {filtered_extracted_entities} in {(end - start) * 1000} ms')
     # Convert the extracted data into EntityNode objects
-    extracted_nodes = []
-    for extracted_entity in filtered_extracted_entities:
-        entity_type_name = entity_types_context[extracted_entity.entity_type_id].get(
-            'entity_type_name'
+    extracted_nodes = [
+        node
+        for node in _build_extracted_nodes(
+            filtered_extracted_entities, entity_types_context, episode, excluded_entity_types
+        )
+        if node is not None
+    ]
+
+    logger.debug(f'Extracted nodes: {[(n.name, n.uuid) for n in extracted_nodes]}')
+    return extracted_nodes
+
+
+async def extract_nodes_and_edges(
+    clients: GraphitiClients,
+    episode: EpisodicNode,
+    previous_episodes: list[EpisodicNode],
+    edge_type_map: dict[tuple[str, str], list[str]],
+    entity_types: dict[str, BaseModel] | None = None,
+    excluded_entity_types: list[str] | None = None,
+    edge_types: dict[str, BaseModel] | None = None,
+) -> tuple[list[EntityNode], list[EntityEdge]]:
+    """
+    Extract entities and the facts between them with a single LLM call.
+
+    Saves the round trip between extract_nodes and extract_edges, at the cost of the reflexion
+    passes those functions run when MAX_REFLEXION_ITERATIONS is set. The returned edges point at
+    the returned nodes, so they can go through resolve_extracted_nodes and resolve_edge_pointers
+    like the output of the separate extraction functions.
+    """
+    start = time()
+    entity_types_context = _build_entity_types_context(entity_types)
+
+    context = {
+        'episode_content': episode.content,
+        'previous_episodes': build_previous_episodes_context(previous_episodes),
+        'reference_time': episode.valid_at,
+        'source_description': episode.source_description,
+        'entity_types': entity_types_context,
+        'edge_types': build_edge_types_context(edge_type_map, edge_types),
+        'custom_prompt': '',
+    }
+
+    llm_response = await clients.llm_client.generate_response(
+        prompt_library.extract_edges.extract_nodes_and_edges(context),
+        response_model=ExtractedGraph,
+        max_tokens=16384,
+    )
+    response_object = ExtractedGraph(**llm_response)
+
+    # Entities that are dropped leave a None so edge ids still line up with entity positions
+    nodes_by_entity_idx = _build_extracted_nodes(
+        response_object.extracted_entities, entity_types_context, episode, excluded_entity_types
+    )
+    extracted_nodes = [node for node in nodes_by_entity_idx if node is not None]
+    node_positions = {node.uuid: i for i, node in enumerate(extracted_nodes)}
+
+    edges_data = []
+    for edge_data in response_object.edges:
+        source_idx = edge_data.source_entity_id
+        target_idx = edge_data.target_entity_id
+        if not (
+            -1 < source_idx < len(nodes_by_entity_idx)
+            and -1 < target_idx < len(nodes_by_entity_idx)
+        ):
+            logger.warning(
+                f'WARNING: source or target entity not found for {edge_data.relation_type}. '
+                f'source_entity_id: {source_idx} and target_entity_id: {target_idx}'
+            )
+            continue
+
+        source_node = nodes_by_entity_idx[source_idx]
+        target_node = nodes_by_entity_idx[target_idx]
+        if source_node is None or target_node is None:
+            continue
+
+        edges_data.append(
+            edge_data.model_copy(
+                update={
+                    'source_entity_id': node_positions[source_node.uuid],
+                    'target_entity_id': node_positions[target_node.uuid],
+                }
+            )
+        )
+
+    extracted_edges = build_extracted_edges(edges_data, extracted_nodes, episode, episode.group_id)
+
+    end = time()
+    logger.debug(
+        f'Extracted {len(extracted_nodes)} nodes and {len(extracted_edges)} edges in a single call '
+        f'in {(end - start) * 1000} ms'
+    )
+
+    return extracted_nodes, extracted_edges
+
+
+async def extract_nodes_and_edges_from_chunks(
+    clients: GraphitiClients,
+    episode: EpisodicNode,
+    chunks: list[str],
+    previous_episodes: list[EpisodicNode],
+    edge_type_map: dict[tuple[str, str], list[str]],
+    entity_types: dict[str, BaseModel] | None = None,
+    excluded_entity_types: list[str] | None = None,
+    edge_types: dict[str, BaseModel] | None = None,
+    combined_extraction: bool = False,
+    max_coroutines: int | None = None,
+) -> tuple[list[EntityNode], list[EntityEdge]]:
+    """
+    Extract nodes and edges from each chunk of a long episode concurrently and merge the results.
+
+    Results are combined with merge_extracted_nodes_and_edges, so entities found in several chunks
+    become one node and facts repeated in overlapping chunks are kept once.
+    """
+    start = time()
+
+    async def extract_chunk(chunk: str) -> tuple[list[EntityNode], list[EntityEdge]]:
+        chunk_episode = episode.model_copy(update={'content': chunk})
+        if combined_extraction:
+            return await extract_nodes_and_edges(
+                clients,
+                chunk_episode,
+                previous_episodes,
+                edge_type_map,
+                entity_types,
+                excluded_entity_types,
+                edge_types,
+            )
+
+        chunk_nodes = await extract_nodes(
+            clients, chunk_episode, previous_episodes, entity_types, excluded_entity_types
+        )
+        chunk_edges = await extract_edges(
+            clients,
+            chunk_episode,
+            chunk_nodes,
+            previous_episodes,
+            edge_type_map,
+            episode.group_id,
+            edge_types,
+        )
+        return chunk_nodes, chunk_edges
+
+    chunk_results: list[tuple[list[EntityNode], list[EntityEdge]]] = await semaphore_gather(
+        *[extract_chunk(chunk) for chunk in chunks], max_coroutines=max_coroutines
+    )
+
+    nodes, edges = merge_extracted_nodes_and_edges(chunk_results)
+
+    end = time()
+    logger.debug(
+        f'Extracted {len(nodes)} nodes and {len(edges)} edges from {len(chunks)} chunks '
+        f'in {(end - start) * 1000} ms'
+    )
+
+    return nodes, edges
+
+
+async def extract_nodes_and_edges_from_json(
+    clients: GraphitiClients,
+    episode: EpisodicNode,
+    json_extractor: JsonEpisodeExtractor,
+    previous_episodes: list[EpisodicNode],
+    edge_type_map: dict[tuple[str, str], list[str]],
+    entity_types: dict[str, BaseModel] | None = None,
+    excluded_entity_types: list[str] | None = None,
+    edge_types: dict[str, BaseModel] | None = None,
+    combined_extraction: bool = False,
+) -> tuple[list[EntityNode], list[EntityEdge]]:
+    """
+    Extract a JSON episode with json_extractor, using the LLM only for the fields it leaves unmapped.
+    """
+    extraction = json_extractor.extract(episode)
+    extraction_results = [(extraction.nodes, extraction.edges)]
+
+    if extraction.unmapped_content is not None:
+        unmapped_episode = episode.model_copy(update={'content': extraction.unmapped_content})
+        if combined_extraction:
+            extraction_results.append(
+                await extract_nodes_and_edges(
+                    clients,
+                    unmapped_episode,
+                    previous_episodes,
+                    edge_type_map,
+                    entity_types,
+                    excluded_entity_types,
+                    edge_types,
+                )
+            )
+        else:
+            unmapped_nodes = await extract_nodes(
+                clients, unmapped_episode, previous_episodes, entity_types, excluded_entity_types
+            )
+            unmapped_edges = await extract_edges(
+                clients,
+                unmapped_episode,
+                unmapped_nodes,
+                previous_episodes,
+                edge_type_map,
+                episode.group_id,
+                edge_types,
+            )
+            extraction_results.append((unmapped_nodes, unmapped_edges))
+
+    return merge_extracted_nodes_and_edges(extraction_results)
+
+
+def merge_extracted_nodes_and_edges(
+    extraction_results: list[tuple[list[EntityNode], list[EntityEdge]]],
+) -> tuple[list[EntityNode], list[EntityEdge]]:
+    """
+    Merge several extractions from the same episode before resolution.
+
+    Entities are merged by normalized name, keeping the first one, and edges are repointed at the
+    merged nodes. Facts repeated across extractions are kept once.
+    """
+    nodes_by_name: dict[str, EntityNode] = {}
+    uuid_map: dict[str, str] = {}
+    for extracted_nodes, _ in extraction_results:
+        for node in extracted_nodes:
+            merged_node = nodes_by_name.setdefault(_normalize_name(node.name), node)
+            uuid_map[node.uuid] = merged_node.uuid
+
+    edges_by_key: dict[tuple[str, str, str, str], EntityEdge] = {}
+    for _, extracted_edges in extraction_results:
+        for edge in extracted_edges:
+            edge.source_node_uuid = uuid_map.get(edge.source_node_uuid, edge.source_node_uuid)
+            edge.target_node_uuid = uuid_map.get(edge.target_node_uuid, edge.target_node_uuid)
+            key = (
+                edge.source_node_uuid,
+                edge.target_node_uuid,
+                edge.name,
+                _normalize_name(edge.fact),
+            )
+            edges_by_key.setdefault(key, edge)
+
+    nodes = list(nodes_by_name.values())
+    edges = list(edges_by_key.values())
+
+    return nodes, edges
+
+
+def _build_entity_types_context(
+    entity_types: dict[str, BaseModel] | None,
+) -> list[dict[str, Any]]:
+    entity_types_context = [
+        {
+            'entity_type_id': 0,
+            'entity_type_name': 'Entity',
+            'entity_type_description': 'Default entity classification. Use this entity type if the entity is not one of the other listed types.',
+        }
+    ]
+
+    entity_types_context += (
+        [
+            {
+                'entity_type_id': i + 1,
+                'entity_type_name': type_name,
+                'entity_type_description': type_model.__doc__,
+            }
+            for i, (type_name, type_model) in enumerate(entity_types.items())
+        ]
+        if entity_types is not None
+        else []
+    )
+
+    return entity_types_context
+
+
+def _build_extracted_nodes(
+    extracted_entities: list[ExtractedEntity],
+    entity_types_context: list[dict[str, Any]],
+    episode: EpisodicNode,
+    excluded_entity_types: list[str] | None,
+) -> list[EntityNode | None]:
+    """Build one EntityNode per extracted entity, or None for unnamed and excluded entities."""
+    extracted_nodes: list[EntityNode | None] = []
+    for extracted_entity in extracted_entities:
+        if not extracted_entity.name.strip():
+            extracted_nodes.append(None)
+            continue
+
+        entity_type_name = (
+            entity_types_context[extracted_entity.entity_type_id].get('entity_type_name')
+            if -1 < extracted_entity.entity_type_id < len(entity_types_context)
+            else 'Entity'
         )
 
         # Check if this entity type should be excluded
         if excluded_entity_types and entity_type_name in excluded_entity_types:
             logger.debug(f'Excluding entity "{extracted_entity.name}" of type "{entity_type_name}"')
+            extracted_nodes.append(None)
             continue
 
         labels: list[str] = list({'Entity', str(entity_type_name)})
@@ -171,7 +456,6 @@ async def extract_nodes(
         extracted_nodes.append(new_node)
         logger.debug(f'Created new node: {new_node.name} (UUID: {new_node.uuid})')
 
-    logger.debug(f'Extracted nodes: {[(n.name, n.uuid) for n in extracted_nodes]}')
     return extracted_nodes
 
 
@@ -182,25 +466,18 @@ async def resolve_extracted_nodes(
     previous_episodes: list[EpisodicNode] | None = None,
     entity_types: dict[str, BaseModel] | None = None,
     existing_nodes_override: list[EntityNode] | None = None,
+    similarity_threshold: float | None = None,
 ) -> tuple[list[EntityNode], dict[str, str], list[tuple[EntityNode, EntityNode]]]:
     llm_client = clients.llm_client
     driver = clients.driver
-
-    search_results: list[SearchResults] = await semaphore_gather(
-        *[
-            search(
-                clients=clients,
-                query=node.name,
-                group_ids=[node.group_id],
-                search_filter=SearchFilters(),
-                config=NODE_HYBRID_SEARCH_RRF,
-            )
-            for node in extracted_nodes
-        ]
+    similarity_threshold = (
+        similarity_threshold
+        if similarity_threshold is not None
+        else NODE_DEDUPE_SIMILARITY_THRESHOLD
     )
 
     candidate_nodes: list[EntityNode] = (
-        [node for result in search_results for node in result.nodes]
+        await _get_candidate_nodes(clients, extracted_nodes)
         if existing_nodes_override is None
         else existing_nodes_override
     )
@@ -209,79 +486,107 @@ async def resolve_extracted_nodes(
 
     existing_nodes: list[EntityNode] = list(existing_nodes_dict.values())
 
-    existing_nodes_context = (
-        [
-            {
-                **{
-                    'idx': i,
-                    'name': candidate.name,
-                    'entity_types': candidate.labels,
-                },
-                **candidate.attributes,
-            }
-            for i, candidate in enumerate(existing_nodes)
-        ],
+    resolved_nodes_by_idx: dict[int, EntityNode] = {}
+    uuid_map: dict[str, str] = {}
+    node_duplicates: list[tuple[EntityNode, EntityNode]] = []
+
+    # Resolve unambiguous name and embedding matches locally, only the rest need the LLM
+    unresolved_indices: list[int] = []
+    for i, extracted_node in enumerate(extracted_nodes):
+        existing_node = _find_deterministic_match(
+            extracted_node, existing_nodes, similarity_threshold
+        )
+        if existing_node is None:
+            unresolved_indices.append(i)
+            continue
+
+        resolved_nodes_by_idx[i] = existing_node
+        uuid_map[extracted_node.uuid] = existing_node.uuid
+        node_duplicates.append((extracted_node, existing_node))
+
+    logger.debug(
+        f'Resolved {len(extracted_nodes) - len(unresolved_indices)} of {len(extracted_nodes)} '
+        f'nodes without the LLM'
     )
 
-    entity_types_dict: dict[str, BaseModel] = entity_types if entity_types is not None else {}
+    if len(unresolved_indices) > 0:
+        existing_nodes_context = (
+            [
+                {
+                    **{
+                        'idx': i,
+                        'name': candidate.name,
+                        'entity_types': candidate.labels,
+                    },
+                    **candidate.attributes,
+                }
+                for i, candidate in enumerate(existing_nodes)
+            ],
+        )
 
-    # Prepare context for LLM
-    extracted_nodes_context = [
-        {
-            'id': i,
-            'name': node.name,
-            'entity_type': node.labels,
-            'entity_type_description': entity_types_dict.get(
-                next((item for item in node.labels if item != 'Entity'), '')
-            ).__doc__
-            or 'Default Entity Type',
+        entity_types_dict: dict[str, BaseModel] = entity_types if entity_types is not None else {}
+
+        # Prepare context for LLM
+        extracted_nodes_context = [
+            {
+                'id': i,
+                'name': node.name,
+                'entity_type': node.labels,
+                'entity_type_description': entity_types_dict.get(
+                    next((item for item in node.labels if item != 'Entity'), '')
+                ).__doc__
+                or 'Default Entity Type',
+            }
+            for i, node in enumerate(extracted_nodes[idx] for idx in unresolved_indices)
+        ]
+
+        context = {
+            'extracted_nodes': extracted_nodes_context,
+            'existing_nodes': existing_nodes_context,
+            'episode_content': episode.content if episode is not None else '',
+            'previous_episodes': build_previous_episodes_context(previous_episodes)
+            if previous_episodes is not None
+            else [],
         }
-        for i, node in enumerate(extracted_nodes)
-    ]
 
-    context = {
-        'extracted_nodes': extracted_nodes_context,
-        'existing_nodes': existing_nodes_context,
-        'episode_content': episode.content if episode is not None else '',
-        'previous_episodes': [ep.content for ep in previous_episodes]
-        if previous_episodes is not None
-        else [],
-    }
+        llm_response = await llm_client.generate_response(
+            prompt_library.dedupe_nodes.nodes(context),
+            response_model=NodeResolutions,
+        )
 
-    llm_response = await llm_client.generate_response(
-        prompt_library.dedupe_nodes.nodes(context),
-        response_model=NodeResolutions,
-    )
+        node_resolutions: list[NodeDuplicate] = NodeResolutions(**llm_response).entity_resolutions
 
-    node_resolutions: list[NodeDuplicate] = NodeResolutions(**llm_response).entity_resolutions
+        for resolution in node_resolutions:
+            resolution_id: int = resolution.id
+            duplicate_idx: int = resolution.duplicate_idx
 
-    resolved_nodes: list[EntityNode] = []
-    uuid_map: dict[str, str] = {}
-    node_duplicates: list[tuple[EntityNode, EntityNode]] = []
-    for resolution in node_resolutions:
-        resolution_id: int = resolution.id
-        duplicate_idx: int = resolution.duplicate_idx
+            if not 0 <= resolution_id < len(unresolved_indices):
+                logger.warning(f'Invalid node id in node resolution: {resolution_id}')
+                continue
 
-        extracted_node = extracted_nodes[resolution_id]
+            extracted_idx = unresolved_indices[resolution_id]
+            extracted_node = extracted_nodes[extracted_idx]
 
-        resolved_node = (
-            existing_nodes[duplicate_idx]
-            if 0 <= duplicate_idx < len(existing_nodes)
-            else extracted_node
-        )
+            resolved_node = (
+                existing_nodes[duplicate_idx]
+                if 0 <= duplicate_idx < len(existing_nodes)
+                else extracted_node
+            )
 
-        # resolved_node.name = resolution.get('name')
+            resolved_nodes_by_idx[extracted_idx] = resolved_node
+            uuid_map[extracted_node.uuid] = resolved_node.uuid
 
-        resolved_nodes.append(resolved_node)
-        uuid_map[extracted_node.uuid] = resolved_node.uuid
+            duplicates: list[int] = resolution.duplicates
+            if duplicate_idx not in duplicates and duplicate_idx > -1:
+                duplicates.append(duplicate_idx)
+            for idx in duplicates:
+                existing_node = existing_nodes[idx] if idx < len(existing_nodes) else resolved_node
 
-        duplicates: list[int] = resolution.duplicates
-        if duplicate_idx not in duplicates and duplicate_idx > -1:
-            duplicates.append(duplicate_idx)
-        for idx in duplicates:
-            existing_node = existing_nodes[idx] if idx < len(existing_nodes) else resolved_node
+                node_duplicates.append((extracted_node, existing_node))
 
-            node_duplicates.append((extracted_node, existing_node))
+    resolved_nodes: list[EntityNode] = [
+        resolved_nodes_by_idx[i] for i in sorted(resolved_nodes_by_idx.keys())
+    ]
 
     logger.debug(f'Resolved nodes: {[(n.name, n.uuid) for n in resolved_nodes]}')
 
@@ -298,23 +603,49 @@ async def extract_attributes_from_nodes(
     episode: EpisodicNode | None = None,
     previous_episodes: list[EpisodicNode] | None = None,
     entity_types: dict[str, BaseModel] | None = None,
+    batch_size: int | None = None,
 ) -> list[EntityNode]:
     llm_client = clients.llm_client
     embedder = clients.embedder
-    updated_nodes: list[EntityNode] = await semaphore_gather(
-        *[
-            extract_attributes_from_node(
-                llm_client,
-                node,
-                episode,
-                previous_episodes,
-                entity_types.get(next((item for item in node.labels if item != 'Entity'), ''))
-                if entity_types is not None
-                else None,
-            )
-            for node in nodes
-        ]
-    )
+    batch_size = batch_size if batch_size is not None else ATTRIBUTE_EXTRACTION_BATCH_SIZE
+
+    if batch_size <= 1:
+        updated_nodes: list[EntityNode] = await semaphore_gather(
+            *[
+                extract_attributes_from_node(
+                    llm_client,
+                    node,
+                    episode,
+                    previous_episodes,
+                    entity_types.get(_get_entity_type_name(node))
+                    if entity_types is not None
+                    else None,
+                )
+                for node in nodes
+            ]
+        )
+    else:
+        # Only nodes sharing an entity type can share a response model, so pack per type
+        nodes_by_type: dict[str, list[EntityNode]] = {}
+        for node in nodes:
+            nodes_by_type.setdefault(_get_entity_type_name(node), []).append(node)
+
+        await semaphore_gather(
+            *[
+                extract_attributes_from_node_batch(
+                    llm_client,
+                    type_nodes[i : i + batch_size],
+                    episode,
+                    previous_episodes,
+                    entity_types.get(type_name) if entity_types is not None else None,
+                )
+                for type_name, type_nodes in nodes_by_type.items()
+                for i in range(0, len(type_nodes), batch_size)
+            ]
+        )
+
+        # Nodes are updated in place, so the input order is preserved
+        updated_nodes = nodes
 
     await create_entity_node_embeddings(embedder, updated_nodes)
 
@@ -335,29 +666,12 @@ async def extract_attributes_from_node(
         'attributes': node.attributes,
     }
 
-    attributes_definitions: dict[str, Any] = {
-        'summary': (
-            str,
-            Field(
-                description='Summary containing the important information about the entity. Under 250 words',
-            ),
-        )
-    }
-
-    if entity_type is not None:
-        for field_name, field_info in entity_type.model_fields.items():
-            attributes_definitions[field_name] = (
-                field_info.annotation,
-                Field(description=field_info.description),
-            )
-
-    unique_model_name = f'EntityAttributes_{uuid4().hex}'
-    entity_attributes_model = pydantic.create_model(unique_model_name, **attributes_definitions)
+    entity_attributes_model = _get_attributes_model(entity_type)
 
     summary_context: dict[str, Any] = {
         'node': node_context,
         'episode_content': episode.content if episode is not None else '',
-        'previous_episodes': [ep.content for ep in previous_episodes]
+        'previous_episodes': build_previous_episodes_context(previous_episodes)
         if previous_episodes is not None
         else [],
     }
@@ -370,6 +684,243 @@ async def extract_attributes_from_node(
 
     entity_attributes_model(**llm_response)
 
+    _apply_node_attributes(node, llm_response)
+
+    return node
+
+
+async def extract_attributes_from_node_batch(
+    llm_client: LLMClient,
+    nodes: list[EntityNode],
+    episode: EpisodicNode | None = None,
+    previous_episodes: list[EpisodicNode] | None = None,
+    entity_type: BaseModel | None = None,
+) -> list[EntityNode]:
+    """
+    Extract attributes for several nodes of the same entity type with a single LLM call.
+
+    Nodes the LLM does not return attributes for are retried individually. Entity types with their
+    own entity_id field are always extracted node by node, as the field would collide with the
+    batch response's entity_id.
+    """
+    if len(nodes) == 1 or (
+        entity_type is not None and BATCH_ENTITY_ID_FIELD in entity_type.model_fields
+    ):
+        return await semaphore_gather(
+            *[
+                extract_attributes_from_node(
+                    llm_client, node, episode, previous_episodes, entity_type
+                )
+                for node in nodes
+            ]
+        )
+
+    nodes_context: list[dict[str, Any]] = [
+        {
+            BATCH_ENTITY_ID_FIELD: i,
+            'name': node.name,
+            'summary': node.summary,
+            'entity_types': node.labels,
+            'attributes': node.attributes,
+        }
+        for i, node in enumerate(nodes)
+    ]
+
+    entity_attributes_batch_model = _get_attributes_model(entity_type, batch=True)
+
+    summary_context: dict[str, Any] = {
+        'nodes': nodes_context,
+        'episode_content': episode.content if episode is not None else '',
+        'previous_episodes': build_previous_episodes_context(previous_episodes)
+        if previous_episodes is not None
+        else [],
+    }
+
+    llm_response = await llm_client.generate_response(
+        prompt_library.extract_nodes.extract_attributes_batch(summary_context),
+        response_model=entity_attributes_batch_model,
+        model_size=ModelSize.small,
+    )
+
+    entity_attributes_batch_model(**llm_response)
+
+    updated_ids: set[int] = set()
+    for entity_attributes in llm_response.get('entity_attributes', []):
+        entity_id = entity_attributes.get(BATCH_ENTITY_ID_FIELD)
+        if not isinstance(entity_id, int) or not 0 <= entity_id < len(nodes):
+            logger.warning(f'Invalid entity id in batched attribute extraction: {entity_id}')
+            continue
+        if entity_id in updated_ids:
+            continue
+
+        node_attributes = dict(entity_attributes)
+        del node_attributes[BATCH_ENTITY_ID_FIELD]
+        _apply_node_attributes(nodes[entity_id], node_attributes)
+        updated_ids.add(entity_id)
+
+    missing_nodes = [node for i, node in enumerate(nodes) if i not in updated_ids]
+    if len(missing_nodes) > 0:
+        logger.debug(
+            f'Batched attribute extraction missed nodes, retrying individually: '
+            f'{[node.uuid for node in missing_nodes]}'
+        )
+        await semaphore_gather(
+            *[
+                extract_attributes_from_node(
+                    llm_client, node, episode, previous_episodes, entity_type
+                )
+                for node in missing_nodes
+            ]
+        )
+
+    return nodes
+
+
+async def _get_candidate_nodes(
+    clients: GraphitiClients, extracted_nodes: list[EntityNode]
+) -> list[EntityNode]:
+    # Embed all names in one batch and fetch candidates with one hybrid query per group
+    nodes_to_embed = [node for node in extracted_nodes if node.name_embedding is None]
+    if len(nodes_to_embed) > 0:
+        await create_entity_node_embeddings(clients.embedder, nodes_to_embed)
+
+    nodes_by_group_id: dict[str, list[EntityNode]] = {}
+    for node in extracted_nodes:
+        nodes_by_group_id.setdefault(node.group_id, []).append(node)
+
+    relevant_nodes_lists: list[list[list[EntityNode]]] = await semaphore_gather(
+        *[
+            get_relevant_nodes(clients.driver, group_nodes, SearchFilters())
+            for group_nodes in nodes_by_group_id.values()
+        ]
+    )
+
+    return [
+        node
+        for relevant_nodes in relevant_nodes_lists
+        for nodes in relevant_nodes
+        for node in nodes
+    ]
+
+
+def _normalize_name(name: str) -> str:
+    return ' '.join(name.lower().split())
+
+
+def _find_deterministic_match(
+    node: EntityNode, candidates: list[EntityNode], similarity_threshold: float
+) -> EntityNode | None:
+    """
+    Return the single candidate with the same labels whose normalized name matches the node,
+    or failing that whose name embedding is at least similarity_threshold similar.
+    Returns None when there is no match or more than one.
+    """
+    labels = set(node.labels)
+    same_label_candidates = [
+        candidate
+        for candidate in candidates
+        if candidate.uuid != node.uuid and set(candidate.labels) == labels
+    ]
+
+    normalized_name = _normalize_name(node.name)
+    name_matches = [
+        candidate
+        for candidate in same_label_candidates
+        if _normalize_name(candidate.name) == normalized_name
+    ]
+    if len(name_matches) > 0:
+        return name_matches[0] if len(name_matches) == 1 else None
+
+    if node.name_embedding is None:
+        return None
+
+    node_embedding = normalize_l2(node.name_embedding)
+    similar_candidates = [
+        candidate
+        for candidate in same_label_candidates
+        if candidate.name_embedding is not None
+        and np.dot(node_embedding, normalize_l2(candidate.name_embedding)) >= similarity_threshold
+    ]
+
+    return similar_candidates[0] if len(similar_candidates) == 1 else None
+
+
+def _get_entity_type_name(node: EntityNode) -> str:
+    return next((item for item in node.labels if item != 'Entity'), '')
+
+
+def _get_attributes_definitions(entity_type_fields: EntityTypeFields) -> dict[str, Any]:
+    attributes_definitions: dict[str, Any] = {
+        'summary': (
+            str,
+            Field(
+                description='Summary containing the important information about the entity. Under 250 words',
+            ),
+        )
+    }
+
+    for field_name, annotation, description in entity_type_fields:
+        attributes_definitions[field_name] = (annotation, Field(description=description))
+
+    return attributes_definitions
+
+
+def _get_attributes_model(entity_type: BaseModel | None, batch: bool = False) -> type[BaseModel]:
+    """
+    Response model for the attributes of an entity type, or of a batch of its entities.
+
+    Models are reused across calls for entity types with the same fields, rather than creating a
+    new pydantic class, and generating its schema, per node per episode.
+    """
+    entity_type_fields: EntityTypeFields = (
+        tuple(
+            (field_name, field_info.annotation, field_info.description)
+            for field_name, field_info in entity_type.model_fields.items()
+        )
+        if entity_type is not None
+        else ()
+    )
+    if batch and any(
+        field_name == BATCH_ENTITY_ID_FIELD for field_name, _, _ in entity_type_fields
+    ):
+        raise EntityTypeValidationError(
+            entity_type.__name__ if entity_type is not None else 'Entity', BATCH_ENTITY_ID_FIELD
+        )
+
+    try:
+        return _create_attributes_model(entity_type_fields, batch)
+    except TypeError:
+        # Annotations that are not hashable cannot key the cache
+        return _create_attributes_model.__wrapped__(entity_type_fields, batch)
+
+
+@lru_cache(maxsize=ATTRIBUTE_MODEL_CACHE_SIZE)
+def _create_attributes_model(entity_type_fields: EntityTypeFields, batch: bool) -> type[BaseModel]:
+    if not batch:
+        return pydantic.create_model(
+            'EntityAttributes', **_get_attributes_definitions(entity_type_fields)
+        )
+
+    entity_attributes_model = pydantic.create_model(
+        'EntityAttributes',
+        **{
+            BATCH_ENTITY_ID_FIELD: (
+                int,
+                Field(description='entity_id of the ENTITY these attributes belong to'),
+            )
+        },
+        **_get_attributes_definitions(entity_type_fields),
+    )
+    return pydantic.create_model(
+        'EntityAttributesBatch',
+        entity_attributes=(
+            list[entity_attributes_model],  # type: ignore[valid-type]
+            Field(description='List of attributes, one for each ENTITY'),
+        ),
+    )
+
+
+def _apply_node_attributes(node: EntityNode, llm_response: dict[str, Any]):
     node.summary = llm_response.get('summary', '')
     node_attributes = {key: value for key, value in llm_response.items()}
 
@@ -377,5 +928,3 @@ async def extract_attributes_from_node(
         del node_attributes['summary']
 
     node.attributes.update(node_attributes)
-
-    return node
@@ -0,0 +1,143 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import logging
+from math import ceil
+
+from graphiti_core.helpers import (
+    CHUNK_OVERLAP_TOKENS,
+    CHUNK_TOKEN_SIZE,
+    PREVIOUS_EPISODES_TOKEN_BUDGET,
+)
+from graphiti_core.nodes import EpisodicNode
+
+logger = logging.getLogger(__name__)
+
+# Rough average for English text with common LLM tokenizers
+CHARS_PER_TOKEN = 4
+# Episodes that would be cut to fewer tokens than this are dropped instead
+MIN_TRUNCATED_TOKENS = 32
+TRUNCATION_MARKER = ' ...[truncated]'
+# Preferred chunk boundaries, from strongest to weakest
+CHUNK_SEPARATORS = ['\n\n', '\n', '. ', ' ']
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token count estimate that does not require a tokenizer."""
+    return ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Truncate text to roughly max_tokens tokens, keeping its beginning."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    max_chars = max(max_tokens * CHARS_PER_TOKEN - len(TRUNCATION_MARKER), 0)
+    return text[:max_chars] + TRUNCATION_MARKER
+
+
+def build_previous_episodes_context(
+    previous_episodes: list[EpisodicNode], token_budget: int | None = None
+) -> list[str]:
+    """
+    Return the contents of previous_episodes to embed in a prompt, within a token budget.
+
+    Episodes are expected in chronological order. The most recent episodes are kept whole while
+    they fit, the next one is truncated to the remaining budget and older ones are dropped, so the
+    same inputs always produce the same context. A budget of None uses
+    PREVIOUS_EPISODES_TOKEN_BUDGET, and a budget of 0 or less means unlimited.
+    """
+    token_budget = token_budget if token_budget is not None else PREVIOUS_EPISODES_TOKEN_BUDGET
+    contents = [episode.content for episode in previous_episodes]
+    if token_budget <= 0:
+        return contents
+
+    remaining_tokens = token_budget
+    budgeted_contents: list[str] = []
+    for content in reversed(contents):
+        content_tokens = estimate_tokens(content)
+        if content_tokens <= remaining_tokens:
+            budgeted_contents.append(content)
+            remaining_tokens -= content_tokens
+            continue
+
+        if remaining_tokens >= MIN_TRUNCATED_TOKENS:
+            budgeted_contents.append(truncate_to_tokens(content, remaining_tokens))
+        break
+
+    budgeted_contents.reverse()
+
+    total_tokens = sum(estimate_tokens(content) for content in contents)
+    budgeted_tokens = sum(estimate_tokens(content) for content in budgeted_contents)
+    if budgeted_tokens < total_tokens:
+        logger.debug(
+            f'Previous episodes context trimmed from ~{total_tokens} to ~{budgeted_tokens} tokens, '
+            f'saving ~{total_tokens - budgeted_tokens} tokens'
+        )
+
+    return budgeted_contents
+
+
+def chunk_text(
+    text: str, chunk_tokens: int | None = None, overlap_tokens: int | None = None
+) -> list[str]:
+    """
+    Split text into overlapping windows of roughly chunk_tokens tokens.
+
+    Chunks end on the strongest boundary (paragraph, line, sentence, word) found in the second half
+    of the window, and each chunk repeats the last overlap_tokens of the previous one so facts that
+    straddle a boundary are seen whole at least once. Text that fits in a single chunk, or a
+    chunk_tokens of 0 or less, returns [text]. Defaults come from CHUNK_TOKEN_SIZE and
+    CHUNK_OVERLAP_TOKENS.
+    """
+    chunk_tokens = chunk_tokens if chunk_tokens is not None else CHUNK_TOKEN_SIZE
+    overlap_tokens = overlap_tokens if overlap_tokens is not None else CHUNK_OVERLAP_TOKENS
+    if chunk_tokens <= 0 or estimate_tokens(text) <= chunk_tokens:
+        return [text]
+
+    chunk_chars = chunk_tokens * CHARS_PER_TOKEN
+    overlap_chars = min(overlap_tokens * CHARS_PER_TOKEN, chunk_chars // 2)
+
+    chunks: list[str] = []
+    start = 0
+    while start < len(text):
+        end = min(start + chunk_chars, len(text))
+        if end < len(text):
+            end = _find_chunk_boundary(text, start + chunk_chars // 2, end)
+
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        if end >= len(text):
+            break
+
+        # Start the next chunk on a word boundary inside the overlap
+        next_start = end - overlap_chars
+        whitespace_idx = text.find(' ', next_start, end)
+        if overlap_chars > 0 and whitespace_idx != -1:
+            next_start = whitespace_idx + 1
+        start = max(next_start, start + 1)
+
+    return chunks
+
+
+def _find_chunk_boundary(text: str, min_end: int, max_end: int) -> int:
+    for separator in CHUNK_SEPARATORS:
+        idx = text.rfind(separator, min_end, max_end)
+        if idx != -1:
+            return idx + len(separator)
+
+    return max_end
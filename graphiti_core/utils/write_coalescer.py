@@ -0,0 +1,218 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+import logging
+from time import time
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from graphiti_core.driver.driver import GraphDriver
+from graphiti_core.edges import EntityEdge, EpisodicEdge
+from graphiti_core.embedder import EmbedderClient
+from graphiti_core.errors import GraphitiError
+from graphiti_core.nodes import EntityNode, EpisodicNode
+from graphiti_core.utils.bulk_utils import add_nodes_and_edges_bulk
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BATCH_SIZE = 1000
+DEFAULT_MAX_LATENCY = 0.05
+
+
+class PendingWrite(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    episodic_nodes: list[EpisodicNode] = Field(default_factory=list)
+    episodic_edges: list[EpisodicEdge] = Field(default_factory=list)
+    entity_nodes: list[EntityNode] = Field(default_factory=list)
+    entity_edges: list[EntityEdge] = Field(default_factory=list)
+    future: asyncio.Future
+
+    @property
+    def size(self) -> int:
+        return (
+            len(self.episodic_nodes)
+            + len(self.episodic_edges)
+            + len(self.entity_nodes)
+            + len(self.entity_edges)
+        )
+
+
+class BulkWriteCoalescer:
+    """
+    Write-behind buffer in front of add_nodes_and_edges_bulk.
+
+    Concurrent callers enqueue their episodes, nodes and edges and wait until they are persisted.
+    Pending writes are merged into a single bulk transaction once max_batch_size objects are
+    buffered or the oldest pending write has waited max_latency seconds, whichever comes first.
+    Flushes run one at a time, so writes arriving during a flush are coalesced into the next one.
+
+    A flush commits all of its writes or none of them. If the merged transaction fails, e.g. on
+    invalid data from a single caller, every caller coalesced into it gets the error, including
+    callers whose own writes were valid. Their writes are not retried separately.
+    """
+
+    def __init__(
+        self,
+        driver: GraphDriver,
+        embedder: EmbedderClient,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_latency: float = DEFAULT_MAX_LATENCY,
+    ):
+        self.driver = driver
+        self.embedder = embedder
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+
+        self._pending: list[PendingWrite] = []
+        self._pending_size = 0
+        self._flush_lock = asyncio.Lock()
+        self._timer: asyncio.TimerHandle | None = None
+        self._flush_tasks: set[asyncio.Task] = set()
+
+    async def add_nodes_and_edges(
+        self,
+        episodic_nodes: list[EpisodicNode],
+        episodic_edges: list[EpisodicEdge],
+        entity_nodes: list[EntityNode],
+        entity_edges: list[EntityEdge],
+    ):
+        """
+        Enqueue a write and wait until the transaction containing it has committed.
+
+        Raises the error of the transaction if it failed, even when this write was not the cause.
+        """
+        loop = asyncio.get_running_loop()
+        pending_write = PendingWrite(
+            episodic_nodes=episodic_nodes,
+            episodic_edges=episodic_edges,
+            entity_nodes=entity_nodes,
+            entity_edges=entity_edges,
+            future=loop.create_future(),
+        )
+        self._pending.append(pending_write)
+        self._pending_size += pending_write.size
+
+        if self._pending_size >= self.max_batch_size:
+            self._schedule_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_latency, self._schedule_flush)
+
+        await pending_write.future
+
+    async def flush(self):
+        """Write everything that is currently buffered."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        async with self._flush_lock:
+            pending = self._pending
+            self._pending = []
+            self._pending_size = 0
+
+            if len(pending) == 0:
+                return
+
+            start = time()
+            episodic_nodes, episodic_edges, entity_nodes, entity_edges = merge_pending_writes(
+                pending
+            )
+            try:
+                await add_nodes_and_edges_bulk(
+                    self.driver,
+                    episodic_nodes,
+                    episodic_edges,
+                    entity_nodes,
+                    entity_edges,
+                    self.embedder,
+                )
+            except Exception as e:
+                _fail_pending_writes(pending, e)
+                return
+            except BaseException:
+                # The writes have left the buffer, so their callers would otherwise wait forever
+                _fail_pending_writes(
+                    pending, GraphitiError('Coalesced write was cancelled before it was committed')
+                )
+                raise
+
+            for pending_write in pending:
+                if not pending_write.future.done():
+                    pending_write.future.set_result(None)
+
+            end = time()
+            logger.debug(
+                f'Flushed {len(pending)} coalesced writes ({len(entity_nodes)} nodes, '
+                f'{len(entity_edges)} edges) in {(end - start) * 1000} ms'
+            )
+
+    async def close(self):
+        """Flush buffered writes and wait for in-flight flushes to finish."""
+        await self.flush()
+        if len(self._flush_tasks) > 0:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+
+    def _schedule_flush(self):
+        # Flushes triggered by size would otherwise leave the timer to cause an extra flush
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        task = asyncio.create_task(self.flush())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+
+def _fail_pending_writes(pending: list[PendingWrite], error: BaseException):
+    for pending_write in pending:
+        if not pending_write.future.done():
+            pending_write.future.set_exception(error)
+
+
+def merge_pending_writes(
+    pending: list[PendingWrite],
+) -> tuple[list[EpisodicNode], list[EpisodicEdge], list[EntityNode], list[EntityEdge]]:
+    """
+    Merge pending writes by uuid so each object is written once per transaction.
+
+    Later writes of the same object win, except that the episodes of entity edges are unioned so
+    concurrent episodes touching the same fact do not drop each other's references.
+    """
+    episodic_nodes: dict[str, EpisodicNode] = {}
+    episodic_edges: dict[str, EpisodicEdge] = {}
+    entity_nodes: dict[str, EntityNode] = {}
+    entity_edges: dict[str, EntityEdge] = {}
+
+    for pending_write in pending:
+        for episode in pending_write.episodic_nodes:
+            episodic_nodes[episode.uuid] = episode
+        for episodic_edge in pending_write.episodic_edges:
+            episodic_edges[episodic_edge.uuid] = episodic_edge
+        for node in pending_write.entity_nodes:
+            entity_nodes[node.uuid] = node
+        for edge in pending_write.entity_edges:
+            existing_edge = entity_edges.get(edge.uuid)
+            if existing_edge is not None and existing_edge is not edge:
+                edge.episodes = list(dict.fromkeys(existing_edge.episodes + edge.episodes))
+            entity_edges[edge.uuid] = edge
+
+    return (
+        list(episodic_nodes.values()),
+        list(episodic_edges.values()),
+        list(entity_nodes.values()),
+        list(entity_edges.values()),
+    )
@@ -4,9 +4,9 @@ from typing import Annotated
 from fastapi import Depends, HTTPException
 from graphiti_core import Graphiti  # type: ignore
 from graphiti_core.edges import EntityEdge  # type: ignore
-from graphiti_core.errors import EdgeNotFoundError, GroupsEdgesNotFoundError, NodeNotFoundError
+from graphiti_core.errors import EdgeNotFoundError, NodeNotFoundError
 from graphiti_core.llm_client import LLMClient  # type: ignore
-from graphiti_core.nodes import EntityNode, EpisodicNode  # type: ignore
+from graphiti_core.nodes import EntityNode, EpisodicNode, Node  # type: ignore
 
 from graph_service.config import ZepEnvDep
 from graph_service.dto import FactResult
@@ -37,24 +37,7 @@ class ZepGraphiti(Graphiti):
             raise HTTPException(status_code=404, detail=e.message) from e
 
     async def delete_group(self, group_id: str):
-        try:
-            edges = await EntityEdge.get_by_group_ids(self.driver, [group_id])
-        except GroupsEdgesNotFoundError:
-            logger.warning(f'No edges found for group {group_id}')
-            edges = []
-
-        nodes = await EntityNode.get_by_group_ids(self.driver, [group_id])
-
-        episodes = await EpisodicNode.get_by_group_ids(self.driver, [group_id])
-
-        for edge in edges:
-            await edge.delete(self.driver)
-
-        for node in nodes:
-            await node.delete(self.driver)
-
-        for episode in episodes:
-            await episode.delete(self.driver)
+        await Node.delete_by_group_id(self.driver, group_id)
 
     async def delete_entity_edge(self, uuid: str):
         try:
@@ -22,6 +22,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 
 from graphiti_core.driver.driver import GraphProvider
+from graphiti_core.models.nodes.node_db_queries import get_entity_node_save_bulk_query
 
 try:
     from graphiti_core.driver.falkordb_driver import FalkorDriver, FalkorDriverSession
@@ -296,6 +297,27 @@ class TestFalkorDriverSession:
         assert call_args[1]['created_at'] == test_datetime.isoformat()
 
 
+class TestEntityNodeSaveBulkQuery:
+    """Test FalkorDB bulk entity node save queries."""
+
+    def test_groups_nodes_by_label_set(self):
+        """Test one UNWIND query is emitted per distinct label set."""
+        nodes = [
+            {'uuid': '1', 'labels': ['Entity', 'Person']},
+            {'uuid': '2', 'labels': ['Entity']},
+            {'uuid': '3', 'labels': ['Person', 'Entity']},
+        ]
+
+        queries = get_entity_node_save_bulk_query(GraphProvider.FALKORDB, nodes)
+
+        assert len(queries) == 2
+        (person_query, person_params), (entity_query, entity_params) = queries
+        assert 'SET n:Entity:Person' in person_query
+        assert [node['uuid'] for node in person_params['nodes']] == ['1', '3']
+        assert 'SET n:Entity\n' in entity_query
+        assert [node['uuid'] for node in entity_params['nodes']] == ['2']
+
+
 class TestDatetimeConversion:
     """Test datetime conversion utility function."""
 
@@ -15,12 +15,13 @@ limitations under the License.
 """
 
 import os
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from dotenv import load_dotenv
 
-from graphiti_core.driver.driver import GraphDriver
-from graphiti_core.helpers import lucene_sanitize
+from graphiti_core.driver.driver import GraphDriver, GraphProvider
+from graphiti_core.helpers import delete_in_batches, lucene_sanitize
 
 load_dotenv()
 
@@ -92,5 +93,45 @@ def test_lucene_sanitize():
         assert assert_result == result
 
 
+@pytest.mark.asyncio
+async def test_delete_in_batches_uses_in_transactions_on_neo4j():
+    result = MagicMock()
+    result.consume = AsyncMock()
+    session = MagicMock()
+    session.run = AsyncMock(return_value=result)
+    session.__aenter__ = AsyncMock(return_value=session)
+    session.__aexit__ = AsyncMock(return_value=None)
+    driver = MagicMock()
+    driver.provider = GraphProvider.NEO4J
+    driver.session.return_value = session
+
+    await delete_in_batches(
+        driver, 'MATCH (n:Entity {group_id: $group_id})', 'n', 'DETACH DELETE n', 100, group_id='g'
+    )
+
+    query = session.run.await_args.args[0]
+    assert 'CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF $batch_size ROWS' in query
+    assert session.run.await_args.kwargs == {'batch_size': 100, 'group_id': 'g'}
+    result.consume.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_delete_in_batches_loops_until_exhausted_on_falkordb():
+    driver = MagicMock()
+    driver.provider = GraphProvider.FALKORDB
+    driver.execute_query = AsyncMock(
+        side_effect=[
+            ([{'deleted_count': 2}], None, None),
+            ([{'deleted_count': 2}], None, None),
+            ([{'deleted_count': 1}], None, None),
+        ]
+    )
+
+    await delete_in_batches(driver, 'MATCH (n:Entity)', 'n', 'DETACH DELETE n', 2)
+
+    assert driver.execute_query.await_count == 3
+    assert 'LIMIT $batch_size' in driver.execute_query.await_args.args[0]
+
+
 if __name__ == '__main__':
     pytest.main([__file__])
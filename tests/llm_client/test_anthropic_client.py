@@ -128,6 +128,32 @@ class TestAnthropicClientGenerateResponse:
         assert result['test_field'] == 'test_value'
         mock_async_anthropic.messages.create.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_generate_response_marks_system_prompt_cacheable(
+        self, anthropic_client, mock_async_anthropic
+    ):
+        """Test that the system prompt is sent with a prompt caching breakpoint."""
+        content_item = MagicMock()
+        content_item.type = 'tool_use'
+        content_item.input = {'test_field': 'test_value'}
+
+        mock_response = MagicMock()
+        mock_response.content = [content_item]
+        mock_async_anthropic.messages.create.return_value = mock_response
+
+        await anthropic_client.generate_response(
+            messages=[
+                Message(role='system', content='System message'),
+                Message(role='user', content='User message'),
+            ],
+            response_model=ResponseModel,
+        )
+
+        system = mock_async_anthropic.messages.create.call_args.kwargs['system']
+        assert system == [
+            {'type': 'text', 'text': 'System message', 'cache_control': {'type': 'ephemeral'}}
+        ]
+
     @pytest.mark.asyncio
     async def test_generate_response_with_text_response(
         self, anthropic_client, mock_async_anthropic
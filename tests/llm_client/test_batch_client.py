@@ -0,0 +1,175 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+import json
+import os
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pydantic import BaseModel
+
+from graphiti_core.llm_client.batch_client import (
+    BatchCollectingLLMClient,
+    BatchRequest,
+    BatchResult,
+    FileBatchLLMClient,
+)
+from graphiti_core.llm_client.client import LLMClient
+from graphiti_core.llm_client.config import LLMConfig
+from graphiti_core.llm_client.errors import BatchRequestError
+from graphiti_core.llm_client.openai_batch_client import _parse_batch_result
+from graphiti_core.prompts.models import Message
+
+
+class ResponseModel(BaseModel):
+    answer: str
+
+
+class EchoLLMClient(LLMClient):
+    async def _generate_response(
+        self, messages, response_model=None, max_tokens=0, model_size=None
+    ):
+        question = messages[1].content
+        if question == 'fail':
+            raise ValueError('invalid request')
+        return {'answer': question}
+
+
+class FlakyLLMClient(LLMClient):
+    """Answers without the required field unless told that the previous response was invalid."""
+
+    async def _generate_response(
+        self, messages, response_model=None, max_tokens=0, model_size=None
+    ):
+        if 'previous response attempt was invalid' in messages[-1].content:
+            return {'answer': 'fixed'}
+        return {'wrong_field': 'invalid'}
+
+
+def _messages(question: str) -> list[Message]:
+    return [Message(role='system', content='system'), Message(role='user', content=question)]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_are_submitted_as_one_batch(tmp_path):
+    batch_client = FileBatchLLMClient(str(tmp_path), EchoLLMClient(LLMConfig()), poll_interval=0)
+    client = BatchCollectingLLMClient(batch_client, collect_interval=0.01)
+
+    responses = await asyncio.gather(
+        *[
+            client.generate_response(_messages(f'question {i}'), response_model=ResponseModel)
+            for i in range(5)
+        ]
+    )
+
+    assert responses == [{'answer': f'question {i}'} for i in range(5)]
+    batch_ids = os.listdir(tmp_path)
+    assert len(batch_ids) == 1
+    with open(tmp_path / batch_ids[0] / 'requests.jsonl') as f:
+        requests = [BatchRequest.model_validate_json(line) for line in f]
+    assert len(requests) == 5
+    # The schema is sent in the prompt
+    assert '"answer"' in requests[0].messages[0].content
+
+
+@pytest.mark.asyncio
+async def test_failed_requests_raise_for_their_caller_only(tmp_path):
+    batch_client = FileBatchLLMClient(str(tmp_path), EchoLLMClient(LLMConfig()), poll_interval=0)
+    client = BatchCollectingLLMClient(batch_client, collect_interval=0.01)
+
+    ok, failed = await asyncio.gather(
+        client.generate_response(_messages('ok')),
+        client.generate_response(_messages('fail')),
+        return_exceptions=True,
+    )
+
+    assert ok == {'answer': 'ok'}
+    assert isinstance(failed, BatchRequestError)
+    assert 'invalid request' in str(failed)
+
+
+@pytest.mark.asyncio
+async def test_invalid_responses_are_resubmitted_in_a_follow_up_batch(tmp_path):
+    batch_client = FileBatchLLMClient(str(tmp_path), FlakyLLMClient(LLMConfig()), poll_interval=0)
+    client = BatchCollectingLLMClient(batch_client, collect_interval=0.01)
+
+    responses = await asyncio.gather(
+        *[
+            client.generate_response(_messages(f'question {i}'), response_model=ResponseModel)
+            for i in range(3)
+        ]
+    )
+
+    assert responses == [{'answer': 'fixed'}] * 3
+    assert len(os.listdir(tmp_path)) == 2
+
+
+@pytest.mark.asyncio
+async def test_failing_requests_fall_back_to_online_calls(tmp_path):
+    batch_client = FileBatchLLMClient(str(tmp_path), EchoLLMClient(LLMConfig()), poll_interval=0)
+    fallback_llm_client = MagicMock()
+    fallback_llm_client.generate_response = AsyncMock(return_value={'answer': 'online'})
+    client = BatchCollectingLLMClient(
+        batch_client, collect_interval=0.01, fallback_llm_client=fallback_llm_client
+    )
+
+    response = await client.generate_response(_messages('fail'), response_model=ResponseModel)
+
+    assert response == {'answer': 'online'}
+    # The online call gets the caller's messages, without the batch retry feedback
+    assert fallback_llm_client.generate_response.call_args.args[0] == _messages('fail')
+    assert len(os.listdir(tmp_path)) == 1 + BatchCollectingLLMClient.MAX_RETRIES
+
+
+@pytest.mark.asyncio
+async def test_file_batch_waits_for_external_results(tmp_path):
+    batch_client = FileBatchLLMClient(str(tmp_path))
+    batch_id = await batch_client.submit_batch(
+        [BatchRequest(custom_id='request', messages=_messages('question'))]
+    )
+
+    assert await batch_client.get_batch_results(batch_id) is None
+
+    result = BatchResult(custom_id='request', response={'answer': 'external'})
+    with open(tmp_path / batch_id / 'results.jsonl', 'w') as f:
+        f.write(result.model_dump_json())
+
+    assert await batch_client.get_batch_results(batch_id) == [result]
+
+
+def test_parse_openai_batch_results():
+    success = _parse_batch_result(
+        {
+            'custom_id': 'a',
+            'response': {
+                'status_code': 200,
+                'body': {'choices': [{'message': {'content': json.dumps({'answer': 'yes'})}}]},
+            },
+            'error': None,
+        }
+    )
+    failure = _parse_batch_result(
+        {
+            'custom_id': 'b',
+            'response': {'status_code': 400, 'body': {'error': {'message': 'bad request'}}},
+            'error': None,
+        }
+    )
+
+    assert success == BatchResult(custom_id='a', response={'answer': 'yes'})
+    assert failure.response is None
+    assert failure.error is not None and 'bad request' in failure.error
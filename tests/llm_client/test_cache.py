@@ -0,0 +1,126 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import pytest
+from pydantic import BaseModel
+
+from graphiti_core.llm_client.cache import (
+    DiskLLMCache,
+    InMemoryLLMCache,
+    SQLiteLLMCache,
+    get_cache_key,
+)
+from graphiti_core.llm_client.client import LLMClient
+from graphiti_core.llm_client.config import LLMConfig, ModelSize
+from graphiti_core.prompts.models import Message
+
+
+class ResponseModel(BaseModel):
+    answer: str
+
+
+class OtherResponseModel(BaseModel):
+    other: str
+
+
+class CountingLLMClient(LLMClient):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = 0
+
+    async def _generate_response(
+        self, messages, response_model=None, max_tokens=0, model_size=None
+    ):
+        self.calls += 1
+        return {'answer': f'response {self.calls}'}
+
+
+def _messages() -> list[Message]:
+    return [Message(role='system', content='system'), Message(role='user', content='question')]
+
+
+def test_cache_key_covers_model_size_messages_and_schema():
+    key = get_cache_key('model', ModelSize.medium, _messages(), ResponseModel)
+
+    assert key == get_cache_key('model', ModelSize.medium, _messages(), ResponseModel)
+    assert key != get_cache_key('other-model', ModelSize.medium, _messages(), ResponseModel)
+    assert key != get_cache_key('model', ModelSize.small, _messages(), ResponseModel)
+    assert key != get_cache_key('model', ModelSize.medium, _messages()[:1], ResponseModel)
+    assert key != get_cache_key('model', ModelSize.medium, _messages(), OtherResponseModel)
+
+
+@pytest.mark.asyncio
+async def test_in_memory_cache_evicts_least_recently_used():
+    cache = InMemoryLLMCache(max_size=2)
+    await cache.set('a', {'value': 1})
+    await cache.set('b', {'value': 2})
+    await cache.get('a')
+    await cache.set('c', {'value': 3})
+
+    assert await cache.get('a') == {'value': 1}
+    assert await cache.get('b') is None
+    assert await cache.get('c') == {'value': 3}
+
+
+@pytest.mark.asyncio
+async def test_in_memory_cache_does_not_share_responses_with_callers():
+    cache = InMemoryLLMCache()
+    value = {'items': [1]}
+    await cache.set('key', value)
+    value['items'].append(2)
+
+    cached = await cache.get('key')
+    assert cached == {'items': [1]}
+    cached['items'].append(3)
+
+    assert await cache.get('key') == {'items': [1]}
+
+
+@pytest.mark.asyncio
+async def test_sqlite_cache_round_trip(tmp_path):
+    path = str(tmp_path / 'llm_cache.db')
+    cache = SQLiteLLMCache(path)
+    await cache.set('key', {'answer': 'cached'})
+    await cache.close()
+
+    reopened = SQLiteLLMCache(path)
+    assert await reopened.get('key') == {'answer': 'cached'}
+    assert await reopened.get('missing') is None
+    await reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_disk_cache_round_trip(tmp_path):
+    cache = DiskLLMCache(str(tmp_path))
+    await cache.set('key', {'answer': 'cached'})
+
+    assert await cache.get('key') == {'answer': 'cached'}
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_client_serves_repeated_requests_from_cache():
+    client = CountingLLMClient(LLMConfig(model='model'), cache=InMemoryLLMCache())
+
+    first = await client.generate_response(_messages(), response_model=ResponseModel)
+    second = await client.generate_response(_messages(), response_model=ResponseModel)
+    small = await client.generate_response(
+        _messages(), response_model=ResponseModel, model_size=ModelSize.small
+    )
+
+    assert first == second == {'answer': 'response 1'}
+    assert small == {'answer': 'response 2'}
+    assert client.calls == 2
@@ -0,0 +1,136 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import pytest
+from pydantic import BaseModel
+
+from graphiti_core.llm_client.cascade import CascadingLLMClient
+from graphiti_core.llm_client.client import LLMClient, validation_retries_enabled
+from graphiti_core.llm_client.config import LLMConfig, ModelSize
+from graphiti_core.llm_client.rate_limiter import RateLimiter
+from graphiti_core.prompts.models import Message
+from graphiti_core.utils.concurrency import ConcurrencyGovernor
+
+
+class ResponseModel(BaseModel):
+    answer: str
+
+
+class SizedLLMClient(LLMClient):
+    """Answers on the medium model, and on the small model only when small_answers is set."""
+
+    def __init__(self, small_answers: bool):
+        super().__init__(LLMConfig())
+        self.small_answers = small_answers
+        self.calls: list[ModelSize] = []
+        self.validation_retries: list[bool] = []
+
+    async def _generate_response(
+        self, messages, response_model=None, max_tokens=0, model_size=ModelSize.medium
+    ):
+        self.calls.append(model_size)
+        self.validation_retries.append(validation_retries_enabled())
+        if model_size == ModelSize.small and not self.small_answers:
+            return {'wrong_field': 'small'}
+        return {'answer': model_size.value}
+
+
+def _messages() -> list[Message]:
+    return [Message(role='system', content='system'), Message(role='user', content='question')]
+
+
+@pytest.mark.asyncio
+async def test_accepts_valid_small_model_responses():
+    inner = SizedLLMClient(small_answers=True)
+    client = CascadingLLMClient(inner)
+
+    response = await client.generate_response(_messages(), response_model=ResponseModel)
+
+    assert response == {'answer': 'small'}
+    assert inner.calls == [ModelSize.small]
+    assert client.stats['ResponseModel'].escalation_rate == 0
+
+
+@pytest.mark.asyncio
+async def test_escalates_invalid_or_low_confidence_responses():
+    inner = SizedLLMClient(small_answers=False)
+    client = CascadingLLMClient(inner)
+
+    response = await client.generate_response(_messages(), response_model=ResponseModel)
+    assert response == {'answer': 'medium'}
+    assert inner.calls == [ModelSize.small, ModelSize.medium]
+    # The small model is not re-prompted, escalation takes the place of validation retries
+    assert inner.validation_retries == [False, True]
+
+    confident_inner = SizedLLMClient(small_answers=True)
+    client = CascadingLLMClient(
+        confident_inner, is_confident=lambda model, response: response['answer'] != 'small'
+    )
+    assert await client.generate_response(_messages(), ResponseModel) == {'answer': 'medium'}
+    assert client.stats['ResponseModel'].escalations == 1
+
+
+@pytest.mark.asyncio
+async def test_routes_frequently_escalated_prompts_to_medium():
+    inner = SizedLLMClient(small_answers=False)
+    client = CascadingLLMClient(inner, min_samples=2, probe_interval=5)
+
+    for _ in range(4):
+        await client.generate_response(_messages(), response_model=ResponseModel)
+
+    # Two escalations reach min_samples, then calls go to the medium model directly
+    assert inner.calls == [ModelSize.small, ModelSize.medium] * 2 + [ModelSize.medium] * 2
+
+    # The fifth call probes the small model again
+    inner.calls = []
+    await client.generate_response(_messages(), response_model=ResponseModel)
+    assert inner.calls == [ModelSize.small, ModelSize.medium]
+
+
+@pytest.mark.asyncio
+async def test_stats_are_kept_per_prompt_name():
+    inner = SizedLLMClient(small_answers=True)
+    client = CascadingLLMClient(inner)
+    messages = _messages()
+    for message in messages:
+        message.prompt_name = 'extract_nodes.extract_message'
+
+    await client.generate_response(messages, response_model=ResponseModel)
+    await client.generate_response(_messages(), response_model=ResponseModel)
+
+    assert client.stats['extract_nodes.extract_message'].calls == 1
+    assert client.stats['ResponseModel'].calls == 1
+
+
+def test_governor_is_shared_with_wrapped_client():
+    inner = SizedLLMClient(small_answers=True)
+    client = CascadingLLMClient(inner)
+    governor = ConcurrencyGovernor()
+
+    client.governor = governor
+
+    assert inner.governor is governor
+
+
+def test_only_the_wrapped_client_rate_limits():
+    inner = SizedLLMClient(small_answers=True)
+    inner.config = LLMConfig(requests_per_minute=10)
+    inner.rate_limiter = RateLimiter(requests_per_minute=10)
+    client = CascadingLLMClient(inner)
+
+    # The limits of the shared config are not enforced a second time by the cascade
+    assert client.rate_limiter is None
+    assert inner.rate_limiter is not None
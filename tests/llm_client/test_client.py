@@ -14,8 +14,18 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-from graphiti_core.llm_client.client import LLMClient
+import pytest
+from pydantic import BaseModel
+
+from graphiti_core.llm_client.client import (
+    MULTILINGUAL_EXTRACTION_RESPONSES,
+    LLMClient,
+    without_validation_retries,
+)
 from graphiti_core.llm_client.config import LLMConfig
+from graphiti_core.llm_client.openai_base_client import BaseOpenAIClient
+from graphiti_core.llm_client.utils import get_serialized_schema
+from graphiti_core.prompts.models import Message
 
 
 class MockLLMClient(LLMClient):
@@ -55,3 +65,67 @@ def test_clean_input():
 
     for input_str, expected in test_cases:
         assert client._clean_input(input_str) == expected, f'Failed for input: {repr(input_str)}'
+
+
+class ResponseModel(BaseModel):
+    answer: str
+
+
+def test_prepare_messages_keeps_a_static_prefix():
+    client = MockLLMClient(LLMConfig())
+    messages = [
+        Message(role='system', content='instructions'),
+        Message(role='user', content='episode data'),
+    ]
+
+    prepared = client._prepare_messages(messages, ResponseModel)
+
+    # The caller's messages are left unchanged
+    assert [m.content for m in messages] == ['instructions', 'episode data']
+    # The schema and multilingual instructions follow the static system prompt, not the data
+    assert prepared[0].content.startswith('instructions')
+    assert '"answer"' in prepared[0].content
+    assert prepared[0].content.endswith(MULTILINGUAL_EXTRACTION_RESPONSES)
+    assert prepared[1].content == 'episode data'
+
+    other = client._prepare_messages(
+        [messages[0], Message(role='user', content='other data')], ResponseModel
+    )
+    assert other[0].content == prepared[0].content
+
+
+def test_serialized_schema_is_generated_once_per_model():
+    assert get_serialized_schema(ResponseModel) is get_serialized_schema(ResponseModel)
+    assert '"answer"' in get_serialized_schema(ResponseModel)
+
+
+class FailingOpenAIClient(BaseOpenAIClient):
+    def __init__(self):
+        super().__init__(LLMConfig(api_key='test'))
+        self.attempts = 0
+
+    async def _create_structured_completion(
+        self, model, messages, temperature, max_tokens, response_model
+    ):
+        raise NotImplementedError()
+
+    async def _create_completion(
+        self, model, messages, temperature, max_tokens, response_model=None
+    ):
+        self.attempts += 1
+        raise ValueError('invalid response')
+
+
+@pytest.mark.asyncio
+async def test_validation_retries_can_be_disabled():
+    client = FailingOpenAIClient()
+    messages = [Message(role='system', content='system'), Message(role='user', content='question')]
+
+    with pytest.raises(ValueError):
+        await client.generate_response(messages)
+    assert client.attempts == client.MAX_RETRIES + 1
+
+    client.attempts = 0
+    with without_validation_retries(), pytest.raises(ValueError):
+        await client.generate_response(messages)
+    assert client.attempts == 1
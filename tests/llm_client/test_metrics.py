@@ -0,0 +1,138 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from graphiti_core.llm_client.cache import InMemoryLLMCache, get_cache_key
+from graphiti_core.llm_client.client import LLMClient
+from graphiti_core.llm_client.config import LLMConfig, ModelSize
+from graphiti_core.llm_client.metrics import LLMCallMetrics, record_llm_usage
+from graphiti_core.llm_client.openai_client import OpenAIClient
+from graphiti_core.prompts import prompt_library
+from graphiti_core.prompts.models import Message
+
+
+class UsageLLMClient(LLMClient):
+    async def _generate_response(
+        self, messages, response_model=None, max_tokens=0, model_size=None
+    ):
+        record_llm_usage('usage-model', 100, 20)
+        return {'answer': 'yes'}
+
+
+def _summary_messages() -> list[Message]:
+    return prompt_library.summarize_nodes.summarize_context(
+        {
+            'node_name': 'Alice',
+            'node_summary': '',
+            'episode_content': 'Alice works at Acme.',
+            'previous_episodes': [],
+            'attributes': [],
+        }
+    )
+
+
+def test_prompt_library_names_prompts_without_changing_cache_keys():
+    messages = _summary_messages()
+    untagged = [Message(role=m.role, content=m.content) for m in messages]
+
+    assert messages[0].prompt_name == 'summarize_nodes.summarize_context'
+    assert 'prompt_name' not in messages[0].model_dump()
+    assert get_cache_key('model', ModelSize.medium, messages) == get_cache_key(
+        'model', ModelSize.medium, untagged
+    )
+
+
+@pytest.mark.asyncio
+async def test_observer_receives_metrics_per_call():
+    observed: list[LLMCallMetrics] = []
+    client = UsageLLMClient(LLMConfig(model='configured-model'), cache=InMemoryLLMCache())
+    client.call_observer = observed.append
+
+    await client.generate_response(_summary_messages())
+    await client.generate_response(_summary_messages())
+
+    first, second = observed
+    assert first.prompt_name == 'summarize_nodes.summarize_context'
+    assert (first.model, first.input_tokens, first.output_tokens) == ('usage-model', 100, 20)
+    assert not first.cache_hit and first.latency > 0
+    assert second.cache_hit and second.input_tokens is None
+    assert first.to_attributes()['gen_ai.usage.input_tokens'] == 100
+    assert 'error.type' not in first.to_attributes()
+
+
+def _completion(content: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+        usage=SimpleNamespace(prompt_tokens=50, completion_tokens=5),
+    )
+
+
+def _raw_response(completion: SimpleNamespace) -> MagicMock:
+    raw_response = MagicMock(headers={})
+    raw_response.parse.return_value = completion
+    return raw_response
+
+
+@pytest.mark.asyncio
+async def test_openai_client_reports_tokens_and_validation_retries():
+    openai_client = MagicMock()
+    openai_client.chat.completions.with_raw_response.create = AsyncMock(
+        side_effect=[
+            _raw_response(_completion('not json')),
+            _raw_response(_completion(json.dumps({'answer': 'yes'}))),
+        ]
+    )
+    client = OpenAIClient(LLMConfig(api_key='test', model='gpt-test'), client=openai_client)
+    observed: list[LLMCallMetrics] = []
+    client.call_observer = observed.append
+
+    assert await client.generate_response(_summary_messages()) == {'answer': 'yes'}
+
+    (metrics,) = observed
+    assert metrics.validation_retries == 1
+    assert metrics.retries == 0
+    assert (metrics.model, metrics.input_tokens, metrics.output_tokens) == ('gpt-test', 100, 10)
+
+
+@pytest.mark.asyncio
+async def test_failed_calls_and_observer_errors():
+    observed: list[LLMCallMetrics] = []
+
+    class FailingLLMClient(LLMClient):
+        async def _generate_response(
+            self, messages, response_model=None, max_tokens=0, model_size=None
+        ):
+            raise ValueError('invalid')
+
+    client = FailingLLMClient(LLMConfig())
+    client.call_observer = observed.append
+    with pytest.raises(ValueError):
+        await client.generate_response(_summary_messages(), model_size=ModelSize.small)
+    assert observed[0].error == 'ValueError'
+    assert observed[0].model_size == ModelSize.small
+
+    def failing_observer(metrics: LLMCallMetrics):
+        raise RuntimeError('observer failed')
+
+    # A failing observer does not fail the call
+    usage_client = UsageLLMClient(LLMConfig())
+    usage_client.call_observer = failing_observer
+    assert await usage_client.generate_response(_summary_messages()) == {'answer': 'yes'}
@@ -0,0 +1,190 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from graphiti_core.llm_client.client import LLMClient
+from graphiti_core.llm_client.config import LLMConfig
+from graphiti_core.llm_client.errors import RateLimitError
+from graphiti_core.llm_client.gemini_client import GeminiClient
+from graphiti_core.llm_client.openai_client import OpenAIClient
+from graphiti_core.llm_client.rate_limiter import (
+    ModelRateLimiter,
+    RateLimiter,
+    TokenBucket,
+    get_rate_limit_headers,
+)
+from graphiti_core.prompts.models import Message
+
+
+class ProviderError(Exception):
+    def __init__(self, headers: dict[str, str]):
+        super().__init__('429')
+        self.response = type('Response', (), {'headers': headers})()
+
+
+class MockLLMClient(LLMClient):
+    async def _generate_response(
+        self, messages, response_model=None, max_tokens=0, model_size=None
+    ):
+        return {'content': 'test'}
+
+
+def test_token_bucket_wait_time():
+    bucket = TokenBucket(60)
+    bucket.consume(60)
+
+    # One unit refills every second at 60/min
+    assert bucket.wait_time(1) == pytest.approx(1, abs=0.05)
+    # Amounts above the capacity only wait for a full bucket
+    assert bucket.wait_time(1000) == pytest.approx(60, abs=0.05)
+
+
+def test_aimd_lowers_and_recovers_rate():
+    limiter = ModelRateLimiter(requests_per_minute=100, tokens_per_minute=10000)
+
+    limiter.record_rate_limited()
+    assert limiter.rate_scale == 0.5
+    assert limiter.requests is not None and limiter.requests.capacity == 50
+    assert limiter.tokens is not None and limiter.tokens.capacity == 5000
+
+    limiter.record_success()
+    assert limiter.rate_scale == pytest.approx(0.55)
+    assert limiter.requests.capacity == pytest.approx(55)
+
+    for _ in range(20):
+        limiter.record_success()
+    assert limiter.rate_scale == 1.0
+
+
+def test_adopts_provider_rate_limit_headers():
+    limiter = ModelRateLimiter(requests_per_minute=1000, tokens_per_minute=None)
+
+    limiter.update_from_headers(
+        {'x-ratelimit-limit-requests': '500', 'x-ratelimit-remaining-requests': '3'}
+    )
+
+    assert limiter.requests is not None
+    assert limiter.requests.capacity == 500
+    assert limiter.requests.available == pytest.approx(3, abs=0.1)
+
+    # Higher provider limits do not lift the configured ceiling
+    limiter.update_from_headers({'x-ratelimit-limit-requests': '5000'})
+    assert limiter.requests.limit_per_minute == 1000
+    assert limiter.requests.capacity == 1000
+
+
+def test_get_rate_limit_headers_follows_cause():
+    headers = {'retry-after': '2'}
+    try:
+        try:
+            raise ProviderError(headers)
+        except ProviderError as e:
+            raise RateLimitError() from e
+    except RateLimitError as e:
+        assert get_rate_limit_headers(e) == headers
+
+    assert get_rate_limit_headers(RateLimitError()) is None
+
+
+@pytest.mark.asyncio
+async def test_acquire_waits_for_budget():
+    limiter = RateLimiter(requests_per_minute=60)
+    with patch('graphiti_core.llm_client.rate_limiter.asyncio.sleep', AsyncMock()) as mock_sleep:
+        for _ in range(60):
+            await limiter.acquire('model', 10)
+        mock_sleep.assert_not_awaited()
+
+        # The bucket is empty, so the next request waits about a second for a refill
+        mock_sleep.side_effect = lambda seconds: _advance(limiter, 'model', seconds)
+        await limiter.acquire('model', 10)
+        mock_sleep.assert_awaited()
+        assert mock_sleep.await_args.args[0] == pytest.approx(1, abs=0.05)
+
+
+def _advance(limiter: RateLimiter, model: str, seconds: float):
+    bucket = limiter.get_model_limiter(model).requests
+    assert bucket is not None
+    bucket.available += seconds * bucket.capacity / 60
+
+
+@pytest.mark.asyncio
+async def test_client_records_rate_limits():
+    client = MockLLMClient(LLMConfig(model='model', requests_per_minute=100))
+    assert client.rate_limiter is not None
+    messages = [Message(role='user', content='hello')]
+
+    await client._generate_response_with_rate_limit(messages)
+    assert client.rate_limiter.get_model_limiter('model').rate_scale == 1.0
+
+    error = RateLimitError()
+    error.__cause__ = ProviderError({'retry-after': '0'})
+    with (
+        patch.object(client, '_generate_response', AsyncMock(side_effect=error)),
+        pytest.raises(RateLimitError),
+    ):
+        await client._generate_response_with_rate_limit(messages)
+    assert client.rate_limiter.get_model_limiter('model').rate_scale == 0.5
+
+
+def test_rate_limiter_disabled_by_default():
+    assert MockLLMClient(LLMConfig()).rate_limiter is None
+
+
+@pytest.mark.asyncio
+async def test_limits_follow_headers_of_successful_responses():
+    raw_response = MagicMock(
+        headers={'x-ratelimit-limit-requests': '50', 'x-ratelimit-remaining-requests': '10'}
+    )
+    raw_response.parse.return_value = SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content='{"content": "test"}'))],
+        usage=None,
+    )
+    openai_client = MagicMock()
+    openai_client.chat.completions.with_raw_response.create = AsyncMock(return_value=raw_response)
+    client = OpenAIClient(
+        LLMConfig(api_key='test', model='model', requests_per_minute=100), client=openai_client
+    )
+
+    await client.generate_response([Message(role='user', content='hello')])
+
+    assert client.rate_limiter is not None
+    requests = client.rate_limiter.get_model_limiter('model').requests
+    assert requests is not None
+    assert requests.capacity == 50
+    assert requests.available == pytest.approx(10, abs=0.1)
+
+
+@pytest.mark.asyncio
+async def test_gemini_client_with_default_max_tokens_is_rate_limited():
+    with patch('google.genai.Client') as mock_client:
+        response = MagicMock(text='response', candidates=[], prompt_feedback=None)
+        mock_client.return_value.aio.models.generate_content = AsyncMock(return_value=response)
+        client = GeminiClient(
+            LLMConfig(
+                api_key='test', model='model', requests_per_minute=100, tokens_per_minute=1000
+            )
+        )
+
+    assert await client.generate_response([Message(role='user', content='hello')]) == {
+        'content': 'response'
+    }
+    assert client.rate_limiter is not None
+    tokens = client.rate_limiter.get_model_limiter('model').tokens
+    assert tokens is not None and tokens.available < 1000
@@ -0,0 +1,167 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from pydantic import BaseModel
+
+from graphiti_core.llm_client.client import LLMClient
+from graphiti_core.llm_client.config import LLMConfig
+from graphiti_core.llm_client.metrics import LLMCallMetrics
+from graphiti_core.llm_client.openai_base_client import BaseOpenAIClient
+from graphiti_core.llm_client.streaming import stream_list_items
+from graphiti_core.prompts.models import Message
+from graphiti_core.utils.concurrency import ConcurrencyGovernor, ConcurrencyPool
+
+
+class Item(BaseModel):
+    name: str
+    count: int
+
+
+class Items(BaseModel):
+    items: list[Item]
+
+
+class StaticLLMClient(LLMClient):
+    async def _generate_response(
+        self, messages, response_model=None, max_tokens=0, model_size=None
+    ):
+        return {'items': [{'name': 'a', 'count': 1}]}
+
+
+@pytest.mark.asyncio
+async def test_items_are_yielded_before_the_stream_ends():
+    consumed: list[str] = []
+
+    async def chunks():
+        for chunk in [
+            '{"items": [{"name": "a", ',
+            '"count": 1}',
+            ', {"name": "b", "count": 2}',
+            ']}',
+        ]:
+            consumed.append(chunk)
+            yield chunk
+
+    received: list[tuple[Item, int]] = []
+    async for item in stream_list_items(chunks(), 'items', Item):
+        received.append((item, len(consumed)))
+
+    # The first item is complete once the second one starts, before the last chunk is read
+    assert received == [(Item(name='a', count=1), 3), (Item(name='b', count=2), 4)]
+
+
+@pytest.mark.asyncio
+async def test_invalid_items_are_skipped():
+    async def chunks():
+        yield '{"items": [{"name": "a", "count": "many"}, '
+        yield '{"name": "b", "count": 2}]}'
+
+    items = [item async for item in stream_list_items(chunks(), 'items', Item)]
+
+    assert items == [Item(name='b', count=2)]
+
+
+@pytest.mark.asyncio
+async def test_clients_without_streaming_yield_the_whole_response():
+    client = StaticLLMClient(LLMConfig())
+    messages = [Message(role='system', content='system'), Message(role='user', content='list')]
+
+    chunks = [chunk async for chunk in client.generate_response_stream(messages, Items)]
+
+    assert [json.loads(chunk) for chunk in chunks] == [{'items': [{'name': 'a', 'count': 1}]}]
+
+
+@pytest.mark.asyncio
+async def test_truncated_stream_keeps_complete_items():
+    async def chunks():
+        yield '{"items": [{"name": "a", "count": 1}, '
+        yield '{"name": "b", "count": 2}, {"name": "c", "co'
+
+    items = [item async for item in stream_list_items(chunks(), 'items', Item)]
+
+    assert items == [Item(name='a', count=1), Item(name='b', count=2)]
+
+
+class NonStreamingOpenAIClient(BaseOpenAIClient):
+    async def _create_structured_completion(
+        self, model, messages, temperature, max_tokens, response_model
+    ):
+        raise NotImplementedError()
+
+    async def _create_completion(
+        self, model, messages, temperature, max_tokens, response_model=None
+    ):
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content='{"items": []}'))],
+            usage=None,
+        )
+
+
+@pytest.mark.asyncio
+async def test_openai_subclasses_without_streaming_fall_back_to_a_regular_call():
+    client = NonStreamingOpenAIClient(LLMConfig(api_key='test'))
+    messages = [Message(role='system', content='system'), Message(role='user', content='list')]
+
+    chunks = [chunk async for chunk in client.generate_response_stream(messages)]
+
+    assert [json.loads(chunk) for chunk in chunks] == [{'items': []}]
+
+
+class StreamingOpenAIClient(NonStreamingOpenAIClient):
+    def __init__(self, chunks: list[str]):
+        super().__init__(LLMConfig(api_key='test'))
+        self.chunks = chunks
+        self.response_models: list[type[BaseModel] | None] = []
+
+    async def _create_completion_stream(
+        self, model, messages, temperature, max_tokens, response_model=None
+    ):
+        self.response_models.append(response_model)
+        for content in self.chunks:
+            yield SimpleNamespace(
+                choices=[SimpleNamespace(delta=SimpleNamespace(content=content))], usage=None
+            )
+        yield SimpleNamespace(
+            choices=[], usage=SimpleNamespace(prompt_tokens=3, completion_tokens=4)
+        )
+
+
+@pytest.mark.asyncio
+async def test_stream_releases_the_llm_slot_before_the_consumer_finishes():
+    client = StreamingOpenAIClient(['{"items": [', '{"name": "a", "count": 1}', ']}'])
+    client.governor = ConcurrencyGovernor(llm_limit=1)
+    metrics: list[LLMCallMetrics] = []
+    client.call_observer = metrics.append
+    messages = [Message(role='system', content='system'), Message(role='user', content='list')]
+
+    stream = client.generate_response_stream(messages, Items)
+    first_chunk = await anext(stream)
+
+    # The consumer is still on its first chunk, while the provider stream has been read
+    async with asyncio.timeout(1):
+        async with client.governor.slot(ConcurrencyPool.llm):
+            pass
+    chunks = [first_chunk] + [chunk async for chunk in stream]
+
+    assert json.loads(''.join(chunks)) == {'items': [{'name': 'a', 'count': 1}]}
+    # The schema is enforced through structured output, and the call is observed
+    assert client.response_models == [Items]
+    assert [(m.input_tokens, m.output_tokens, m.error) for m in metrics] == [(3, 4, None)]
@@ -0,0 +1,56 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from graphiti_core.cross_encoder.client import CrossEncoderClient
+from graphiti_core.driver.driver import GraphDriver
+from graphiti_core.embedder import EmbedderClient
+from graphiti_core.graphiti import Graphiti
+from graphiti_core.llm_client import LLMClient
+
+
+@pytest.fixture
+def mock_session():
+    session = MagicMock()
+    session.run = AsyncMock()
+
+    async def execute_write(func, *args, **kwargs):
+        return await func(session, *args, **kwargs)
+
+    session.execute_write = AsyncMock(side_effect=execute_write)
+    session.__aenter__ = AsyncMock(return_value=session)
+    session.__aexit__ = AsyncMock(return_value=None)
+    return session
+
+
+@pytest.fixture
+def graphiti(mock_session):
+    driver = MagicMock(spec=GraphDriver)
+    driver.session.return_value = mock_session
+    return Graphiti(
+        graph_driver=driver,
+        llm_client=MagicMock(spec=LLMClient),
+        embedder=MagicMock(spec=EmbedderClient),
+        cross_encoder=MagicMock(spec=CrossEncoderClient),
+    )
+
+
+@pytest.mark.asyncio
+async def test_remove_episodes_runs_set_based_queries_in_one_transaction(graphiti, mock_session):
+    await graphiti.remove_episodes(['episode_1', 'episode_2'])
+
+    mock_session.execute_write.assert_awaited_once()
+    assert mock_session.run.await_count == 3
+    for call in mock_session.run.await_args_list:
+        assert call.kwargs == {'episode_uuids': ['episode_1', 'episode_2']}
+    queries = [call.args[0] for call in mock_session.run.await_args_list]
+    assert 'DELETE e' in queries[0]
+    assert 'other_mentions = 0' in queries[1]
+    assert 'DETACH DELETE episode' in queries[2]
+
+
+@pytest.mark.asyncio
+async def test_remove_episodes_with_no_uuids_is_a_no_op(graphiti, mock_session):
+    await graphiti.remove_episodes([])
+
+    mock_session.execute_write.assert_not_called()
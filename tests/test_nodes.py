@@ -0,0 +1,192 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from graphiti_core.cross_encoder.client import CrossEncoderClient
+from graphiti_core.driver.driver import GraphDriver
+from graphiti_core.embedder import EmbedderClient
+from graphiti_core.graphiti import Graphiti
+from graphiti_core.llm_client import LLMClient
+from graphiti_core.nodes import EpisodeType, EpisodicNode, get_deterministic_episode_uuid
+from graphiti_core.search.search_config import SearchResults
+from graphiti_core.utils.bulk_utils import RawEpisode
+from graphiti_core.utils.write_coalescer import BulkWriteCoalescer
+
+
+def test_deterministic_episode_uuid_is_content_addressed():
+    reference_time = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+    episode_uuid = get_deterministic_episode_uuid(
+        'group_1', EpisodeType.message, reference_time, 'Alice: hi'
+    )
+
+    assert episode_uuid == get_deterministic_episode_uuid(
+        'group_1', EpisodeType.message, reference_time, 'Alice: hi'
+    )
+    # Naive datetimes are treated as UTC and other timezones are normalized
+    assert episode_uuid == get_deterministic_episode_uuid(
+        'group_1', EpisodeType.message, datetime(2024, 1, 1, 12), 'Alice: hi'
+    )
+    assert episode_uuid == get_deterministic_episode_uuid(
+        'group_1',
+        EpisodeType.message,
+        reference_time.astimezone(timezone(timedelta(hours=2))),
+        'Alice: hi',
+    )
+
+    assert episode_uuid != get_deterministic_episode_uuid(
+        'group_2', EpisodeType.message, reference_time, 'Alice: hi'
+    )
+    assert episode_uuid != get_deterministic_episode_uuid(
+        'group_1', EpisodeType.text, reference_time, 'Alice: hi'
+    )
+    assert episode_uuid != get_deterministic_episode_uuid(
+        'group_1', EpisodeType.message, reference_time, 'Alice: hello'
+    )
+
+
+@pytest.mark.asyncio
+async def test_idempotent_add_episode_skips_ingested_episode():
+    llm_client = MagicMock(spec=LLMClient)
+    graphiti = Graphiti(
+        graph_driver=MagicMock(spec=GraphDriver),
+        llm_client=llm_client,
+        embedder=MagicMock(spec=EmbedderClient),
+        cross_encoder=MagicMock(spec=CrossEncoderClient),
+    )
+    reference_time = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    existing_episode = EpisodicNode(
+        uuid=get_deterministic_episode_uuid('group_1', EpisodeType.message, reference_time, 'hi'),
+        name='episode',
+        group_id='group_1',
+        source=EpisodeType.message,
+        source_description='test',
+        content='hi',
+        valid_at=reference_time,
+    )
+
+    with (
+        patch.object(
+            EpisodicNode, 'get_by_uuids', AsyncMock(return_value=[existing_episode])
+        ) as mock_get_by_uuids,
+        patch.object(
+            Graphiti, 'get_nodes_and_edges_by_episode', AsyncMock(return_value=SearchResults())
+        ),
+    ):
+        result = await graphiti.add_episode(
+            'episode',
+            'hi',
+            'test',
+            reference_time,
+            group_id='group_1',
+            idempotent=True,
+        )
+
+    mock_get_by_uuids.assert_awaited_once_with(graphiti.driver, [existing_episode.uuid])
+    llm_client.generate_response.assert_not_called()
+    assert result.episode is existing_episode
+
+
+@pytest.mark.asyncio
+async def test_idempotent_add_episode_bulk_retries_episodes_whose_extraction_failed():
+    graphiti = Graphiti(
+        graph_driver=MagicMock(spec=GraphDriver),
+        llm_client=MagicMock(spec=LLMClient),
+        embedder=MagicMock(spec=EmbedderClient),
+        cross_encoder=MagicMock(spec=CrossEncoderClient),
+    )
+    raw_episode = RawEpisode(
+        name='episode',
+        content='hi',
+        source_description='test',
+        source=EpisodeType.message,
+        reference_time=datetime(2024, 1, 1, tzinfo=timezone.utc),
+    )
+    stored_episodes: dict[str, EpisodicNode] = {}
+
+    async def get_by_uuids(driver, uuids):
+        return [stored_episodes[uuid] for uuid in uuids if uuid in stored_episodes]
+
+    async def add_nodes_and_edges_bulk(driver, episodic_nodes, *args):
+        stored_episodes.update({episode.uuid: episode for episode in episodic_nodes})
+
+    async def retrieve_previous_episodes_bulk(driver, episodes):
+        return [(episode, []) for episode in episodes]
+
+    async def dedupe_nodes_bulk(clients, extracted_nodes, episode_context, *args, **kwargs):
+        return {episode.uuid: [] for episode, _ in episode_context}, {}
+
+    async def dedupe_edges_bulk(clients, extracted_edges, episode_context, *args, **kwargs):
+        return {episode.uuid: [] for episode, _ in episode_context}
+
+    extract = AsyncMock(side_effect=[RuntimeError('extraction failed'), ([[]], [[]])])
+    with (
+        patch.object(EpisodicNode, 'get_by_uuids', get_by_uuids),
+        patch('graphiti_core.graphiti.add_nodes_and_edges_bulk', add_nodes_and_edges_bulk),
+        patch(
+            'graphiti_core.graphiti.retrieve_previous_episodes_bulk',
+            retrieve_previous_episodes_bulk,
+        ),
+        patch('graphiti_core.graphiti.extract_nodes_and_edges_bulk', extract),
+        patch('graphiti_core.graphiti.dedupe_nodes_bulk', dedupe_nodes_bulk),
+        patch('graphiti_core.graphiti.dedupe_edges_bulk', dedupe_edges_bulk),
+        patch(
+            'graphiti_core.graphiti.resolve_extracted_nodes', AsyncMock(return_value=([], {}, []))
+        ),
+        patch('graphiti_core.graphiti.extract_attributes_from_nodes', AsyncMock(return_value=[])),
+        patch('graphiti_core.graphiti.resolve_extracted_edges', AsyncMock(return_value=([], []))),
+    ):
+        with pytest.raises(RuntimeError):
+            await graphiti.add_episode_bulk([raw_episode], group_id='group_1', idempotent=True)
+        # The failed episode was not stored, so it is not skipped when it is redelivered
+        assert stored_episodes == {}
+
+        await graphiti.add_episode_bulk([raw_episode], group_id='group_1', idempotent=True)
+
+    assert extract.await_count == 2
+    assert list(stored_episodes) == [
+        get_deterministic_episode_uuid(
+            'group_1', EpisodeType.message, raw_episode.reference_time, 'hi'
+        )
+    ]
+
+
+@pytest.mark.asyncio
+async def test_idempotent_add_episode_flushes_buffered_writes_before_the_lookup():
+    graphiti = Graphiti(
+        graph_driver=MagicMock(spec=GraphDriver),
+        llm_client=MagicMock(spec=LLMClient),
+        embedder=MagicMock(spec=EmbedderClient),
+        cross_encoder=MagicMock(spec=CrossEncoderClient),
+        write_coalescer=BulkWriteCoalescer(MagicMock(), MagicMock()),
+    )
+    reference_time = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    buffered_episode = EpisodicNode(
+        uuid=get_deterministic_episode_uuid('group_1', EpisodeType.message, reference_time, 'hi'),
+        name='episode',
+        group_id='group_1',
+        source=EpisodeType.message,
+        source_description='test',
+        content='hi',
+        valid_at=reference_time,
+    )
+    stored_episodes: list[EpisodicNode] = []
+
+    async def flush(self):
+        stored_episodes.append(buffered_episode)
+
+    async def get_by_uuids(driver, uuids):
+        return list(stored_episodes)
+
+    with (
+        patch.object(BulkWriteCoalescer, 'flush', flush),
+        patch.object(EpisodicNode, 'get_by_uuids', get_by_uuids),
+        patch.object(
+            Graphiti, 'get_nodes_and_edges_by_episode', AsyncMock(return_value=SearchResults())
+        ),
+    ):
+        result = await graphiti.add_episode(
+            'episode', 'hi', 'test', reference_time, group_id='group_1', idempotent=True
+        )
+
+    assert result.episode is buffered_episode
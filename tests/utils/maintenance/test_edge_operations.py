@@ -1,10 +1,17 @@
+import asyncio
+import json
 from datetime import datetime, timedelta, timezone
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from graphiti_core.edges import EntityEdge
-from graphiti_core.nodes import EpisodicNode
+from graphiti_core.graphiti_types import GraphitiClients
+from graphiti_core.nodes import EntityNode, EpisodeType, EpisodicNode
+from graphiti_core.utils.maintenance.edge_operations import (
+    extract_and_resolve_edges_streaming,
+    resolve_extracted_edges_batch,
+)
 
 
 @pytest.fixture
@@ -89,6 +96,158 @@ def mock_previous_episodes():
     ]
 
 
+def _edge(name: str, fact: str) -> EntityEdge:
+    return EntityEdge(
+        source_node_uuid='source_uuid',
+        target_node_uuid='target_uuid',
+        name=name,
+        group_id='group_1',
+        fact=fact,
+        episodes=[],
+        created_at=datetime.now(timezone.utc),
+    )
+
+
+@pytest.mark.asyncio
+async def test_resolve_extracted_edges_batch(
+    mock_llm_client, mock_existing_edges, mock_current_episode
+):
+    extracted_edges = [_edge('edge_a', 'Fact A'), _edge('edge_b', 'Fact B')]
+    related_edges = [_edge('related_a', 'Fact A')]
+    mock_llm_client.generate_response = AsyncMock(
+        return_value={
+            'edge_duplicates': [
+                {'id': 1, 'duplicate_facts': [], 'contradicted_facts': [], 'fact_type': 'DEFAULT'},
+                {'id': 0, 'duplicate_facts': [0], 'contradicted_facts': [], 'fact_type': 'DEFAULT'},
+            ]
+        }
+    )
+
+    results = await resolve_extracted_edges_batch(
+        mock_llm_client,
+        extracted_edges,
+        [related_edges, []],
+        [[], mock_existing_edges],
+        mock_current_episode,
+        [{}, {}],
+    )
+
+    assert mock_llm_client.generate_response.call_count == 1
+    assert results[0][0] is related_edges[0]
+    assert results[0][2] == related_edges
+    assert mock_current_episode.uuid in related_edges[0].episodes
+    assert results[1][0] is extracted_edges[1]
+    assert results[1][1] == []
+
+
+@pytest.mark.asyncio
+async def test_resolve_extracted_edges_batch_falls_back_for_missing_edges(
+    mock_llm_client, mock_existing_edges, mock_current_episode
+):
+    extracted_edges = [_edge('edge_a', 'Fact A'), _edge('edge_b', 'Fact B')]
+    mock_llm_client.generate_response = AsyncMock(
+        side_effect=[
+            {
+                'edge_duplicates': [
+                    {
+                        'id': 0,
+                        'duplicate_facts': [],
+                        'contradicted_facts': [],
+                        'fact_type': 'DEFAULT',
+                    }
+                ]
+            },
+            {'duplicate_facts': [], 'contradicted_facts': [], 'fact_type': 'DEFAULT'},
+        ]
+    )
+
+    results = await resolve_extracted_edges_batch(
+        mock_llm_client,
+        extracted_edges,
+        [[], []],
+        [mock_existing_edges, mock_existing_edges],
+        mock_current_episode,
+        [{}, {}],
+    )
+
+    assert mock_llm_client.generate_response.call_count == 2
+    assert [result[0] for result in results] == extracted_edges
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    'batch_size, resolved_batch_sizes',
+    [
+        # The first two edges are resolved while the stream is running, the last one at the end
+        (2, [2, 1]),
+        # By default streamed edges are resolved in batches, not one by one
+        (None, [3]),
+    ],
+)
+async def test_streamed_edges_are_resolved_against_resolved_nodes(batch_size, resolved_batch_sizes):
+    extracted_nodes = [
+        EntityNode(name=f'Node {i}', labels=['Entity'], group_id='group_1') for i in range(2)
+    ]
+    resolved_nodes = [
+        EntityNode(name=f'Node {i}', labels=['Entity'], group_id='group_1') for i in range(2)
+    ]
+    uuid_map = {
+        extracted.uuid: resolved.uuid
+        for extracted, resolved in zip(extracted_nodes, resolved_nodes, strict=True)
+    }
+    node_resolution: asyncio.Future = asyncio.get_running_loop().create_future()
+
+    edges = [
+        {'relation_type': 'KNOWS', 'source_entity_id': 0, 'target_entity_id': 1, 'fact': f'f{i}'}
+        for i in range(3)
+    ]
+
+    async def generate_response_stream(messages, response_model=None, max_tokens=None):
+        yield '{"edges": [' + json.dumps(edges[0])
+        node_resolution.set_result((resolved_nodes, uuid_map, []))
+        for edge in edges[1:]:
+            yield ', ' + json.dumps(edge)
+        yield ']}'
+
+    llm_client = MagicMock()
+    llm_client.generate_response_stream = generate_response_stream
+    clients = GraphitiClients.model_construct(
+        driver=MagicMock(), llm_client=llm_client, embedder=MagicMock(), cross_encoder=MagicMock()
+    )
+    episode = EpisodicNode(
+        name='episode',
+        group_id='group_1',
+        source=EpisodeType.message,
+        source_description='test',
+        content='content',
+        valid_at=datetime.now(timezone.utc),
+    )
+
+    async def resolve(clients, edges, *args):
+        return edges, []
+
+    with patch(
+        'graphiti_core.utils.maintenance.edge_operations.resolve_extracted_edges',
+        side_effect=resolve,
+    ) as mock_resolve:
+        resolved_edges, invalidated_edges = await extract_and_resolve_edges_streaming(
+            clients,
+            episode,
+            extracted_nodes,
+            [],
+            node_resolution,
+            {},
+            'group_1',
+            batch_size=batch_size,
+        )
+
+    assert [edge.fact for edge in resolved_edges] == ['f0', 'f1', 'f2']
+    assert invalidated_edges == []
+    assert all(edge.source_node_uuid == resolved_nodes[0].uuid for edge in resolved_edges)
+    assert all(edge.target_node_uuid == resolved_nodes[1].uuid for edge in resolved_edges)
+    assert [len(call.args[1]) for call in mock_resolve.call_args_list] == resolved_batch_sizes
+
+
 # Run the tests
 if __name__ == '__main__':
     pytest.main([__file__])
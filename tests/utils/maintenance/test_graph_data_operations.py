@@ -0,0 +1,128 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from graphiti_core.driver.driver import GraphProvider
+from graphiti_core.nodes import EpisodeType, EpisodicNode
+from graphiti_core.utils.bulk_utils import retrieve_previous_episodes_bulk
+from graphiti_core.utils.maintenance.graph_data_operations import retrieve_episode_windows
+
+BASE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _episode(hour: int) -> EpisodicNode:
+    return EpisodicNode(
+        name=f'episode {hour}',
+        group_id='group_1',
+        source=EpisodeType.message,
+        source_description='test',
+        content=f'content {hour}',
+        valid_at=BASE_TIME + timedelta(hours=hour),
+        created_at=BASE_TIME,
+    )
+
+
+def _record(episode: EpisodicNode) -> dict:
+    return {
+        'content': episode.content,
+        'created_at': episode.created_at.isoformat(),
+        'valid_at': episode.valid_at.isoformat(),
+        'uuid': episode.uuid,
+        'name': episode.name,
+        'group_id': episode.group_id,
+        'source_description': episode.source_description,
+        'source': episode.source.value,
+        'entity_edges': [],
+    }
+
+
+@pytest.mark.asyncio
+async def test_retrieve_episode_windows_uses_a_single_query():
+    episodes = [_episode(0), _episode(1), _episode(2)]
+    driver = MagicMock()
+    driver.provider = GraphProvider.NEO4J
+    driver.execute_query = AsyncMock(
+        return_value=(
+            [
+                {'episode_uuid': episodes[0].uuid, 'previous_episodes': [_record(episodes[0])]},
+                {
+                    'episode_uuid': episodes[2].uuid,
+                    'previous_episodes': [_record(episodes[2]), _record(episodes[1])],
+                },
+            ],
+            None,
+            None,
+        )
+    )
+
+    windows = await retrieve_episode_windows(driver, episodes, last_n=2)
+
+    driver.execute_query.assert_awaited_once()
+    assert driver.execute_query.await_args.kwargs['num_episodes'] == 2
+    # Each episode's window is limited inside a subquery instead of collecting the whole group
+    assert 'LIMIT $num_episodes' in driver.execute_query.await_args.args[0]
+    assert [[episode.uuid for episode in window] for window in windows] == [
+        [episodes[0].uuid],
+        [],
+        [episodes[1].uuid, episodes[2].uuid],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_retrieve_episode_windows_on_falkordb_queries_each_episode():
+    episodes = [_episode(0), _episode(1)]
+    driver = MagicMock()
+    driver.provider = GraphProvider.FALKORDB
+    driver.execute_query = AsyncMock(
+        side_effect=[([_record(episodes[0])], None, None), ([_record(episodes[1])], None, None)]
+    )
+
+    windows = await retrieve_episode_windows(driver, episodes, last_n=2)
+
+    assert driver.execute_query.await_count == 2
+    assert all('CALL' not in call.args[0] for call in driver.execute_query.await_args_list)
+    assert [call.kwargs['reference_time'] for call in driver.execute_query.await_args_list] == [
+        episode.valid_at for episode in episodes
+    ]
+    assert [[episode.uuid for episode in window] for window in windows] == [
+        [episodes[0].uuid],
+        [episodes[1].uuid],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_retrieve_episode_windows_without_episodes_skips_query():
+    driver = MagicMock()
+    driver.execute_query = AsyncMock()
+
+    assert await retrieve_episode_windows(driver, []) == []
+    driver.execute_query.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_previous_episodes_bulk_include_unsaved_batch_episodes():
+    stored = _episode(0)
+    batch = [_episode(2), _episode(1)]
+    driver = MagicMock()
+    driver.provider = GraphProvider.NEO4J
+    driver.execute_query = AsyncMock(
+        return_value=(
+            [
+                {'episode_uuid': episode.uuid, 'previous_episodes': [_record(stored)]}
+                for episode in batch
+            ],
+            None,
+            None,
+        )
+    )
+
+    episode_context = await retrieve_previous_episodes_bulk(driver, batch)
+
+    assert [
+        (episode.uuid, [previous.uuid for previous in previous_episodes])
+        for episode, previous_episodes in episode_context
+    ] == [
+        (batch[0].uuid, [stored.uuid, batch[1].uuid, batch[0].uuid]),
+        (batch[1].uuid, [stored.uuid, batch[1].uuid]),
+    ]
@@ -0,0 +1,421 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pydantic import BaseModel, Field
+
+from graphiti_core.errors import EntityTypeValidationError
+from graphiti_core.graphiti_types import GraphitiClients
+from graphiti_core.nodes import EntityNode, EpisodeType, EpisodicNode
+from graphiti_core.utils.datetime_utils import utc_now
+from graphiti_core.utils.maintenance.node_operations import (
+    _get_attributes_model,
+    extract_attributes_from_nodes,
+    extract_nodes_and_edges,
+    extract_nodes_and_edges_from_chunks,
+    resolve_extracted_nodes,
+)
+from graphiti_core.utils.ontology_utils.entity_types_utils import validate_entity_types
+
+
+class Person(BaseModel):
+    """A human person"""
+
+    occupation: str | None = Field(None, description='Occupation of the person')
+
+
+@pytest.fixture
+def mock_clients():
+    llm_client = MagicMock()
+    llm_client.generate_response = AsyncMock()
+    return GraphitiClients.model_construct(
+        driver=MagicMock(), llm_client=llm_client, embedder=MagicMock(), cross_encoder=MagicMock()
+    )
+
+
+def _nodes(count: int, labels: list[str]) -> list[EntityNode]:
+    return [EntityNode(name=f'Node {i}', labels=labels, group_id='group_1') for i in range(count)]
+
+
+@pytest.mark.asyncio
+async def test_extract_attributes_batches_nodes_by_entity_type(mock_clients):
+    people = _nodes(3, ['Entity', 'Person'])
+    others = _nodes(2, ['Entity'])
+
+    async def generate_response(messages, response_model=None, max_tokens=None, model_size=None):
+        entity_ids = range(3) if 'Person' in messages[1].content else range(2)
+        return {
+            'entity_attributes': [
+                {'entity_id': i, 'summary': f'summary {i}', 'occupation': 'engineer'}
+                if 'Person' in messages[1].content
+                else {'entity_id': i, 'summary': f'summary {i}'}
+                for i in entity_ids
+            ]
+        }
+
+    mock_clients.llm_client.generate_response.side_effect = generate_response
+
+    with patch(
+        'graphiti_core.utils.maintenance.node_operations.create_entity_node_embeddings'
+    ) as mock_embeddings:
+        result = await extract_attributes_from_nodes(
+            mock_clients, people + others, entity_types={'Person': Person}, batch_size=5
+        )
+
+    assert mock_clients.llm_client.generate_response.call_count == 2
+    assert result == people + others
+    assert [node.summary for node in people] == ['summary 0', 'summary 1', 'summary 2']
+    assert all(node.attributes == {'occupation': 'engineer'} for node in people)
+    assert [node.summary for node in others] == ['summary 0', 'summary 1']
+    assert all(node.attributes == {} for node in others)
+    mock_embeddings.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_extract_attributes_batch_falls_back_for_missing_nodes(mock_clients):
+    nodes = _nodes(3, ['Entity'])
+
+    mock_clients.llm_client.generate_response.side_effect = [
+        {'entity_attributes': [{'entity_id': 0, 'summary': 'batched'}]},
+        {'summary': 'single'},
+        {'summary': 'single'},
+    ]
+
+    with patch('graphiti_core.utils.maintenance.node_operations.create_entity_node_embeddings'):
+        await extract_attributes_from_nodes(mock_clients, nodes, batch_size=3)
+
+    assert mock_clients.llm_client.generate_response.call_count == 3
+    assert [node.summary for node in nodes] == ['batched', 'single', 'single']
+
+
+@pytest.mark.asyncio
+async def test_extract_attributes_respects_batch_size(mock_clients):
+    nodes = _nodes(5, ['Entity'])
+
+    async def generate_response(messages, response_model=None, max_tokens=None, model_size=None):
+        if 'entity_attributes' not in response_model.model_fields:
+            return {'summary': 'single'}
+        return {
+            'entity_attributes': [
+                {'entity_id': i, 'summary': 'batched'}
+                for i in range(messages[1].content.count('"entity_id"'))
+            ]
+        }
+
+    mock_clients.llm_client.generate_response.side_effect = generate_response
+
+    with patch('graphiti_core.utils.maintenance.node_operations.create_entity_node_embeddings'):
+        await extract_attributes_from_nodes(mock_clients, nodes, batch_size=2)
+
+    # Two full batches and one single node; the latter uses the single node prompt
+    assert mock_clients.llm_client.generate_response.call_count == 3
+    assert [node.summary for node in nodes] == ['batched'] * 4 + ['single']
+
+
+@pytest.fixture
+def mock_search():
+    with (
+        patch(
+            'graphiti_core.utils.maintenance.node_operations.get_relevant_nodes',
+            AsyncMock(side_effect=lambda driver, nodes, search_filter: [[] for _ in nodes]),
+        ),
+        patch(
+            'graphiti_core.utils.maintenance.node_operations.filter_existing_duplicate_of_edges',
+            AsyncMock(side_effect=lambda driver, duplicates: duplicates),
+        ),
+    ):
+        yield
+
+
+@pytest.mark.asyncio
+async def test_resolve_extracted_nodes_matches_names_without_llm(mock_clients, mock_search):
+    existing = EntityNode(name='Alice  Smith', labels=['Entity', 'Person'], group_id='group_1')
+    extracted = EntityNode(name='alice smith', labels=['Person', 'Entity'], group_id='group_1')
+
+    resolved_nodes, uuid_map, duplicates = await resolve_extracted_nodes(
+        mock_clients, [extracted], existing_nodes_override=[existing]
+    )
+
+    mock_clients.llm_client.generate_response.assert_not_called()
+    assert resolved_nodes == [existing]
+    assert uuid_map == {extracted.uuid: existing.uuid}
+    assert duplicates == [(extracted, existing)]
+
+
+@pytest.mark.asyncio
+async def test_resolve_extracted_nodes_matches_embeddings_without_llm(mock_clients, mock_search):
+    existing = EntityNode(
+        name='Bob', labels=['Entity'], group_id='group_1', name_embedding=[1.0, 0.0]
+    )
+    extracted = EntityNode(
+        name='Robert', labels=['Entity'], group_id='group_1', name_embedding=[0.99, 0.01]
+    )
+
+    resolved_nodes, uuid_map, _ = await resolve_extracted_nodes(
+        mock_clients, [extracted], existing_nodes_override=[existing], similarity_threshold=0.9
+    )
+
+    mock_clients.llm_client.generate_response.assert_not_called()
+    assert resolved_nodes == [existing]
+    assert uuid_map == {extracted.uuid: existing.uuid}
+
+
+@pytest.mark.asyncio
+async def test_resolve_extracted_nodes_sends_ambiguous_nodes_to_llm(mock_clients, mock_search):
+    existing = [
+        EntityNode(name='Alice', labels=['Entity'], group_id='group_1'),
+        EntityNode(name='Bob', labels=['Entity', 'Person'], group_id='group_1'),
+    ]
+    # Same name but different labels is not resolved locally
+    bob = EntityNode(name='Bob', labels=['Entity'], group_id='group_1')
+    alice = EntityNode(name='Alice', labels=['Entity'], group_id='group_1')
+    carol = EntityNode(name='Carol', labels=['Entity'], group_id='group_1')
+
+    mock_clients.llm_client.generate_response.return_value = {
+        'entity_resolutions': [
+            {'id': 0, 'name': 'Bob', 'duplicate_idx': 1, 'duplicates': []},
+            {'id': 1, 'name': 'Carol', 'duplicate_idx': -1, 'duplicates': []},
+        ]
+    }
+
+    resolved_nodes, uuid_map, _ = await resolve_extracted_nodes(
+        mock_clients, [bob, alice, carol], existing_nodes_override=existing
+    )
+
+    mock_clients.llm_client.generate_response.assert_called_once()
+    prompt = mock_clients.llm_client.generate_response.call_args[0][0][1].content
+    entities = prompt.split('<ENTITIES>')[1].split('</ENTITIES>')[0]
+    assert '"Bob"' in entities and '"Carol"' in entities and '"Alice"' not in entities
+    assert resolved_nodes == [existing[1], existing[0], carol]
+    assert uuid_map == {
+        bob.uuid: existing[1].uuid,
+        alice.uuid: existing[0].uuid,
+        carol.uuid: carol.uuid,
+    }
+
+
+@pytest.mark.asyncio
+async def test_resolve_extracted_nodes_fetches_candidates_in_one_query_per_group(
+    mock_clients, mock_search
+):
+    existing = EntityNode(name='Alice', labels=['Entity'], group_id='group_1')
+    extracted = [
+        EntityNode(name='alice', labels=['Entity'], group_id='group_1'),
+        EntityNode(name='Bob', labels=['Entity'], group_id='group_1', name_embedding=[1.0]),
+        EntityNode(name='Carol', labels=['Entity'], group_id='group_2'),
+    ]
+    mock_clients.llm_client.generate_response.return_value = {
+        'entity_resolutions': [
+            {'id': 0, 'name': 'Bob', 'duplicate_idx': -1, 'duplicates': []},
+            {'id': 1, 'name': 'Carol', 'duplicate_idx': -1, 'duplicates': []},
+        ]
+    }
+
+    with (
+        patch(
+            'graphiti_core.utils.maintenance.node_operations.create_entity_node_embeddings'
+        ) as mock_embeddings,
+        patch(
+            'graphiti_core.utils.maintenance.node_operations.get_relevant_nodes',
+            AsyncMock(side_effect=[[[existing], []], [[]]]),
+        ) as mock_relevant_nodes,
+    ):
+        resolved_nodes, _, _ = await resolve_extracted_nodes(mock_clients, extracted)
+
+    # Only nodes without an embedding are embedded, in a single batch
+    mock_embeddings.assert_awaited_once_with(mock_clients.embedder, [extracted[0], extracted[2]])
+    assert mock_relevant_nodes.await_count == 2
+    assert [call.args[1] for call in mock_relevant_nodes.await_args_list] == [
+        extracted[:2],
+        extracted[2:],
+    ]
+    assert resolved_nodes == [existing, extracted[1], extracted[2]]
+
+
+def _episode() -> EpisodicNode:
+    return EpisodicNode(
+        name='episode',
+        group_id='group_1',
+        source=EpisodeType.message,
+        source_description='chat',
+        content='Alice: I work at Acme with Bob.',
+        valid_at=utc_now(),
+    )
+
+
+@pytest.mark.asyncio
+async def test_extract_nodes_and_edges_uses_single_llm_call(mock_clients):
+    mock_clients.llm_client.generate_response.return_value = {
+        'extracted_entities': [
+            {'name': 'Alice', 'entity_type_id': 1},
+            {'name': 'Acme', 'entity_type_id': 0},
+            {'name': 'Bob', 'entity_type_id': 1},
+        ],
+        'edges': [
+            {
+                'relation_type': 'WORKS_AT',
+                'source_entity_id': 0,
+                'target_entity_id': 1,
+                'fact': 'Alice works at Acme',
+            },
+            {
+                'relation_type': 'WORKS_WITH',
+                'source_entity_id': 0,
+                'target_entity_id': 2,
+                'fact': 'Alice works with Bob',
+            },
+        ],
+    }
+
+    nodes, edges = await extract_nodes_and_edges(
+        mock_clients,
+        _episode(),
+        [],
+        {('Entity', 'Entity'): []},
+        entity_types={'Person': Person},
+    )
+
+    mock_clients.llm_client.generate_response.assert_awaited_once()
+    assert [node.name for node in nodes] == ['Alice', 'Acme', 'Bob']
+    assert 'Person' in nodes[0].labels
+    assert [(edge.source_node_uuid, edge.target_node_uuid) for edge in edges] == [
+        (nodes[0].uuid, nodes[1].uuid),
+        (nodes[0].uuid, nodes[2].uuid),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_extract_nodes_and_edges_drops_edges_of_excluded_entities(mock_clients):
+    mock_clients.llm_client.generate_response.return_value = {
+        'extracted_entities': [
+            {'name': 'Alice', 'entity_type_id': 1},
+            {'name': '', 'entity_type_id': 0},
+            {'name': 'Acme', 'entity_type_id': 0},
+            {'name': 'Bob', 'entity_type_id': 1},
+        ],
+        'edges': [
+            {
+                'relation_type': 'WORKS_AT',
+                'source_entity_id': 3,
+                'target_entity_id': 2,
+                'fact': 'Bob works at Acme',
+            },
+            {
+                'relation_type': 'KNOWS',
+                'source_entity_id': 1,
+                'target_entity_id': 3,
+                'fact': 'Someone knows Bob',
+            },
+            {
+                'relation_type': 'KNOWS',
+                'source_entity_id': 0,
+                'target_entity_id': 7,
+                'fact': 'Alice knows someone',
+            },
+        ],
+    }
+
+    nodes, edges = await extract_nodes_and_edges(
+        mock_clients,
+        _episode(),
+        [],
+        {('Entity', 'Entity'): []},
+        entity_types={'Person': Person},
+        excluded_entity_types=['Entity'],
+    )
+
+    assert [node.name for node in nodes] == ['Alice', 'Bob']
+    assert edges == []
+
+
+@pytest.mark.asyncio
+async def test_extract_nodes_and_edges_from_chunks_merges_entities(mock_clients):
+    async def generate_response(messages, response_model=None, **kwargs):
+        content = messages[1].content
+        if 'first chunk' in content:
+            return {
+                'extracted_entities': [
+                    {'name': 'Alice', 'entity_type_id': 0},
+                    {'name': 'Acme', 'entity_type_id': 0},
+                ],
+                'edges': [
+                    {
+                        'relation_type': 'WORKS_AT',
+                        'source_entity_id': 0,
+                        'target_entity_id': 1,
+                        'fact': 'Alice works at Acme',
+                    }
+                ],
+            }
+        return {
+            'extracted_entities': [
+                {'name': 'alice', 'entity_type_id': 0},
+                {'name': 'Acme', 'entity_type_id': 0},
+                {'name': 'Bob', 'entity_type_id': 0},
+            ],
+            'edges': [
+                {
+                    'relation_type': 'WORKS_AT',
+                    'source_entity_id': 0,
+                    'target_entity_id': 1,
+                    'fact': 'Alice works at  Acme',
+                },
+                {
+                    'relation_type': 'MANAGES',
+                    'source_entity_id': 2,
+                    'target_entity_id': 0,
+                    'fact': 'Bob manages Alice',
+                },
+            ],
+        }
+
+    mock_clients.llm_client.generate_response.side_effect = generate_response
+
+    nodes, edges = await extract_nodes_and_edges_from_chunks(
+        mock_clients,
+        _episode(),
+        ['first chunk', 'second chunk'],
+        [],
+        {('Entity', 'Entity'): []},
+        combined_extraction=True,
+    )
+
+    assert mock_clients.llm_client.generate_response.await_count == 2
+    assert [node.name for node in nodes] == ['Alice', 'Acme', 'Bob']
+    alice, acme, bob = nodes
+    assert [(edge.name, edge.source_node_uuid, edge.target_node_uuid) for edge in edges] == [
+        ('WORKS_AT', alice.uuid, acme.uuid),
+        ('MANAGES', bob.uuid, alice.uuid),
+    ]
+
+
+def test_attributes_models_are_reused_per_entity_type_fields():
+    class Employee(BaseModel):
+        occupation: str | None = Field(None, description='Occupation of the person')
+
+    model = _get_attributes_model(Person)
+
+    assert _get_attributes_model(Person) is model
+    assert _get_attributes_model(Employee) is model
+    assert _get_attributes_model(None) is not model
+    assert _get_attributes_model(Person, batch=True) is _get_attributes_model(Person, batch=True)
+    assert set(model.model_fields) == {'summary', 'occupation'}
+
+
+@pytest.mark.asyncio
+async def test_entity_types_with_an_entity_id_field_are_extracted_node_by_node(mock_clients):
+    class Ticket(BaseModel):
+        entity_id: int | None = Field(None, description='Id of the ticket in the tracker')
+
+    nodes = _nodes(2, ['Entity', 'Ticket'])
+    mock_clients.llm_client.generate_response.return_value = {'summary': 'single', 'entity_id': 7}
+
+    assert validate_entity_types({'Ticket': Ticket})
+    with patch('graphiti_core.utils.maintenance.node_operations.create_entity_node_embeddings'):
+        await extract_attributes_from_nodes(
+            mock_clients, nodes, entity_types={'Ticket': Ticket}, batch_size=2
+        )
+
+    assert mock_clients.llm_client.generate_response.call_count == 2
+    assert all(node.attributes == {'entity_id': 7} for node in nodes)
+    with pytest.raises(EntityTypeValidationError):
+        _get_attributes_model(Ticket, batch=True)
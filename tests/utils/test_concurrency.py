@@ -0,0 +1,93 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+
+import pytest
+
+from graphiti_core.embedder.client import EmbedderClient
+from graphiti_core.utils.concurrency import ConcurrencyGovernor, ConcurrencyPool, governed
+
+
+class InFlightCounter:
+    def __init__(self):
+        self.current = 0
+        self.peak = 0
+
+    async def run(self):
+        self.current += 1
+        self.peak = max(self.peak, self.current)
+        await asyncio.sleep(0.01)
+        self.current -= 1
+
+
+class CountingEmbedder(EmbedderClient):
+    def __init__(self, counter: InFlightCounter):
+        self.counter = counter
+
+    @governed(ConcurrencyPool.embedder)
+    async def create(self, input_data):
+        await self.counter.run()
+        return [0.0]
+
+
+async def _run_in_slot(governor: ConcurrencyGovernor, pool: ConcurrencyPool, counter):
+    async with governor.slot(pool):
+        await counter.run()
+
+
+@pytest.mark.asyncio
+async def test_pools_are_bounded_independently():
+    governor = ConcurrencyGovernor(llm_limit=2, embedder_limit=3, reranker_limit=1, db_limit=1)
+    llm_counter = InFlightCounter()
+    embedder_counter = InFlightCounter()
+
+    await asyncio.gather(
+        *[_run_in_slot(governor, ConcurrencyPool.llm, llm_counter) for _ in range(10)],
+        *[_run_in_slot(governor, ConcurrencyPool.embedder, embedder_counter) for _ in range(10)],
+    )
+
+    assert llm_counter.peak == 2
+    assert embedder_counter.peak == 3
+
+
+@pytest.mark.asyncio
+async def test_total_limit_caps_all_pools():
+    governor = ConcurrencyGovernor(
+        llm_limit=5, embedder_limit=5, reranker_limit=5, db_limit=5, total_limit=3
+    )
+    counter = InFlightCounter()
+
+    await asyncio.gather(
+        *[_run_in_slot(governor, pool, counter) for pool in ConcurrencyPool for _ in range(5)]
+    )
+
+    assert counter.peak == 3
+
+
+@pytest.mark.asyncio
+async def test_governed_client_uses_its_governor():
+    counter = InFlightCounter()
+    embedder = CountingEmbedder(counter)
+
+    # Without a governor, calls are not limited
+    await asyncio.gather(*[embedder.create('text') for _ in range(5)])
+    assert counter.peak == 5
+
+    counter.peak = 0
+    embedder.governor = ConcurrencyGovernor(embedder_limit=2)
+    await asyncio.gather(*[embedder.create('text') for _ in range(5)])
+    assert counter.peak == 2
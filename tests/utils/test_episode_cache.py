@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from graphiti_core.nodes import EpisodeType, EpisodicNode
+from graphiti_core.utils.episode_cache import RecentEpisodeCache
+
+BASE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _episode(hour: int, group_id: str = 'group_1') -> EpisodicNode:
+    return EpisodicNode(
+        name=f'episode {hour}',
+        group_id=group_id,
+        source=EpisodeType.message,
+        source_description='test',
+        content=f'content {hour}',
+        valid_at=BASE_TIME + timedelta(hours=hour),
+    )
+
+
+@pytest.fixture
+def mock_retrieve_episodes():
+    with patch(
+        'graphiti_core.utils.episode_cache.retrieve_episodes', AsyncMock()
+    ) as mock_retrieve_episodes:
+        yield mock_retrieve_episodes
+
+
+@pytest.mark.asyncio
+async def test_serves_recent_episodes_from_memory(mock_retrieve_episodes):
+    driver = MagicMock()
+    cache = RecentEpisodeCache(capacity=3)
+    mock_retrieve_episodes.return_value = [_episode(0), _episode(1)]
+
+    episodes = await cache.retrieve_episodes(
+        driver, BASE_TIME + timedelta(hours=5), 3, ['group_1'], EpisodeType.message
+    )
+    assert [episode.name for episode in episodes] == ['episode 0', 'episode 1']
+    assert mock_retrieve_episodes.await_count == 1
+
+    cache.add_episodes([_episode(2), _episode(3)])
+
+    episodes = await cache.retrieve_episodes(
+        driver, BASE_TIME + timedelta(hours=5), 2, ['group_1'], EpisodeType.message
+    )
+    assert [episode.name for episode in episodes] == ['episode 2', 'episode 3']
+
+    # The window is full, but the first episode is still held so no query is needed
+    episodes = await cache.retrieve_episodes(
+        driver, BASE_TIME + timedelta(hours=2), 2, ['group_1'], EpisodeType.message
+    )
+    assert [episode.name for episode in episodes] == ['episode 1', 'episode 2']
+    assert mock_retrieve_episodes.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_graph_for_older_reference_times(mock_retrieve_episodes):
+    driver = MagicMock()
+    cache = RecentEpisodeCache(capacity=2)
+    mock_retrieve_episodes.return_value = [_episode(5), _episode(6)]
+
+    await cache.retrieve_episodes(driver, BASE_TIME + timedelta(hours=7), 2, ['group_1'])
+    await cache.retrieve_episodes(driver, BASE_TIME + timedelta(hours=5), 2, ['group_1'])
+
+    # The window is truncated, so episodes older than hour 5 may exist in the graph
+    assert mock_retrieve_episodes.await_count == 2
+    assert mock_retrieve_episodes.await_args.args[1] == BASE_TIME + timedelta(hours=5)
+
+
+@pytest.mark.asyncio
+async def test_removed_episodes_invalidate_windows(mock_retrieve_episodes):
+    driver = MagicMock()
+    cache = RecentEpisodeCache(capacity=3)
+    episode = _episode(1)
+    mock_retrieve_episodes.return_value = [episode]
+
+    await cache.retrieve_episodes(driver, BASE_TIME + timedelta(hours=2), 3, ['group_1'])
+    cache.remove_episodes([episode.uuid])
+    mock_retrieve_episodes.return_value = []
+    episodes = await cache.retrieve_episodes(driver, BASE_TIME + timedelta(hours=2), 3, ['group_1'])
+
+    assert episodes == []
+    assert mock_retrieve_episodes.await_count == 2
@@ -0,0 +1,158 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+
+import pytest
+
+from graphiti_core.embedder.client import EmbedderClient
+from graphiti_core.llm_client.client import LLMClient
+from graphiti_core.llm_client.config import LLMConfig
+from graphiti_core.prompts.models import Message
+from graphiti_core.utils.concurrency import ConcurrencyGovernor, ConcurrencyPool
+from graphiti_core.utils.hedging import HedgingPolicy, hedged
+
+
+class SlowFirstRequest:
+    """Sleeps for the given durations, one per call, and records cancelled calls."""
+
+    def __init__(self, durations: list[float], error_on_first: bool = False):
+        self.durations = durations
+        self.error_on_first = error_on_first
+        self.calls = 0
+        self.cancelled = 0
+
+    async def __call__(self) -> int:
+        call = self.calls
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.durations[call])
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if call == 0 and self.error_on_first:
+            raise ValueError('first call failed')
+        return call
+
+
+def _warmed_up_policy(key: str, **kwargs) -> HedgingPolicy:
+    policy = HedgingPolicy(min_samples=5, min_delay=0.01, max_hedge_rate=0.5, **kwargs)
+    for _ in range(5):
+        policy.record_latency(key, 0.01)
+    policy.requests = 5
+    return policy
+
+
+@pytest.mark.asyncio
+async def test_slow_request_is_hedged_and_loser_cancelled():
+    policy = _warmed_up_policy('prompt')
+    request = SlowFirstRequest([1.0, 0.01])
+
+    assert await policy.run('prompt', request) == 1
+    assert request.calls == 2
+    # Let the cancellation of the slow request run
+    await asyncio.sleep(0)
+    assert request.cancelled == 1
+    assert policy.hedges == 1
+    # Only the winner's latency is recorded, the cancelled loser's is cut short
+    assert len(policy._latencies['prompt']) == 5 + 1
+
+
+@pytest.mark.asyncio
+async def test_time_waiting_for_a_slot_does_not_trigger_hedges():
+    policy = _warmed_up_policy('prompt')
+    governor = ConcurrencyGovernor(llm_limit=1)
+    request = SlowFirstRequest([0.01, 0.01])
+
+    async def occupy_slot():
+        async with governor.slot(ConcurrencyPool.llm):
+            await asyncio.sleep(0.1)
+
+    occupant = asyncio.create_task(occupy_slot())
+    await asyncio.sleep(0)
+
+    assert await policy.run('prompt', request, lambda: governor.slot(ConcurrencyPool.llm)) == 0
+    assert request.calls == 1
+    assert policy.hedges == 0
+    assert max(policy._latencies['prompt']) < 0.1
+    await occupant
+
+
+@pytest.mark.asyncio
+async def test_no_hedging_without_samples_or_budget():
+    policy = HedgingPolicy(min_samples=5, min_delay=0.01)
+    request = SlowFirstRequest([0.05, 0.01])
+    assert await policy.run('prompt', request) == 0
+    assert request.calls == 1
+
+    policy = _warmed_up_policy('prompt')
+    policy.max_hedge_rate = 0.1
+    request = SlowFirstRequest([0.05, 0.01])
+    assert await policy.run('prompt', request) == 0
+    assert request.calls == 1
+    assert policy.hedges == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_request_waits_for_hedge():
+    policy = _warmed_up_policy('prompt')
+    request = SlowFirstRequest([0.05, 0.1], error_on_first=True)
+
+    assert await policy.run('prompt', request) == 1
+
+    # Without a hedge in flight, the error is raised
+    policy = HedgingPolicy()
+    request = SlowFirstRequest([0.0], error_on_first=True)
+    with pytest.raises(ValueError):
+        await policy.run('prompt', request)
+
+
+class HedgedLLMClient(LLMClient):
+    def __init__(self, request: SlowFirstRequest):
+        super().__init__(LLMConfig())
+        self.request = request
+
+    async def _generate_response(
+        self, messages, response_model=None, max_tokens=0, model_size=None
+    ):
+        return {'call': await self.request()}
+
+
+class HedgedEmbedder(EmbedderClient):
+    def __init__(self, request: SlowFirstRequest):
+        self.request = request
+
+    @hedged(ConcurrencyPool.embedder)
+    async def create(self, input_data):
+        return [float(await self.request())]
+
+
+@pytest.mark.asyncio
+async def test_clients_hedge_with_their_policy():
+    llm_client = HedgedLLMClient(SlowFirstRequest([1.0, 0.01]))
+    # Latencies are kept per prompt name, not per response model
+    llm_client.hedging_policy = _warmed_up_policy('extract_nodes.extract_message:medium')
+    messages = [
+        Message(role='system', content='system', prompt_name='extract_nodes.extract_message'),
+        Message(role='user', content='hi', prompt_name='extract_nodes.extract_message'),
+    ]
+
+    assert await llm_client.generate_response(messages) == {'call': 1}
+
+    embedder = HedgedEmbedder(SlowFirstRequest([1.0, 0.01]))
+    embedder.hedging_policy = _warmed_up_policy('HedgedEmbedder.create')
+
+    assert await embedder.create('text') == [1.0]
@@ -0,0 +1,116 @@
+import json
+
+import pytest
+
+from graphiti_core.nodes import EpisodeType, EpisodicNode
+from graphiti_core.utils.datetime_utils import utc_now
+from graphiti_core.utils.json_extraction import (
+    JsonEntityMapping,
+    JsonRelationMapping,
+    JsonSchemaMapping,
+    SchemaMappedJsonExtractor,
+)
+
+ORDER_MAPPING = JsonSchemaMapping(
+    entities=[
+        JsonEntityMapping(key='customer', path='customer.name', entity_type='Person'),
+        JsonEntityMapping(key='product', path='items[].product', entity_type='Product'),
+        JsonEntityMapping(key='supplier', path='items[].supplier'),
+    ],
+    relations=[
+        JsonRelationMapping(
+            source='customer',
+            target='product',
+            relation_type='PURCHASED',
+            fact_template='{source} purchased {target}',
+        ),
+        JsonRelationMapping(source='product', target='supplier', relation_type='SUPPLIED_BY'),
+    ],
+)
+
+
+def _episode(data) -> EpisodicNode:
+    return EpisodicNode(
+        name='order',
+        group_id='group_1',
+        source=EpisodeType.json,
+        source_description='orders',
+        content=json.dumps(data),
+        valid_at=utc_now(),
+    )
+
+
+def test_maps_entities_and_relations_without_llm():
+    episode = _episode(
+        {
+            'customer': {'name': 'Alice'},
+            'items': [
+                {'product': 'Widget', 'supplier': 'Acme'},
+                {'product': 'Gadget', 'supplier': 'Globex'},
+            ],
+        }
+    )
+
+    result = SchemaMappedJsonExtractor(ORDER_MAPPING).extract(episode)
+
+    nodes_by_name = {node.name: node for node in result.nodes}
+    assert set(nodes_by_name) == {'Alice', 'Widget', 'Gadget', 'Acme', 'Globex'}
+    assert 'Person' in nodes_by_name['Alice'].labels
+    assert 'Product' in nodes_by_name['Widget'].labels
+
+    name_by_uuid = {node.uuid: node.name for node in result.nodes}
+    assert {
+        (edge.name, name_by_uuid[edge.source_node_uuid], name_by_uuid[edge.target_node_uuid])
+        for edge in result.edges
+    } == {
+        ('PURCHASED', 'Alice', 'Widget'),
+        ('PURCHASED', 'Alice', 'Gadget'),
+        ('SUPPLIED_BY', 'Widget', 'Acme'),
+        ('SUPPLIED_BY', 'Gadget', 'Globex'),
+    }
+    assert 'Alice purchased Widget' in [edge.fact for edge in result.edges]
+    assert all(edge.episodes == [episode.uuid] for edge in result.edges)
+    assert result.unmapped_content is None
+
+
+def test_returns_unmapped_fields_for_llm_fallback():
+    episode = _episode(
+        {
+            'customer': {'name': 'Alice', 'note': 'prefers express delivery'},
+            'items': [{'product': 'Widget', 'supplier': 'Acme', 'quantity': 2}],
+        }
+    )
+
+    result = SchemaMappedJsonExtractor(ORDER_MAPPING).extract(episode)
+
+    assert json.loads(result.unmapped_content) == {
+        'customer': {'note': 'prefers express delivery'},
+        'items': [{'quantity': 2}],
+    }
+
+    no_fallback = SchemaMappedJsonExtractor(
+        ORDER_MAPPING.model_copy(update={'llm_fallback': False})
+    )
+    assert no_fallback.extract(episode).unmapped_content is None
+
+
+def test_invalid_json_falls_back_to_llm():
+    episode = _episode({})
+    episode.content = 'not json'
+
+    result = SchemaMappedJsonExtractor(ORDER_MAPPING).extract(episode)
+
+    assert result.nodes == []
+    assert result.unmapped_content == 'not json'
+
+
+def test_rejects_unknown_entity_keys():
+    with pytest.raises(ValueError):
+        SchemaMappedJsonExtractor(
+            JsonSchemaMapping(
+                entities=[JsonEntityMapping(key='customer', path='customer.name')],
+                relations=[
+                    JsonRelationMapping(source='customer', target='missing', relation_type='KNOWS')
+                ],
+            )
+        )
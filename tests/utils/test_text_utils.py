@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta, timezone
+
+from graphiti_core.nodes import EpisodeType, EpisodicNode
+from graphiti_core.utils.text_utils import (
+    TRUNCATION_MARKER,
+    build_previous_episodes_context,
+    chunk_text,
+    estimate_tokens,
+    truncate_to_tokens,
+)
+
+BASE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _episode(index: int, content: str) -> EpisodicNode:
+    return EpisodicNode(
+        name=f'episode {index}',
+        group_id='group_1',
+        source=EpisodeType.message,
+        source_description='test',
+        content=content,
+        valid_at=BASE_TIME + timedelta(hours=index),
+    )
+
+
+def test_estimate_tokens():
+    assert estimate_tokens('') == 0
+    assert estimate_tokens('abcd') == 1
+    assert estimate_tokens('abcde') == 2
+
+
+def test_truncate_to_tokens_keeps_short_text():
+    assert truncate_to_tokens('short text', 100) == 'short text'
+
+
+def test_truncate_to_tokens_keeps_head():
+    text = 'a' * 400
+    truncated = truncate_to_tokens(text, 50)
+
+    assert truncated.startswith('a' * 10)
+    assert truncated.endswith(TRUNCATION_MARKER)
+    assert estimate_tokens(truncated) <= 50
+
+
+def test_build_context_without_budget_returns_all_contents():
+    episodes = [_episode(i, 'x' * 1000) for i in range(3)]
+
+    assert build_previous_episodes_context(episodes, token_budget=0) == ['x' * 1000] * 3
+
+
+def test_build_context_keeps_most_recent_episodes():
+    episodes = [_episode(0, 'a' * 400), _episode(1, 'b' * 400), _episode(2, 'c' * 400)]
+
+    context = build_previous_episodes_context(episodes, token_budget=200)
+
+    assert context == ['b' * 400, 'c' * 400]
+
+
+def test_build_context_truncates_oldest_kept_episode():
+    episodes = [_episode(0, 'a' * 400), _episode(1, 'b' * 400), _episode(2, 'c' * 400)]
+
+    context = build_previous_episodes_context(episodes, token_budget=250)
+
+    assert len(context) == 3
+    assert context[0].startswith('a') and context[0].endswith(TRUNCATION_MARKER)
+    assert context[1:] == ['b' * 400, 'c' * 400]
+    assert sum(estimate_tokens(content) for content in context) <= 250
+
+
+def test_build_context_is_deterministic():
+    episodes = [_episode(i, f'episode content {i} ' * 50) for i in range(5)]
+
+    assert build_previous_episodes_context(
+        episodes, token_budget=300
+    ) == build_previous_episodes_context(episodes, token_budget=300)
+
+
+def test_chunk_text_returns_short_text_whole():
+    assert chunk_text('short text', chunk_tokens=100) == ['short text']
+    assert chunk_text('x' * 1000, chunk_tokens=0) == ['x' * 1000]
+
+
+def test_chunk_text_splits_with_overlap():
+    text = ' '.join(f'word{i}' for i in range(2000))
+
+    chunks = chunk_text(text, chunk_tokens=500, overlap_tokens=50)
+
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk) <= 500 for chunk in chunks)
+    for previous_chunk, chunk in zip(chunks, chunks[1:], strict=False):
+        # Chunks start on a word and repeat the end of the previous chunk
+        assert chunk.split()[0] in previous_chunk.split()
+    assert chunks[0].split()[0] == 'word0'
+    assert chunks[-1].split()[-1] == 'word1999'
+
+
+def test_chunk_text_prefers_paragraph_boundaries():
+    text = 'a' * 1500 + '\n\n' + 'b' * 1500
+
+    chunks = chunk_text(text, chunk_tokens=500, overlap_tokens=0)
+
+    assert chunks[0] == 'a' * 1500
+    assert chunks[1].startswith('b')
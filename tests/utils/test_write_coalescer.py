@@ -0,0 +1,147 @@
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from graphiti_core.edges import EntityEdge
+from graphiti_core.errors import GraphitiError
+from graphiti_core.nodes import EntityNode, EpisodeType, EpisodicNode
+from graphiti_core.utils.write_coalescer import BulkWriteCoalescer
+
+
+def _episode(group_id: str) -> EpisodicNode:
+    return EpisodicNode(
+        name='episode',
+        group_id=group_id,
+        source=EpisodeType.message,
+        source_description='test',
+        content='content',
+        valid_at=datetime.now(timezone.utc),
+    )
+
+
+def _edge(uuid: str, episodes: list[str]) -> EntityEdge:
+    return EntityEdge(
+        uuid=uuid,
+        source_node_uuid='source_uuid',
+        target_node_uuid='target_uuid',
+        name='edge',
+        group_id='group_1',
+        fact='fact',
+        episodes=episodes,
+        created_at=datetime.now(timezone.utc),
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_are_flushed_in_one_transaction():
+    coalescer = BulkWriteCoalescer(MagicMock(), MagicMock(), max_latency=0.01)
+    node = EntityNode(uuid='node_1', name='Alice', labels=['Entity'], group_id='group_1')
+
+    with patch(
+        'graphiti_core.utils.write_coalescer.add_nodes_and_edges_bulk', AsyncMock()
+    ) as mock_bulk:
+        await asyncio.gather(
+            coalescer.add_nodes_and_edges([_episode('group_1')], [], [node], [_edge('e', ['a'])]),
+            coalescer.add_nodes_and_edges([_episode('group_2')], [], [node], [_edge('e', ['b'])]),
+        )
+
+    mock_bulk.assert_awaited_once()
+    _, episodic_nodes, _, entity_nodes, entity_edges, _ = mock_bulk.await_args.args
+    assert len(episodic_nodes) == 2
+    assert entity_nodes == [node]
+    assert len(entity_edges) == 1
+    assert entity_edges[0].episodes == ['a', 'b']
+
+
+@pytest.mark.asyncio
+async def test_flushes_when_batch_size_is_reached():
+    coalescer = BulkWriteCoalescer(MagicMock(), MagicMock(), max_batch_size=2, max_latency=60)
+
+    with patch(
+        'graphiti_core.utils.write_coalescer.add_nodes_and_edges_bulk', AsyncMock()
+    ) as mock_bulk:
+        await asyncio.wait_for(
+            coalescer.add_nodes_and_edges([_episode('group_1'), _episode('group_1')], [], [], []),
+            timeout=1,
+        )
+
+    mock_bulk.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_write_errors_are_raised_to_all_callers():
+    coalescer = BulkWriteCoalescer(MagicMock(), MagicMock(), max_latency=0.01)
+
+    with patch(
+        'graphiti_core.utils.write_coalescer.add_nodes_and_edges_bulk',
+        AsyncMock(side_effect=RuntimeError('write failed')),
+    ):
+        results = await asyncio.gather(
+            coalescer.add_nodes_and_edges([_episode('group_1')], [], [], []),
+            coalescer.add_nodes_and_edges([_episode('group_2')], [], [], []),
+            return_exceptions=True,
+        )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_one_invalid_write_fails_every_coalesced_write():
+    coalescer = BulkWriteCoalescer(MagicMock(), MagicMock(), max_latency=0.01)
+
+    async def write(driver, episodic_nodes, *args):
+        if any(episode.group_id == 'invalid' for episode in episodic_nodes):
+            raise RuntimeError('invalid write')
+
+    with patch(
+        'graphiti_core.utils.write_coalescer.add_nodes_and_edges_bulk', side_effect=write
+    ) as mock_bulk:
+        valid_write, invalid_write = await asyncio.gather(
+            coalescer.add_nodes_and_edges([_episode('group_1')], [], [], []),
+            coalescer.add_nodes_and_edges([_episode('invalid')], [], [], []),
+            return_exceptions=True,
+        )
+
+    # The writes share one transaction, so the valid write fails with the invalid one
+    mock_bulk.assert_awaited_once()
+    assert isinstance(valid_write, RuntimeError)
+    assert isinstance(invalid_write, RuntimeError)
+
+
+@pytest.mark.asyncio
+async def test_size_triggered_flush_cancels_the_latency_timer():
+    coalescer = BulkWriteCoalescer(MagicMock(), MagicMock(), max_batch_size=2, max_latency=0.01)
+
+    with patch(
+        'graphiti_core.utils.write_coalescer.add_nodes_and_edges_bulk', AsyncMock()
+    ) as mock_bulk:
+        await asyncio.gather(
+            coalescer.add_nodes_and_edges([_episode('group_1')], [], [], []),
+            coalescer.add_nodes_and_edges([_episode('group_2')], [], [], []),
+        )
+        await asyncio.sleep(0.05)
+
+    mock_bulk.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_flush_fails_its_writes():
+    coalescer = BulkWriteCoalescer(MagicMock(), MagicMock(), max_latency=0.01)
+    write_started = asyncio.Event()
+
+    async def slow_write(*args):
+        write_started.set()
+        await asyncio.sleep(60)
+
+    with patch('graphiti_core.utils.write_coalescer.add_nodes_and_edges_bulk', slow_write):
+        write = asyncio.create_task(
+            coalescer.add_nodes_and_edges([_episode('group_1')], [], [], [])
+        )
+        await write_started.wait()
+        for flush_task in coalescer._flush_tasks:
+            flush_task.cancel()
+
+        with pytest.raises(GraphitiError):
+            await asyncio.wait_for(write, timeout=1)